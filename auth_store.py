@@ -0,0 +1,83 @@
+import base64
+import json
+import os
+import time
+
+from naver_client import NaverLandClient, RetryPolicy
+
+AUTH_SESSION_FILE = 'auth_session.json'
+DEFAULT_TTL = 3 * 60 * 60  # 토큰 만료 시간을 알 수 없을 때 사용 (3시간)
+EXPIRY_MARGIN = 5 * 60  # 만료 직전 토큰은 사용하지 않음
+PROBE_PATH = '/api/complexes/142817?sameAddressGroup=false'
+
+
+def token_expiry(auth_token):
+    """JWT 토큰의 exp 값을 읽어 만료 시각(epoch) 반환 (서명 검증 없음)"""
+    try:
+        payload = auth_token.split(' ')[-1].split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return None
+
+
+def save_session(auth_token, cookies, path=AUTH_SESSION_FILE):
+    """인증 토큰과 쿠키를 만료 시각과 함께 저장"""
+    now = int(time.time())
+    session = {
+        'authorization': auth_token,
+        'cookies': cookies,
+        'saved_at': now,
+        'expires_at': token_expiry(auth_token) or now + DEFAULT_TTL
+    }
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(session, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_session(path=AUTH_SESSION_FILE):
+    """만료되지 않은 저장된 인증 정보 로드"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            session = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, None
+    if session.get('expires_at', 0) - EXPIRY_MARGIN <= time.time():
+        return None, None
+    return session.get('authorization'), session.get('cookies')
+
+
+def clear_session(path=AUTH_SESSION_FILE):
+    """저장된 인증 정보 삭제"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def probe_session(auth_token, cookies):
+    """가벼운 API 요청 한 번으로 인증 정보가 유효한지 확인"""
+    # 확인용 요청이므로 재시도 없이 한 번만 보냄
+    client = NaverLandClient(auth_token, cookies, pool_size=1, retry_policy=RetryPolicy(max_attempts=1))
+    try:
+        return client.get(PROBE_PATH).status_code == 200
+    except Exception as e:
+        print(f"저장된 인증 정보 확인 실패: {e}")
+        return False
+    finally:
+        client.close()
+
+
+def get_auth_session(login, path=AUTH_SESSION_FILE):
+    """저장된 인증 정보를 재사용하고, 만료되었거나 거부되면 login()으로 새로 발급"""
+    auth_token, cookies = load_session(path)
+    if auth_token and cookies and probe_session(auth_token, cookies):
+        print("저장된 네이버 인증 정보를 사용합니다.")
+        return auth_token, cookies
+
+    clear_session(path)
+    auth_token, cookies = login()
+    if auth_token and cookies:
+        save_session(auth_token, cookies, path)
+    return auth_token, cookies
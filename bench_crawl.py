@@ -0,0 +1,181 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tqdm import tqdm
+
+import fetch_all
+from naver_client import NaverLandClient
+from rate_limiter import TokenBucket
+from stub_server import StubConfig, start_server, complex_ids
+
+
+class TimedClient(NaverLandClient):
+    """요청별 지연 시간과 매물 수를 기록하는 클라이언트"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.articles = 0
+
+    def get(self, path, referer=None):
+        started = time.perf_counter()
+        response = super().get(path, referer)
+        elapsed = time.perf_counter() - started
+        try:
+            count = len(response.json().get('articleList', []))
+        except ValueError:
+            count = 0
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.articles += count
+        return response
+
+
+def percentile(values, q):
+    """정렬된 값의 q 분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def report(name, client, elapsed, listings=None):
+    latencies = client.latencies
+    return {
+        'scenario': name,
+        'seconds': round(elapsed, 3),
+        'requests': len(latencies),
+        'listings': listings,
+        'pages_per_sec': round(len(latencies) / elapsed, 2) if elapsed else 0,
+        'articles_per_sec': round(client.articles / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1)
+    }
+
+
+def bench_list_crawl(base_url, state, args):
+    """fetch_all의 실제 수집 함수로 단지/좌표 대상을 수집
+
+    단지가 50페이지를 넘으면 실제 수집처럼 거래 유형 → 매물 유형 → 면적대 순으로 나눠 수집합니다.
+    면적대를 지정하지 않으면 대체 서버의 면적대를 모두 등록합니다.
+    단지 대상으로 수집한 고유 매물 수와 대체 서버의 매물 수, 더 나눌 수 없는데 페이지 상한에
+    걸려 매물을 놓친 조각 목록을 함께 반환합니다.
+    """
+    client = TimedClient('Bearer stub', {}, rate_limiter=TokenBucket(args.rps),
+                         pool_size=args.workers * 2, base_url=base_url)
+    fetch_all.client = client
+    fetch_all.archive = None
+    lat_min, lat_max, lng_min, lng_max = state.bbox()
+    area_bands = state.area_bands() if args.area_bands is None else args.area_bands
+    filters = {'real_estate_types': args.real_estate_types.split(':'), 'area_nos': area_bands}
+    complexes = [
+        dict(filters, id=complex_id, name=f'단지{i}', dong='')
+        for i, complex_id in enumerate(complex_ids(state.config))
+    ]
+    region_targets = [dict(filters, name='영역', dong='')]
+
+    saturated = []
+    fetch_complex_shard = fetch_all.fetch_complex_shard
+
+    def fetch_shard(complex_id, shard, *args, **kwargs):
+        result = fetch_complex_shard(complex_id, shard, *args, **kwargs)
+        if result.saturated and not result.failed and not shard.split():
+            saturated.append(f"{complex_id}/{shard.path}")
+        return result
+
+    started = time.perf_counter()
+    with tqdm(disable=True) as pbar, \
+            ThreadPoolExecutor(max_workers=args.workers * 2) as page_pool, \
+            ThreadPoolExecutor(max_workers=args.workers) as target_pool:
+        fetch_all.page_executor = page_pool
+        fetch_all.fetch_complex_shard = fetch_shard
+        futures = [
+            target_pool.submit(fetch_all.fetch_by_complex_id, c['id'], [c], pbar, {})
+            for c in complexes
+        ]
+        futures.append(target_pool.submit(
+            fetch_all.fetch_by_coordinates, lat_min, lat_max, lng_min, lng_max,
+            region_targets, pbar, {}
+        ))
+        # 좌표 대상은 모든 단지를 덮으므로 고유 매물 수는 단지 대상 결과로만 셈
+        collected = set()
+        for future in futures[:-1]:
+            collected.update(article['articleNo'] for article in future.result())
+        futures[-1].result()
+        fetch_all.page_executor = None
+        fetch_all.fetch_complex_shard = fetch_complex_shard
+    elapsed = time.perf_counter() - started
+    client.close()
+    result = report('list_crawl', client, elapsed, len(collected))
+    result['expected_listings'] = len(state.by_no)
+    result['saturated_shards'] = sorted(saturated)
+    return result
+
+
+def bench_article_detail(base_url, state, args):
+    """상세 정보 API (/api/articles/{no})를 동시에 요청"""
+    client = TimedClient('Bearer stub', {}, rate_limiter=TokenBucket(args.rps),
+                         pool_size=args.workers, base_url=base_url)
+    article_nos = [a['articleNo'] for a in state.listings[:args.details]]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(lambda no: client.get(f"/api/articles/{no}?complexNo="), article_nos))
+    elapsed = time.perf_counter() - started
+    client.close()
+    return report('article_detail', client, elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 대체 서버를 이용한 수집 성능 측정")
+    parser.add_argument('--complexes', type=int, default=3, help='단지 대상 수')
+    parser.add_argument('--pages', type=int, default=10, help='단지별 페이지 수 (50을 넘으면 나눠서 수집)')
+    parser.add_argument('--real-estate-types', default='APT', help='대상과 매물의 매물 유형 (예: APT:OPST)')
+    parser.add_argument('--area-bands', nargs='*',
+                        help="대상의 면적대 (예: 1:2 3 4:5, 대체 서버는 20m²마다 면적대 하나, "
+                             "지정하지 않으면 대체 서버의 면적대 전체)")
+    parser.add_argument('--details', type=int, default=100, help='상세 정보 요청 수')
+    parser.add_argument('--workers', type=int, default=fetch_all.DEFAULT_WORKERS)
+    parser.add_argument('--rps', type=float, default=0, help='전체 초당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--json', dest='json_path', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate,
+                        pages=args.pages, seed=0, complexes=args.complexes,
+                        real_estate_types=args.real_estate_types.split(':'))
+    server, state, base_url = start_server(config)
+    try:
+        results = [
+            bench_list_crawl(base_url, state, args),
+            bench_article_detail(base_url, state, args)
+        ]
+    finally:
+        server.shutdown()
+
+    for result in results:
+        if result['listings'] is not None:
+            print(f"{result['scenario']}: 단지 대상 고유 매물 {result['listings']}개 수집 (대체 서버 {result['expected_listings']}개)")
+        if result.get('saturated_shards'):
+            print(f"{result['scenario']}: 경고 - 더 나눌 수 없는 조각 {len(result['saturated_shards'])}개가 "
+                  f"페이지 상한에 걸려 매물을 놓쳤습니다 ({', '.join(result['saturated_shards'])})")
+        print(
+            f"{result['scenario']}: {result['requests']}회 요청 {result['seconds']}초 | "
+            f"{result['pages_per_sec']} pages/s, {result['articles_per_sec']} articles/s, "
+            f"p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms"
+        )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -71,11 +71,15 @@ def main():
     # 데이터 파일 목록
     data_files = [
         ('songdo_apartments_listings.csv', '.'),
+        ('songdo_apartments_listings.delta.csv', '.'),
+        ('songdo_apartments_listings.lifecycle.jsonl', '.'),
+        ('songdo_apartments_listings.prices.npz', '.'),
         ('songdo_officetel_listings.csv', '.'),
+        ('crawl_targets.json', '.'),
         ('송도_매물.json', '.'),
         ('saved_properties.json', '.'),
         ('property_notes.json', '.'),
-        ('api_cache.pkl', '.'),
+        ('article_details.jsonl', '.'),
         ('description_cache.json', '.'),
         ('last_update.txt', '.'),
         ('README_MACOS.txt', '.'),
@@ -6,7 +6,6 @@ import subprocess
 import platform
 import time
 import base64
-import pickle
 import json
 import importlib.util
 
@@ -143,9 +142,6 @@ def main():
     if not os.path.exists('description_cache.json'):
         with open('description_cache.json', 'w', encoding='utf-8') as f:
             f.write('{}')
-    if not os.path.exists('api_cache.pkl'):
-        with open('api_cache.pkl', 'wb') as f:
-            pickle.dump({}, f)
     if not os.path.exists('last_update.txt'):
         with open('last_update.txt', 'w', encoding='utf-8') as f:
             f.write(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
@@ -153,11 +149,15 @@ def main():
     # 데이터 파일 목록
     data_files = [
         ('songdo_apartments_listings.csv', '.'),
+        ('songdo_apartments_listings.delta.csv', '.'),
+        ('songdo_apartments_listings.lifecycle.jsonl', '.'),
+        ('songdo_apartments_listings.prices.npz', '.'),
         ('songdo_officetel_listings.csv', '.'),
+        ('crawl_targets.json', '.'),
         ('송도_매물.json', '.'),
         ('saved_properties.json', '.'),
         ('property_notes.json', '.'),
-        ('api_cache.pkl', '.'),
+        ('article_details.jsonl', '.'),
         ('description_cache.json', '.'),
         ('last_update.txt', '.'),
         ('README_WINDOWS.txt', '.'),
@@ -0,0 +1,75 @@
+import numpy as np
+
+AREA_WINDOW = 5.0  # 비교 대상 전용면적 차이 (m²)
+COMPARED_TRADE_TYPES = ('매매', '전세', '월세')
+BLOCK_ROWS = 512  # 한 번에 계산하는 매물 수 (창 행렬 메모리 제한)
+
+
+def _trimmed_mean(prices, valid):
+    """창 행렬의 행마다 IQR 이상치를 뺀 평균 (뷰어의 remove_outliers와 같은 규칙)
+
+    값이 4개 미만이면 그대로 평균을 내고, 4개 이상이면 정렬한 값의 n//4, n*3//4 번째를
+    Q1, Q3로 삼아 Q1 - 1.5*IQR ~ Q3 + 1.5*IQR 밖의 값을 뺍니다.
+    """
+    rows = np.arange(len(prices))
+    counts = valid.sum(axis=1)
+    ordered = np.sort(np.where(valid, prices, np.inf), axis=1)
+    last = np.maximum(counts - 1, 0)
+    q1 = ordered[rows, np.minimum(counts // 4, last)]
+    q3 = ordered[rows, np.minimum(counts * 3 // 4, last)]
+    with np.errstate(invalid='ignore', divide='ignore'):  # 빈 행은 inf - inf
+        iqr = q3 - q1
+        kept = valid & (prices >= (q1 - 1.5 * iqr)[:, None]) & (prices <= (q3 + 1.5 * iqr)[:, None])
+        kept = np.where(((counts >= 4) & kept.any(axis=1))[:, None], kept, valid)
+        kept_counts = kept.sum(axis=1)
+        totals = np.where(kept, prices, 0.0).sum(axis=1)
+        return np.where(kept_counts > 0, totals / kept_counts, np.nan)
+
+
+def price_deviations(table, window=AREA_WINDOW):
+    """매물마다 같은 단지/거래유형에서 전용면적 차이 window 이내인 다른 매물의 평균 대비 가격 차이(%)
+
+    (단지, 거래유형) 묶음을 면적순으로 정렬한 뒤 searchsorted로 각 매물의 면적 창을 찾고,
+    창 안의 가격을 행렬로 모아 이상치 제거와 평균을 한 번에 계산합니다.
+    비교 가격은 매매/전세는 매매가/보증금, 월세는 월세이며, 비교할 매물이 없거나 가격을
+    알 수 없는 매물은 NaN입니다.
+    """
+    deviations = np.full(len(table), np.nan)
+    prices = table.comparison_price()
+    # 면적을 알 수 없는 매물은 비교 대상에서 빼고, 자신의 면적은 0으로 봄
+    query_area = np.nan_to_num(table.area, nan=0.0)
+    compared = np.isin(table.trade, [table.code('trade', name) for name in COMPARED_TRADE_TYPES])
+
+    groups = table.complex.astype(np.int64) * (len(table.categories['trade']) + 1) + table.trade
+    # 묶음 번호로 한 번만 정렬해 두고 묶음마다 연속 구간을 잘라 씀
+    order = np.argsort(groups, kind='stable')
+    _, starts, sizes = np.unique(groups[order], return_index=True, return_counts=True)
+    for start, size in zip(starts, sizes):
+        members = order[start:start + size]
+        if not compared[members[0]]:
+            continue
+        member_areas = table.area[members]
+        known = np.flatnonzero(~np.isnan(member_areas))
+        candidates = known[np.argsort(member_areas[known], kind='stable')]
+        areas = member_areas[candidates]
+        group_prices = prices[members[candidates]]
+        # 묶음 안에서 각 매물의 정렬 위치 (면적을 알 수 없으면 -1)
+        sorted_position = np.full(size, -1)
+        sorted_position[candidates] = np.arange(len(candidates))
+
+        queries = np.flatnonzero(prices[members] > 0)
+        for block_start in range(0, len(queries), BLOCK_ROWS):
+            local = queries[block_start:block_start + BLOCK_ROWS]
+            block = members[local]
+            lo = np.searchsorted(areas, query_area[block] - window, side='left')
+            hi = np.searchsorted(areas, query_area[block] + window, side='right')
+            width = int((hi - lo).max()) if len(block) else 0
+            if width == 0:
+                continue
+            index = lo[:, None] + np.arange(width)
+            valid = (index < hi[:, None]) & (index != sorted_position[local][:, None])
+            window_prices = group_prices[np.minimum(index, len(candidates) - 1)]
+            means = _trimmed_mean(window_prices, valid)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                deviations[block] = np.where(means > 0, (prices[block] - means) / means * 100, np.nan)
+    return deviations
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+
+JOURNAL_FILE = 'crawl_journal.jsonl'
+
+
+class CrawlJournal:
+    """완료된 (대상, 페이지)와 수집한 매물을 한 줄씩 기록하는 수집 저널
+
+    각 기록은 fsync로 디스크에 반영되므로 중간에 프로세스가 종료되어도
+    --resume 실행 시 마지막 체크포인트부터 이어서 수집할 수 있습니다.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.targets = {}
+        if resume:
+            self._load()
+            self.file = open(path, 'a', encoding='utf-8')
+        else:
+            self.file = open(path, 'w', encoding='utf-8')
+
+    def _load(self):
+        """기존 저널을 읽고, 마지막에 잘린 줄이 있으면 잘라냄"""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        valid_size = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_size += len(line)
+                self._apply(record)
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_size)
+
+    def _apply(self, record):
+        state = self.targets.setdefault(record['target'], {
+            'pages': {}, 'seen': {}, 'watermark': None, 'done': False, 'saturated': False, 'complete': False
+        })
+        if record.get('watermark'):
+            state['watermark'] = record['watermark']
+        if record['type'] == 'page':
+            state['pages'][record['page']] = record['articles']
+            # 분류된 매물번호가 없는 기록(이전 형식)은 None으로 두어 삭제 판단에 쓰지 않음
+            state['seen'][record['page']] = record.get('seen')
+        elif record['type'] == 'done':
+            state['done'] = True
+            state['saturated'] = record.get('saturated', False)
+            state['complete'] = record.get('complete', False)
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            self._apply(record)
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def record_page(self, target, page, articles, watermark=None, seen=()):
+        """한 페이지 처리 완료 기록 (seen: 이 페이지에서 분류된 매물번호)"""
+        self._write({
+            'type': 'page', 'target': target, 'page': page,
+            'articles': articles, 'watermark': watermark, 'seen': sorted(seen)
+        })
+
+    def record_done(self, target, watermark=None, saturated=False, complete=False):
+        """대상 수집 완료 기록
+
+        saturated: 페이지 상한에 걸려 분할이 필요했는지
+        complete: 마지막 페이지까지 확인했는지 (삭제 감지에 사용)
+        """
+        self._write({
+            'type': 'done', 'target': target, 'watermark': watermark, 'saturated': saturated,
+            'complete': complete
+        })
+
+    def resume_state(self, target):
+        """(저장된 매물, 다음 페이지 번호, 기준일, 완료 여부) 반환"""
+        with self.lock:
+            state = self.targets.get(target)
+            if not state:
+                return [], 1, None, False
+            articles = []
+            next_page = 1
+            # 연속으로 완료된 페이지까지만 이어서 사용
+            while next_page in state['pages']:
+                articles.extend(state['pages'][next_page])
+                next_page += 1
+            return articles, next_page, state['watermark'], state['done']
+
+    def resumed_seen(self, target):
+        """이어서 수집할 페이지 앞까지 분류된 매물번호 (매물번호가 없는 이전 형식 기록이 있으면 None)"""
+        with self.lock:
+            state = self.targets.get(target)
+            seen = set()
+            if not state:
+                return seen
+            page = 1
+            while page in state['pages']:
+                if state['seen'][page] is None:
+                    return None
+                seen.update(state['seen'][page])
+                page += 1
+            return seen
+
+    def was_complete(self, target):
+        """완료된 대상을 마지막 페이지까지 확인했었는지 여부"""
+        with self.lock:
+            state = self.targets.get(target)
+            return bool(state and state['complete'])
+
+    def was_saturated(self, target):
+        """완료된 대상이 페이지 상한에 걸렸었는지 여부"""
+        with self.lock:
+            state = self.targets.get(target)
+            return bool(state and state['saturated'])
+
+    def pending_targets(self):
+        """기록은 있지만 완료되지 않은 대상 목록"""
+        with self.lock:
+            return [target for target, state in self.targets.items() if not state['done']]
+
+    def close(self, completed=False):
+        """저널을 닫고, 전체 수집이 끝났으면 삭제"""
+        with self.lock:
+            self.file.close()
+            if completed:
+                os.remove(self.path)
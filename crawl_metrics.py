@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+METRICS_FILE = 'crawl_metrics.json'
+
+# 요청 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _target_entry():
+    return {'pages': 0, 'unchanged_pages': 0, 'articles': 0, 'changed': 0, 'unmatched': 0}
+
+
+class CrawlMetrics:
+    """한 번의 수집에서 요청/페이지/저장 결과를 모으는 계측기
+
+    요청 수와 지연 시간, 전송량, 재시도, 대기(요청 제한/차단기/재시도 간격)와 파싱에 쓴 시간,
+    대상별 페이지/매물 수, 데이터셋별 신규/변경/동일 매물 수를 기록합니다.
+    여러 스레드에서 동시에 기록할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0  # 응답 없이 실패한 요청 (연결 오류, 시간 초과)
+        self.statuses = {}
+        self.bytes = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.wait_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.targets = {}
+        self.datasets = {}
+
+    def observe_request(self, latency, status=None, size=0, retry=False):
+        """요청 하나의 지연 시간(초), 상태 코드(실패 시 None), 전송된 응답 크기 기록"""
+        with self.lock:
+            self.requests += 1
+            if retry:
+                self.retries += 1
+            if status is None:
+                self.errors += 1
+            else:
+                self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+            self.bytes += size
+            self.latency_sum += latency
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    self.latency_buckets[i] += 1
+                    break
+
+    def add_wait(self, seconds):
+        """요청 제한, 차단기, 재시도 간격으로 기다린 시간 기록"""
+        with self.lock:
+            self.wait_seconds += seconds
+
+    def add_parse(self, seconds):
+        """응답 파싱과 매물 분류에 쓴 시간 기록"""
+        with self.lock:
+            self.parse_seconds += seconds
+
+    def record_page(self, target, articles, changed, unchanged_page=False, unmatched=0):
+        """대상의 페이지 하나에서 분류된 매물 수, 그중 신규/변경 매물 수, 분류 규칙에 맞지 않은 매물 수 기록"""
+        with self.lock:
+            entry = self.targets.setdefault(target, _target_entry())
+            entry['pages'] += 1
+            entry['articles'] += articles
+            entry['changed'] += changed
+            entry['unmatched'] += unmatched
+            if unchanged_page:
+                entry['unchanged_pages'] += 1
+
+    def _dataset(self, dataset):
+        return self.datasets.setdefault(dataset, {'inserted': 0, 'updated': 0, 'seen': 0})
+
+    def record_saved(self, dataset, inserted, updated):
+        """데이터셋에 저장한 신규/변경 매물 수 기록"""
+        with self.lock:
+            entry = self._dataset(dataset)
+            entry['inserted'] += inserted
+            entry['updated'] += updated
+
+    def record_seen(self, dataset, seen):
+        """데이터셋 대상에서 이번 수집에 보인 매물 수 기록 (신규/변경을 뺀 나머지가 동일 매물)"""
+        with self.lock:
+            self._dataset(dataset)['seen'] += seen
+
+    def report(self):
+        """JSON으로 저장할 수 있는 수집 결과 요약"""
+        with self.lock:
+            cumulative = []
+            count = 0
+            for bound, bucket in zip(LATENCY_BUCKETS, self.latency_buckets):
+                count += bucket
+                cumulative.append([bound, count])
+            return {
+                'started': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'requests': self.requests,
+                'retries': self.retries,
+                'errors': self.errors,
+                'statuses': dict(self.statuses),
+                'bytes': self.bytes,
+                'latency': {
+                    'buckets': cumulative,
+                    'sum_seconds': round(self.latency_sum, 3),
+                    'count': self.requests
+                },
+                'wait_seconds': round(self.wait_seconds, 3),
+                'parse_seconds': round(self.parse_seconds, 3),
+                'targets': {target: dict(entry) for target, entry in self.targets.items()},
+                'datasets': {
+                    dataset: dict(entry, unchanged=max(entry['seen'] - entry['inserted'] - entry['updated'], 0))
+                    for dataset, entry in self.datasets.items()
+                }
+            }
+
+
+def _write_atomic(path, text):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def write_report(metrics, path=METRICS_FILE):
+    """수집 결과 요약을 JSON 파일로 저장"""
+    _write_atomic(path, json.dumps(metrics.report(), ensure_ascii=False, indent=2))
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(report):
+    """수집 결과 요약을 Prometheus 텍스트 형식으로 변환 (node_exporter textfile 수집용)
+
+    값은 누적이 아니라 마지막 수집 한 번의 값이므로 모두 gauge(지연 시간은 histogram)로 내보냅니다.
+    """
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    metric('naver_crawl_requests', 'gauge', '재시도를 포함한 요청 수', [({}, report['requests'])])
+    metric('naver_crawl_retries', 'gauge', '재시도 요청 수', [({}, report['retries'])])
+    metric('naver_crawl_errors', 'gauge', '응답 없이 실패한 요청 수', [({}, report['errors'])])
+    metric('naver_crawl_responses', 'gauge', '상태 코드별 응답 수',
+           [({'status': status}, count) for status, count in sorted(report['statuses'].items())])
+    metric('naver_crawl_response_bytes', 'gauge', '전송된 응답 본문 크기 (압축된 바이트 수)', [({}, report['bytes'])])
+
+    latency = report['latency']
+    samples = [({'le': bound}, count) for bound, count in latency['buckets']]
+    samples.append(({'le': '+Inf'}, latency['count']))
+    lines.append("# HELP naver_crawl_request_duration_seconds 요청 지연 시간")
+    lines.append("# TYPE naver_crawl_request_duration_seconds histogram")
+    for labels, value in samples:
+        lines.append(f'naver_crawl_request_duration_seconds_bucket{{le="{labels["le"]}"}} {value}')
+    lines.append(f"naver_crawl_request_duration_seconds_sum {latency['sum_seconds']}")
+    lines.append(f"naver_crawl_request_duration_seconds_count {latency['count']}")
+
+    metric('naver_crawl_wait_seconds', 'gauge', '요청 제한/차단기/재시도 간격으로 기다린 시간',
+           [({}, report['wait_seconds'])])
+    metric('naver_crawl_parse_seconds', 'gauge', '응답 파싱과 매물 분류에 쓴 시간', [({}, report['parse_seconds'])])
+    metric('naver_crawl_duration_seconds', 'gauge', '수집 소요 시간', [({}, report['duration_seconds'])])
+
+    targets = sorted(report['targets'].items())
+    metric('naver_crawl_pages', 'gauge', '대상별 확인한 페이지 수',
+           [({'target': target}, entry['pages']) for target, entry in targets])
+    metric('naver_crawl_unchanged_pages', 'gauge', '대상별 지난 수집과 같은 페이지 수',
+           [({'target': target}, entry['unchanged_pages']) for target, entry in targets])
+    metric('naver_crawl_articles', 'gauge', '대상별 분류된 매물 수',
+           [({'target': target}, entry['articles']) for target, entry in targets])
+    metric('naver_crawl_unmatched_articles', 'gauge', '대상별 분류 규칙에 맞지 않아 제외한 매물 수',
+           [({'target': target}, entry['unmatched']) for target, entry in targets])
+
+    samples = []
+    for dataset, entry in sorted(report['datasets'].items()):
+        for result in ('inserted', 'updated', 'unchanged'):
+            samples.append(({'dataset': dataset, 'result': result}, entry[result]))
+    metric('naver_crawl_listings', 'gauge', '데이터셋별 신규/변경/동일 매물 수', samples)
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(metrics, path):
+    """수집 결과 요약을 Prometheus 텍스트 파일로 저장 (임시 파일 교체)"""
+    _write_atomic(path, prometheus_text(metrics.report()))
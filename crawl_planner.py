@@ -0,0 +1,156 @@
+from collections import namedtuple
+
+from target_registry import TRADE_TYPES
+
+
+class QueryShard(namedtuple('QueryShard', 'real_estate_types trade_types area_nos area_bands depth path')):
+    """단지 요청을 필터로 나눈 조각 (path는 'all', 'all/A1', 'all/A1/OPST'처럼 분할 경로)
+
+    페이지 상한에 걸리면 거래 유형 → 매물 유형 → 면적대(areaNos) 순으로 나눕니다.
+    """
+
+    @classmethod
+    def root(cls, targets):
+        target = targets[0]
+        # 면적대는 같은 요청의 대상들이 등록한 값을 모두 사용
+        area_bands = []
+        for member in targets:
+            for band in member.get('area_nos') or []:
+                if band not in area_bands:
+                    area_bands.append(band)
+        return cls(
+            tuple(target.get('real_estate_types') or ['APT']),
+            tuple(target.get('trade_types') or []),
+            '', tuple(area_bands), 0, 'all'
+        )
+
+    def filters(self):
+        """요청 URL의 (realEstateType, tradeType, areaNos) 값"""
+        return ':'.join(self.real_estate_types), ':'.join(self.trade_types), self.area_nos
+
+    def split(self):
+        """한 단계 더 나눈 조각 목록 (더 나눌 수 없으면 빈 목록)"""
+        if len(self.trade_types) != 1:
+            return [
+                self._replace(trade_types=(trade_type,), depth=self.depth + 1, path=f"{self.path}/{trade_type}")
+                for trade_type in self.trade_types or TRADE_TYPES
+            ]
+        if len(self.real_estate_types) > 1:
+            return [
+                self._replace(real_estate_types=(real_estate_type,), depth=self.depth + 1,
+                              path=f"{self.path}/{real_estate_type}")
+                for real_estate_type in self.real_estate_types
+            ]
+        if not self.area_nos and self.area_bands:
+            return [
+                self._replace(area_nos=band, depth=self.depth + 1, path=f"{self.path}/area{band}")
+                for band in self.area_bands
+            ]
+        return []
+
+
+def target_filters(target):
+    """대상의 (realEstateType, tradeType) 요청 값 (여러 값은 'APT:OPST'처럼 콜론으로 연결)"""
+    return (
+        ':'.join(target.get('real_estate_types') or ['APT']),
+        ':'.join(target.get('trade_types') or [])
+    )
+
+
+def query_filters(targets):
+    """병합된 요청의 필터 (같은 요청의 대상들은 필터가 같음)"""
+    return target_filters(targets[0])
+
+
+def plan_complex_queries(targets):
+    """같은 단지 ID를 같은 필터로 조회하는 대상들을 하나의 요청으로 병합
+
+    받은 매물은 classify()로 각 대상에 나눠 주므로 대상이 겹쳐도 요청 수는 늘지 않습니다.
+    저장할 데이터셋이 다른 대상은 따로 조회합니다.
+    """
+    groups = {}
+    for target in targets:
+        key = (target['id'], target_filters(target), target.get('dataset'))
+        groups.setdefault(key, []).append(target)
+    return [
+        {'id': complex_id, 'targets': members, 'dataset': dataset}
+        for (complex_id, _, dataset), members in groups.items()
+    ]
+
+
+def plan_region_queries(targets):
+    """같은 좌표 영역을 같은 필터로 조회하는 대상들을 하나의 요청으로 병합"""
+    groups = {}
+    for target in targets:
+        bbox = (target['lat_min'], target['lat_max'], target['lng_min'], target['lng_max'])
+        key = (bbox, target_filters(target), target.get('dataset'))
+        groups.setdefault(key, []).append(target)
+    return [
+        {'bbox': bbox, 'targets': members, 'dataset': dataset}
+        for (bbox, _, dataset), members in groups.items()
+    ]
+
+
+def query_label(targets):
+    """로그와 워터마크 키에 쓰는 요청 이름"""
+    return '+'.join(target['name'] for target in targets)
+
+
+def _to_int(text):
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def parse_floor(floor_info):
+    """'12/29' 형태의 층 정보를 (층, 전체층)으로 변환
+
+    층과 전체층을 따로 읽어 '12'는 (12, None)이 되고, 지하층 'B1'은 -1로 봅니다.
+    '저/29'처럼 숫자가 아닌 값은 None입니다.
+    """
+    floor, _, total = str(floor_info or '').partition('/')
+    floor = floor.strip()
+    if floor[:1] in ('B', 'b') and floor[1:].isdigit():
+        floor = '-' + floor[1:]
+    return _to_int(floor), _to_int(total.strip())
+
+
+def matches_rule(article, rule):
+    """매물이 분류 규칙 하나를 만족하는지 확인
+
+    규칙 키: total_floors(전체 층수), floor_min/floor_max(해당 층 범위, 양끝 포함)
+    """
+    floor, total = parse_floor(article.get('floorInfo', ''))
+    if floor is None:
+        return False
+    if 'total_floors' in rule and total != rule['total_floors']:
+        return False
+    if 'floor_min' in rule and floor < rule['floor_min']:
+        return False
+    if 'floor_max' in rule and floor > rule['floor_max']:
+        return False
+    return True
+
+
+def classify(article, targets):
+    """매물이 속하는 첫 번째 대상 반환
+
+    규칙이 없는 대상은 모든 매물을 받고, 규칙이 있는 대상은 규칙 중 하나라도 맞는
+    매물만 받습니다. 어느 대상에도 맞지 않으면 None을 반환합니다.
+    """
+    for target in targets:
+        rules = target.get('rules')
+        if not rules or any(matches_rule(article, rule) for rule in rules):
+            return target
+    return None
+
+
+def label_article(article, targets):
+    """분류 규칙에 맞는 대상의 단지명/동을 매물에 기록 (맞는 대상이 없으면 False)"""
+    target = classify(article, targets)
+    if target is None:
+        return False
+    article['complexName'] = target['name']
+    article['dong'] = target.get('dong', '')
+    return True
@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+import auth_store
+import crawl_metrics
+import crawl_planner
+import fetch_all
+import sync_state
+import target_registry
+
+SCHEDULE_FILE = 'schedule_state.json'
+DEFAULT_BUDGET = 600  # 시간당 전체 요청 수 상한
+DEFAULT_INTERVAL = 2 * 60 * 60  # 변동 이력이 없는 대상의 수집 주기
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 60 * 60
+TARGET_CHANGES = 2.0  # 한 번 수집할 때 기대하는 신규/변경 매물 수
+CHURN_ALPHA = 0.3  # 변동률/요청 수 이동평균 가중치
+POLL_SECONDS = 60
+SWEEP_INTERVAL = 24 * 60 * 60  # 삭제 감지를 위해 마지막 페이지까지 다시 확인하는 주기
+
+
+def load_schedule(path=SCHEDULE_FILE):
+    """대상별 수집 주기와 변동률 로드"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_schedule(schedule, path=SCHEDULE_FILE):
+    """수집 일정을 임시 파일에 쓴 뒤 교체하여 저장"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(schedule, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def plan_queries(registry):
+    """수집 요청 목록을 (일정 키, 요청) 쌍으로 반환 (키는 워터마크 키와 같음)"""
+    queries = []
+    for query in crawl_planner.plan_complex_queries(target_registry.complex_targets(registry)):
+        queries.append((fetch_all.query_key(query), dict(query, kind='complex')))
+    for query in crawl_planner.plan_region_queries(target_registry.region_targets(registry)):
+        queries.append((fetch_all.query_key(query), dict(query, kind='region')))
+    return queries
+
+
+def ewma(old, value):
+    return value if old is None else CHURN_ALPHA * value + (1 - CHURN_ALPHA) * old
+
+
+def record_run(entry, changes, requests, now):
+    """수집 결과로 변동률(시간당 변경 수)과 비용을 갱신하고 다음 주기 계산
+
+    변동이 잦은 대상은 한 번에 TARGET_CHANGES건 정도가 바뀌도록 주기를 줄이고,
+    조용한 대상은 이동평균이 줄어드는 만큼 점점 드물게 수집합니다.
+    """
+    elapsed_hours = max(now - entry.get('last_run', now - DEFAULT_INTERVAL), 60) / 3600
+    entry['churn'] = ewma(entry.get('churn'), changes / elapsed_hours)
+    entry['cost'] = ewma(entry.get('cost'), max(requests, 1))
+    if entry['churn'] > 0:
+        interval = TARGET_CHANGES / entry['churn'] * 3600
+    else:
+        interval = MAX_INTERVAL
+    entry['interval'] = min(MAX_INTERVAL, max(MIN_INTERVAL, interval))
+    entry['last_run'] = now
+    entry['next_due'] = now + entry['interval']
+    entry.pop('retry_at', None)
+
+
+def due_at(entry):
+    """다음 수집 시각 (실패한 대상은 재시도 시각 이후)"""
+    return max(entry.get('next_due', 0), entry.get('retry_at', 0))
+
+
+def fit_budget(schedule, budget):
+    """시간당 예상 요청 수가 예산을 넘으면 모든 주기를 같은 비율로 늘림
+
+    늘어난 주기는 schedule에 기록하지 않고 next_due에만 반영하므로, 예산이 남으면
+    변동률로 계산한 주기가 다시 적용됩니다.
+    """
+    entries = [entry for entry in schedule.values() if 'interval' in entry]
+    demand = sum(entry['cost'] * 3600 / entry['interval'] for entry in entries)
+    scale = demand / budget if budget > 0 and demand > budget else 1.0
+    for entry in entries:
+        entry['next_due'] = entry['last_run'] + entry['interval'] * scale
+    return demand, scale
+
+
+def due_queries(queries, schedule, now):
+    """수집 시각이 된 요청을 변동률이 높은 순서로 반환"""
+    due = [
+        (key, query) for key, query in queries
+        if due_at(schedule.get(key, {})) <= now
+    ]
+    due.sort(key=lambda item: schedule.get(item[0], {}).get('churn') or 0, reverse=True)
+    return due
+
+
+def run_query(query, previous_data, watermarks, path, sweep=False):
+    """요청 하나를 수집하고 변경분을 path에 저장한 뒤 (변경 수, 요청 수) 반환
+
+    평소에는 증분 수집하고, sweep이면 삭제된 매물을 찾기 위해 마지막 페이지까지 수집합니다.
+    요청 하나만 수집하므로 삭제는 이 요청의 범위에서만 판단합니다 (데이터셋 전체 정리는 fetch_all).
+    """
+    started = fetch_all.client.request_count
+    passes = {}
+    query_watermarks = None if sweep else watermarks
+    with tqdm(disable=True) as pbar:
+        if query['kind'] == 'complex':
+            articles = fetch_all.fetch_by_complex_id(
+                query['id'], query['targets'], pbar, previous_data, query_watermarks, passes=passes
+            )
+        else:
+            articles = fetch_all.fetch_by_coordinates(
+                *query['bbox'], query['targets'], pbar, previous_data, query_watermarks, passes=passes
+            )
+    inserted, updated = fetch_all.save_to_csv(articles, previous_data, path)
+    fetch_all.update_lifecycle(passes, previous_data, path)
+    return inserted + updated, fetch_all.client.request_count - started
+
+
+def ensure_client(args):
+    """토큰이 만료되기 전에 인증을 갱신하여 클라이언트 반환"""
+    client = fetch_all.client
+    if client is not None:
+        expiry = auth_store.token_expiry(client.session.headers.get('Authorization', ''))
+        if expiry is None or expiry - auth_store.EXPIRY_MARGIN > time.time():
+            client.metrics = fetch_all.metrics
+            return client
+        client.close()
+    return fetch_all.connect(args.rps, args.workers)
+
+
+def run_once(args, registry, queries, schedule, previous_data, watermarks):
+    """수집 시각이 된 대상을 수집하고 다음 확인까지 기다릴 시간(초) 반환"""
+    now = time.time()
+    due = due_queries(queries, schedule, now)
+    # 이번에 수집하는 대상들의 계측 (수집한 대상이 있으면 보고서를 새로 씀)
+    fetch_all.metrics = crawl_metrics.CrawlMetrics()
+    for key, query in due:
+        if ensure_client(args) is None:
+            print("인증 정보를 가져오지 못했습니다. 잠시 후 다시 시도합니다.")
+            return args.poll
+        entry = schedule.setdefault(key, {})
+        label = crawl_planner.query_label(query['targets'])
+        sweep = now - entry.get('last_sweep', 0) >= SWEEP_INTERVAL
+        try:
+            changes, requests = run_query(
+                query, previous_data[query['dataset']], watermarks,
+                target_registry.dataset_output(registry, query['dataset']), sweep
+            )
+        except Exception as e:
+            print(f"{label} 수집 실패: {e}")
+            entry['retry_at'] = time.time() + MIN_INTERVAL
+            continue
+        if sweep:
+            entry['last_sweep'] = now
+        record_run(entry, changes, requests, time.time())
+        sync_state.save_watermarks(watermarks)
+        sync_state.save_page_hashes(fetch_all.page_hashes)
+        print(f"{label}: 변경 {changes}건, 요청 {requests}회, 다음 주기 {entry['interval'] / 60:.0f}분")
+
+    if due:
+        crawl_metrics.write_report(fetch_all.metrics, args.metrics)
+        if args.prometheus:
+            crawl_metrics.write_prometheus(fetch_all.metrics, args.prometheus)
+
+    demand, scale = fit_budget(schedule, args.budget)
+    if scale > 1:
+        print(f"예상 요청 수 {demand:.0f}회/시간이 예산 {args.budget}회를 넘어 주기를 {scale:.1f}배로 늘립니다.")
+    save_schedule(schedule)
+
+    upcoming = [due_at(schedule.get(key, {})) for key, _ in queries]
+    return max(0, min(min(upcoming) - time.time(), args.poll))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="변동률에 따라 대상별 주기로 매물을 수집하는 백그라운드 스케줄러")
+    parser.add_argument('--budget', type=float,
+                        default=float(os.getenv('CRAWL_BUDGET_PER_HOUR', DEFAULT_BUDGET)),
+                        help='시간당 전체 요청 수 상한')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('CRAWL_WORKERS', fetch_all.DEFAULT_WORKERS)),
+                        help='페이지 미리 요청에 쓰는 스레드 수')
+    parser.add_argument('--rps', type=float,
+                        default=float(os.getenv('CRAWL_RPS', fetch_all.DEFAULT_RPS)),
+                        help='전체 초당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--poll', type=float, default=POLL_SECONDS, help='일정 확인 최대 간격(초)')
+    parser.add_argument('--once', action='store_true', help='수집 시각이 된 대상만 한 번 수집하고 종료')
+    parser.add_argument('--targets', default=target_registry.TARGETS_FILE, help='수집 대상 등록 파일')
+    parser.add_argument('--metrics', default=crawl_metrics.METRICS_FILE, help='JSON 수집 보고서 경로')
+    parser.add_argument('--prometheus', default=os.getenv('CRAWL_PROMETHEUS_FILE'),
+                        help='수집 보고서를 Prometheus 텍스트 파일로도 저장할 경로')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv if argv is not None else [])
+
+    registry = target_registry.load_registry(args.targets)
+    queries = plan_queries(registry)
+    schedule = load_schedule()
+    previous_data = {
+        dataset: fetch_all.load_previous_data(target_registry.dataset_output(registry, dataset))
+        for dataset in registry['datasets']
+    }
+    watermarks = sync_state.load_watermarks()
+    fetch_all.page_hashes = sync_state.load_page_hashes()
+    fetch_all.stored_shards = set(fetch_all.page_hashes)
+    print(f"{len(queries)}개 대상의 수집 일정을 시작합니다 (시간당 요청 예산 {args.budget:.0f}회).")
+
+    try:
+        while True:
+            wait = run_once(args, registry, queries, schedule, previous_data, watermarks)
+            if args.once:
+                break
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        print("스케줄러를 종료합니다.")
+    finally:
+        if fetch_all.client is not None:
+            fetch_all.client.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
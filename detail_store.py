@@ -0,0 +1,108 @@
+import json
+import os
+import pickle
+import threading
+import time
+
+DETAIL_FILE = 'article_details.jsonl'
+LEGACY_CACHE_FILE = 'api_cache.pkl'
+
+
+class DetailStore:
+    """매물 상세 정보(/api/articles/{articleNo} 응답)를 한 줄씩 추가하는 저장소
+
+    각 기록은 {'articleNo', 'hash', 'at', 'detail'} 형식이며 같은 매물은 마지막 기록이
+    유효합니다. hash는 조회 당시 매물 행의 내용 해시로, 행이 바뀌면 다시 조회합니다.
+    저장소가 없거나 비어 있으면 이전 pickle 캐시(api_cache.pkl)를 한 번 옮겨 옵니다. 옮겨 온
+    매물은 hash가 None이며, pin으로 그때의 행 해시를 기록하기 전까지는 최신으로 봅니다.
+    """
+
+    def __init__(self, path=DETAIL_FILE, legacy_path=LEGACY_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}  # articleNo -> 마지막 기록 (이전 캐시에서 옮긴 매물은 hash가 None)
+        if os.path.exists(path):
+            self._load()
+        if not self.records and legacy_path:
+            self._migrate(legacy_path)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self.records[record['articleNo']] = record
+                except (json.JSONDecodeError, KeyError):
+                    continue
+
+    def _migrate(self, legacy_path):
+        try:
+            with open(legacy_path, 'rb') as f:
+                cache = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return
+        records = [
+            {'articleNo': str(article_no), 'hash': None, 'at': None, 'detail': detail}
+            for article_no, detail in cache.items() if detail
+        ]
+        self._append(records)
+        if records:
+            print(f"이전 상세 정보 캐시 {len(records)}건을 {self.path}로 옮겼습니다.")
+
+    def _append(self, records):
+        if not records:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                self.records[record['articleNo']] = record
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __contains__(self, article_no):
+        return article_no in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, article_no, default=None):
+        """저장된 상세 정보 (없으면 default)"""
+        record = self.records.get(article_no)
+        return default if record is None else record['detail']
+
+    def put(self, article_no, detail, row_hash=None):
+        """상세 정보를 기록 (row_hash는 조회 당시 매물 행의 내용 해시)"""
+        record = {
+            'articleNo': str(article_no), 'hash': row_hash,
+            'at': time.strftime('%Y-%m-%d %H:%M:%S'), 'detail': detail
+        }
+        with self.lock:
+            self._append([record])
+
+    def is_current(self, article_no, row_hash):
+        """현재 행 내용으로 조회한 상세 정보가 있는지 확인 (이전 캐시에서 옮긴 매물은 최신으로 봄)"""
+        record = self.records.get(article_no)
+        return record is not None and record['hash'] in (None, row_hash)
+
+    def pin(self, row_hashes):
+        """이전 캐시에서 옮긴 매물에 현재 행 해시를 기록하고 기록한 수 반환
+
+        row_hashes는 {articleNo: 행 해시}입니다. 기록한 뒤로는 행이 바뀌면 다시 조회합니다.
+        """
+        with self.lock:
+            records = []
+            for article_no, row_hash in row_hashes.items():
+                record = self.records.get(article_no)
+                if record is not None and record['hash'] is None:
+                    records.append(dict(record, hash=row_hash))
+            self._append(records)
+        return len(records)
+
+    def compact(self):
+        """매물별 마지막 기록만 남기도록 임시 파일에 다시 쓴 뒤 교체"""
+        with self.lock:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for record in self.records.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.path)
@@ -0,0 +1,117 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+import fetch_all
+import listing_store
+import target_registry
+from detail_store import DetailStore, DETAIL_FILE
+from listing_lifecycle import ListingLifecycle, lifecycle_path, active_listings
+
+DEFAULT_WORKERS = 2  # 동시에 진행하는 상세 정보 요청 수
+DEFAULT_RPS = 1.0  # 상세 정보 초당 요청 수 제한
+
+
+def stale_listings(listings, store):
+    """상세 정보가 없거나 조회 이후 행 내용이 바뀐 매물의 [(매물번호, 행 해시)]"""
+    stale = []
+    row_hashes = {}
+    for article_no, row in listings.items():
+        row_hash = row_hashes[article_no] = listing_store.row_hash(row)
+        if not store.is_current(article_no, row_hash):
+            stale.append((article_no, row_hash))
+    # 이전 캐시에서 옮긴 매물은 지금 행 내용을 기준으로 삼음 (이후 행이 바뀌면 다시 조회)
+    store.pin(row_hashes)
+    return stale
+
+
+def fetch_detail(client, article_no):
+    """매물 상세 정보 조회 (실패 시 None)"""
+    try:
+        response = client.get(f"/api/articles/{article_no}?complexNo=")
+    except Exception as e:
+        print(f"{article_no} 상세 정보 조회 실패: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"{article_no} 상세 정보 조회 실패 - Status: {response.status_code}")
+        return None
+    return response.json()
+
+
+def enrich(client, store, listings, workers=DEFAULT_WORKERS, limit=None):
+    """상세 정보가 필요한 매물을 동시에 workers건까지 조회해 저장하고 (조회 수, 실패 수) 반환
+
+    조회한 매물은 바로 저장소에 기록되므로, 중간에 중단되어도 다시 실행하면 남은 매물부터 이어서 조회합니다.
+    """
+    stale = stale_listings(listings, store)
+    if limit is not None:
+        stale = stale[:limit]
+    if not stale:
+        return 0, 0
+
+    fetched = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            tqdm(total=len(stale), desc="상세 정보", unit="매물") as pbar:
+        futures = {
+            executor.submit(fetch_detail, client, article_no): (article_no, row_hash)
+            for article_no, row_hash in stale
+        }
+        for future in as_completed(futures):
+            article_no, row_hash = futures[future]
+            detail = future.result()
+            if detail is None:
+                failed += 1
+            else:
+                store.put(article_no, detail, row_hash)
+                fetched += 1
+            pbar.update(1)
+    return fetched, failed
+
+
+def enrich_dataset(client, store, path, workers=DEFAULT_WORKERS, limit=None):
+    """매물 CSV 하나의 게시 중인 매물을 상세 정보로 보강"""
+    listings = active_listings(listing_store.load_listings(path), ListingLifecycle(lifecycle_path(path)))
+    return enrich(client, store, listings, workers, limit)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="새로 추가되거나 바뀐 매물의 상세 정보를 일괄 조회해 저장")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('DETAIL_WORKERS', DEFAULT_WORKERS)),
+                        help='동시에 진행하는 상세 정보 요청 수')
+    parser.add_argument('--rps', type=float,
+                        default=float(os.getenv('DETAIL_RPS', DEFAULT_RPS)),
+                        help='초당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--limit', type=int, help='한 번에 조회할 최대 매물 수')
+    parser.add_argument('--store', default=DETAIL_FILE, help='상세 정보 저장소')
+    parser.add_argument('--targets', default=target_registry.TARGETS_FILE, help='수집 대상 등록 파일')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv if argv is not None else [])
+
+    registry = target_registry.load_registry(args.targets)
+    client = fetch_all.connect(args.rps, args.workers)
+    if client is None:
+        print("인증 정보를 가져오지 못했습니다.")
+        sys.exit(1)
+
+    store = DetailStore(args.store)
+    try:
+        for dataset in registry['datasets']:
+            path = target_registry.dataset_output(registry, dataset)
+            fetched, failed = enrich_dataset(client, store, path, args.workers, args.limit)
+            print(f"{path}: 상세 정보 {fetched}건 저장, 실패 {failed}건")
+    finally:
+        client.close()
+    store.compact()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,8 +1,10 @@
-import requests
 import json
 import time
-import csv
 import sys
+import argparse
+import hashlib
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from tqdm import tqdm
 import os
@@ -15,6 +17,35 @@ from selenium.common.exceptions import TimeoutException
 from seleniumwire import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from rate_limiter import TokenBucket
+from naver_client import NaverLandClient
+import sync_state
+from auth_store import get_auth_session
+from crawl_journal import CrawlJournal
+import listing_store
+import listing_db
+from listing_lifecycle import ListingLifecycle, lifecycle_path
+from price_history import PriceHistory, history_path
+import spatial_crawler
+import crawl_planner
+from raw_archive import RawArchive
+import target_registry
+import crawl_metrics
+from update_centum_b_office import classify_row
+
+DEFAULT_WORKERS = 4  # 동시에 수집할 대상 수
+DEFAULT_RPS = 2.0  # 전체 초당 요청 수 제한
+
+UNCHANGED_PAGES_STOP = 2  # 지난 수집과 같은 페이지가 연속으로 이만큼 나오면 중단
+DEFAULT_TRACK_DAYS = 7  # 증분 수집 중에도 삭제 감지를 위해 마지막 페이지까지 다시 확인하는 주기 (일)
+
+# main()에서 설정되는 공유 API 클라이언트, 페이지 요청 스레드 풀, 원본 응답 보관소, 페이지 해시, 계측기
+client = None
+page_executor = None
+archive = None
+page_hashes = None
+stored_shards = set()  # 지난 수집에서 페이지 해시를 기록한 수집 키 (조각 분할 여부 판단용)
+metrics = None
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -127,99 +158,248 @@ def get_naver_auth_and_cookies():
                 pass
     return None, None
 
-def load_previous_data():
-    """이전 데이터 로드"""
+def load_previous_data(path=listing_store.LISTINGS_FILE):
+    """이전 데이터 로드 (SQLite 저장소, 없으면 기본 파일 + 변경분으로 생성)"""
+    conn = listing_db.open_store(path, ListingLifecycle(lifecycle_path(path)))
     try:
-        with open('songdo_apartments_listings.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            return {row['articleNo']: row for row in reader}
-    except FileNotFoundError:
-        return {}
-
-def get_last_update_time():
-    """마지막 업데이트 시간 가져오기"""
-    try:
-        with open('last_update.txt', 'r', encoding='utf-8') as f:
-            last_update = datetime.strptime(f.read().strip(), '%Y-%m-%d %H:%M:%S')
-    except (FileNotFoundError, ValueError):
-        last_update = datetime.now() - timedelta(days=7)  # 기본값: 7일 전
-    return last_update
-
-def parse_date(date_str):
-    """날짜 문자열을 datetime 객체로 변환"""
+        return listing_db.load_all(conn)
+    finally:
+        conn.close()
+
+def row_changed(article, previous_data):
+    """저장된 행과 내용 해시가 다른(신규/변경) 매물인지 확인 (분류 규칙 적용 후 비교)"""
+    old = previous_data.get(article.get('articleNo'))
+    if old is None:
+        return True
+    row = classify_row(listing_store.article_to_row(article))
+    return listing_store.row_hash(row) != listing_store.row_hash(old)
+
+def page_slot(page, order):
+    """수집 키 안에서 페이지 기록의 키 (정렬 순서가 다르면 같은 번호라도 다른 페이지)"""
+    return f"{order}:{page}"
+
+def unchanged_page(key, page, order, body):
+    """응답 본문 해시와, 지난 수집에서 같은 본문이었던 페이지 기록(없으면 None) 반환"""
+    if page_hashes is None:
+        return None, None
+    digest = hashlib.sha256(body).hexdigest()
+    record = page_hashes.get(key, {}).get(page_slot(page, order))
+    if record and record['hash'] == digest:
+        return digest, record
+    return digest, None
+
+def remember_page(key, page, order, digest, seen, more, newest):
+    """처리한 페이지의 해시, 분류된 매물번호, 다음 페이지 여부, 가장 최근 확인일을 다음 수집을 위해 기록
+
+    newest는 같은 페이지를 건너뛸 때도 기준일을 갱신할 수 있도록 남깁니다.
+    """
+    if page_hashes is not None and digest:
+        page_hashes.setdefault(key, {})[page_slot(page, order)] = {
+            'hash': digest, 'seen': sorted(seen), 'more': more, 'newest': newest
+        }
+
+def stored_layout(key):
+    """지난 수집에서 조각이 'split'(하위 조각으로 나눠 수집)/'crawled'(그대로 수집)였는지 (기록 없으면 None)"""
+    # 하위 조각은 'all/A1', 하위 타일은 '0.2'처럼 경로가 이어짐
+    if any(stored.startswith((key + '/', key + '.')) for stored in stored_shards):
+        return 'split'
+    if key in stored_shards:
+        return 'crawled'
+    return None
+
+def get_page_executor():
+    """페이지 요청용 스레드 풀 (필요 시 생성)"""
+    global page_executor
+    if page_executor is None:
+        page_executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS * 2)
+    return page_executor
+
+def iter_pages(fetch_page, max_pages, start_page=1):
+    """페이지 번호, 응답 future, 다음 페이지 미리 요청 함수를 순서대로 반환
+
+    다음 페이지는 현재 페이지를 확인한 쪽에서 prefetch()를 호출했을 때만 미리 요청하므로,
+    마지막 페이지나 기준일에 닿은 페이지 뒤로 쓸모없는 요청이 나가지 않습니다.
+    prefetch()를 호출하지 않고 다음 반복으로 넘어가면 그때 요청합니다.
+    """
+    executor = get_page_executor()
+    pending = {}
+
+    def request(page):
+        if page <= max_pages and page not in pending:
+            pending[page] = executor.submit(fetch_page, page)
+
+    page = start_page
     try:
-        # YYYYMMDD 형식
-        if len(date_str) == 8:
-            return datetime.strptime(date_str, '%Y%m%d')
-        # YYYY-MM-DD HH:MM:SS 형식
-        return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-    except ValueError:
-        return datetime.now()
-
-def fetch_by_complex_id(complex_id, complex_name, dong, pbar, previous_data):
-    """단지 코드로 매물 검색"""
+        while page <= max_pages:
+            request(page)
+            yield page, pending.pop(page), lambda next_page=page + 1: request(next_page)
+            page += 1
+    finally:
+        for future in pending.values():
+            future.cancel()
+
+def has_next_page(data, watermark):
+    """응답에 다음 페이지가 있고, 최신순 수집이면 이 페이지에서 아직 기준일에 닿지 않았는지 확인"""
+    articles = data.get("articleList", [])
+    if not articles or not data.get('isMoreData', True):
+        return False
+    oldest = articles[-1].get('articleConfirmYmd', '')
+    return not (watermark and oldest and oldest < watermark)
+
+# 페이지 단위 수집 요청 (단지 조각/좌표 타일이 같은 페이지 수집 과정을 공유)
+# path(page, order): 요청 경로를 만드는 함수, where: 로그에 쓰는 조각/타일 위치
+# source: 원본 보관소에 남기는 (종류, 대상), inside(article): 좌표 범위처럼 추가로 거르는 조건
+PageQuery = namedtuple('PageQuery', 'path referer source where inside', defaults=(None, None))
+
+def crawl_pages(query, targets, pbar, previous_data, incremental, watermark, journal, key,
+                track=False, splittable=False):
+    """요청 하나를 페이지 순서대로 수집하여 TileResult 반환
+
+    기준일이 없고 지난 수집 기록도 없는 splittable 요청은 먼저 마지막 페이지(max_pages)를 확인하고,
+    매물이 페이지 상한을 넘으면 수집하지 않고 포화로 반환하여 더 작은 조각으로 나눠 수집하게 합니다.
+    지난 수집에서 나눠 수집한 조각은 확인 없이 바로 나눕니다.
+    track이면 삭제 감지를 위해 새 데이터가 없어도 마지막 페이지까지 확인합니다.
+    지난 수집과 본문이 같은 페이지는 다시 처리하지 않으며, track이 아니면 연속으로 같으면 중단합니다.
+    어느 대상의 분류 규칙에도 맞지 않아 제외한 매물은 세어서 알리고 metrics에 기록합니다.
+    """
     all_articles = []
-    page = 1
+    complex_name = crawl_planner.query_label(targets)
     max_pages = 50  # 최대 페이지 수 제한
     no_new_data_count = 0  # 새로운 데이터가 없는 연속 페이지 수
-    last_update = get_last_update_time()
+    unchanged_pages = 0  # 지난 수집과 같은 연속 페이지 수
+    unmatched = 0  # 분류 규칙에 맞지 않아 제외한 매물 수
+    new_watermark = watermark
+    order = 'dateDesc' if incremental else 'rank'
+    failed = False
+    saturated = False
+    complete = False
+    seen = set()
+
+    # 저널에 남은 체크포인트부터 이어서 수집
+    # (앞 페이지에서 분류된 매물번호도 복원하며, 복원하지 못하면 삭제 판단에 쓰지 않음)
+    start_page = 1
+    resumed_partial = False
+    if journal:
+        all_articles, start_page, journal_watermark, done = journal.resume_state(key)
+        new_watermark = sync_state.advance(new_watermark, journal_watermark)
+        resumed_seen = journal.resumed_seen(key)
+        if resumed_seen is None:
+            resumed_partial = True
+        else:
+            seen |= resumed_seen
+        pbar.update(len(all_articles))
+        if done:
+            return spatial_crawler.TileResult(
+                all_articles, journal.was_saturated(key), False, new_watermark,
+                journal.was_complete(key) and not resumed_partial, seen
+            )
 
-    while page <= max_pages:
-        url = (
-            "https://new.land.naver.com/api/articles/complex/"
-            f"{complex_id}?realEstateType=APT&tradeType=&page={page}"
-            "&articleState=&viewerType=&complexNo="
-            f"{complex_id}&buildingNos=&areaNos=&type=list&order=rank"
-        )
+    def fetch_page(page):
+        return client.get(query.path(page, order), referer=query.referer)
+
+    # 기준일이 없으면 지난 수집의 분할을 따르고, 기록이 없을 때만 마지막 페이지를 확인하여 결정
+    # (그대로 수집한 조각이 그사이 커졌으면 마지막 페이지에서 포화로 판단되어 나뉨)
+    layout = stored_layout(key) if start_page == 1 and not watermark and splittable else 'crawled'
+    if layout == 'split':
+        if journal:
+            journal.record_done(key, None, saturated=True)
+        return spatial_crawler.TileResult([], True, False, None)
+    if layout is None:
+        try:
+            response = fetch_page(max_pages)
+            if response.status_code == 200 and response.json().get('isMoreData'):
+                print(f"{complex_name} 매물이 {max_pages}페이지를 넘어 나눠서 수집합니다 ({query.where})")
+                if journal:
+                    journal.record_done(key, None, saturated=True)
+                return spatial_crawler.TileResult([], True, False, None)
+        except Exception as e:
+            # 확인에 실패하면 나누지 않고 그대로 수집
+            print(f"{complex_name} 페이지 수 확인 실패 ({query.where}): {str(e)}")
 
+    for page, future, prefetch in iter_pages(fetch_page, max_pages, start_page):
         try:
-            # Create new headers for each request
-            request_headers = headers.copy()
-            request_headers['Referer'] = f'https://new.land.naver.com/complexes/{complex_id}'
-            request_headers['Origin'] = 'https://new.land.naver.com'
-            request_headers['Host'] = 'new.land.naver.com'
-
-            # Add all required cookies
-            request_cookies = cookies.copy()
-            request_cookies.update({
-                'nhn.realestate.article.rlet_type_cd': 'A01',
-                'nhn.realestate.article.trade_type_cd': '""',
-                'landHomeFlashUseYn': 'Y'
-            })
-
-            response = requests.get(
-                url,
-                headers=request_headers,
-                cookies=request_cookies,
-                timeout=10
-            )
+            response = future.result()
 
             if response.status_code != 200:
-                print(f"{complex_name} 요청 실패 (페이지 {page}): {response.status_code}")
-                print(f"Request headers: {request_headers}")
-                print(f"Request cookies: {request_cookies}")
-                print(f"Response headers: {dict(response.headers)}")
-                print(f"Response body: {response.text}")
+                print(f"{complex_name} 요청 실패 ({query.where}, 페이지 {page}): {response.status_code}")
+                failed = True
                 break
 
+            if archive:
+                archive.store(response.content, *query.source, page, targets)
+
+            digest, previous_page = unchanged_page(key, page, order, response.content)
+            if previous_page:
+                # 지난 수집과 같은 페이지는 파싱/분류하지 않고 기록된 매물번호와 확인일만 사용
+                seen.update(previous_page['seen'])
+                if incremental:
+                    new_watermark = sync_state.advance(new_watermark, previous_page.get('newest'))
+                unchanged_pages += 1
+                if metrics:
+                    metrics.record_page(key.partition('#')[0], len(previous_page['seen']), 0, True)
+                if journal:
+                    journal.record_page(key, page, [], new_watermark, previous_page['seen'])
+                if not previous_page['more']:
+                    complete = True
+                    break
+                if page == max_pages:
+                    saturated = True
+                if not track and unchanged_pages >= UNCHANGED_PAGES_STOP:
+                    break
+                prefetch()
+                continue
+            unchanged_pages = 0
+
+            parse_started = time.perf_counter()
             data = response.json()
             articles = data.get("articleList", [])
-            
+            # 다음 페이지가 확실히 필요할 때만 분류하는 동안 미리 요청
+            if has_next_page(data, watermark):
+                prefetch()
+
             if not articles:
+                complete = True
                 break
 
             new_articles = []
+            page_seen = set()
+            page_newest = None
+            page_unmatched = 0
+            reached_watermark = False
             for article in articles:
                 article_no = article.get('articleNo')
-                confirm_date = parse_date(article.get('articleConfirmYmd', ''))
-
-                # 이전 데이터에 없거나 최근에 업데이트된 매물만 추가
-                if (article_no not in previous_data or 
-                    confirm_date > last_update):
-                    article['complexName'] = complex_name
-                    article['dong'] = dong
+                confirm_ymd = article.get('articleConfirmYmd', '')
+                page_newest = sync_state.advance(page_newest, confirm_ymd)
+                if incremental:
+                    # 최신순 정렬이므로 기준일보다 오래된 첫 매물에서 중단
+                    if watermark and confirm_ymd and confirm_ymd < watermark:
+                        reached_watermark = True
+                        break
+                    new_watermark = sync_state.advance(new_watermark, confirm_ymd)
+                if not article_no:
+                    continue
+
+                if query.inside and not query.inside(article):
+                    continue
+                # 분류 규칙에 맞는 대상의 complexName/dong 설정
+                if not crawl_planner.label_article(article, targets):
+                    page_unmatched += 1
+                    continue
+                page_seen.add(article_no)
+
+                # 저장된 행과 내용이 다른(신규/변경) 매물만 추가
+                if row_changed(article, previous_data):
                     new_articles.append(article)
 
+            seen |= page_seen
+            unmatched += page_unmatched
+            if not reached_watermark:
+                remember_page(key, page, order, digest, page_seen, data.get('isMoreData', True), page_newest)
+            if metrics:
+                metrics.add_parse(time.perf_counter() - parse_started)
+                metrics.record_page(key.partition('#')[0], len(page_seen), len(new_articles),
+                                    unmatched=page_unmatched)
+
             if new_articles:
                 all_articles.extend(new_articles)
                 pbar.update(len(new_articles))
@@ -227,228 +407,436 @@ def fetch_by_complex_id(complex_id, complex_name, dong, pbar, previous_data):
             else:
                 no_new_data_count += 1
 
+            if journal:
+                journal.record_page(key, page, new_articles, new_watermark, page_seen)
+
+            if reached_watermark:
+                break
+
+            if not data.get('isMoreData', True):
+                complete = True
+                break
+
             # 연속 3페이지 동안 새로운 데이터가 없으면 중단
-            if no_new_data_count >= 3:
+            if not incremental and not track and no_new_data_count >= 3:
                 break
 
-            page += 1
-            time.sleep(1)  # 딜레이 시간
+            # 마지막 페이지까지 매물이 남아 있으면 조각/타일을 더 나눠야 함
+            if page == max_pages and data.get('isMoreData', True):
+                saturated = True
 
         except Exception as e:
-            print(f"{complex_name} 오류 발생 (페이지 {page}): {str(e)}")
+            print(f"{complex_name} 오류 발생 ({query.where}, 페이지 {page}): {str(e)}")
+            failed = True
             break
 
+    if unmatched:
+        print(f"{complex_name} 분류 규칙에 맞지 않아 제외한 매물 {unmatched}개 ({query.where})")
+
+    complete = complete and not resumed_partial
+    if journal and not failed:
+        journal.record_done(key, new_watermark, saturated, complete)
+
+    return spatial_crawler.TileResult(all_articles, saturated, failed, new_watermark, complete, seen)
+
+def collect_seen(results):
+    """타일/조각 결과에서 확인한 매물번호를 모두 모음"""
+    seen = set()
+    for result in results:
+        seen.update(result.seen or ())
+    return seen
+
+def crawl_query(root, crawl_unit, key, watermarks, passes, workers):
+    """root부터 나눠 가며 crawl_unit(조각/타일)으로 수집하고 중복 제거된 매물 목록 반환
+
+    passes가 주어지면 passes[key]에 (확인한 매물번호, 마지막 페이지까지 확인했는지)를 기록하고,
+    watermarks가 주어지면 모든 조각/타일이 성공했을 때만 key의 기준일을 갱신합니다
+    (실패하면 다음 실행에서 다시 수집).
+    """
+    all_articles, results, complete = spatial_crawler.crawl_tiles(root, crawl_unit, workers=workers)
+    if passes is not None:
+        passes[key] = (collect_seen(results), complete)
+
+    if watermarks is not None and not any(result.failed for result in results):
+        new_watermark = watermarks.get(key)
+        for result in results:
+            new_watermark = sync_state.advance(new_watermark, result.watermark)
+        # 확인일을 하나도 얻지 못했으면 기준일 없이 두어 다음 실행에서 다시 확인
+        if new_watermark:
+            watermarks[key] = new_watermark
+
     return all_articles
 
-def save_to_csv(all_articles, previous_data):
-    """매물 정보를 CSV 파일로 저장"""
-    # 필드 정의
-    fields = [
-        'complexName', 'articleNo', 'articleName', 'tradeTypeName',
-        'dealOrWarrantPrc', 'rentPrc', 'floorInfo', 'area1', 'area2',
-        'direction', 'articleConfirmYmd', 'articleFeatureDesc',
-        'realtorName', 'realtorId', 'dong'
-    ]
-
-    # 기존 데이터와 새로운 데이터 병합
-    merged_data = previous_data.copy()
-    for article in all_articles:
-        article_no = article.get('articleNo')
-        if article_no:
-            row = {
-                'complexName': article.get('complexName', ''),
-                'articleNo': article.get('articleNo', ''),
-                'articleName': article.get('articleName', ''),
-                'tradeTypeName': article.get('tradeTypeName', ''),
-                'dealOrWarrantPrc': article.get('dealOrWarrantPrc', ''),
-                'rentPrc': article.get('rentPrc', ''),
-                'floorInfo': article.get('floorInfo', ''),
-                'area1': article.get('area2', ''),
-                'area2': article.get('area1', ''),
-                'direction': article.get('direction', ''),
-                'articleConfirmYmd': article.get('articleConfirmYmd', ''),
-                'articleFeatureDesc': article.get('articleFeatureDesc', ''),
-                'realtorName': article.get('realtorName', ''),
-                'realtorId': article.get('realtorId', ''),
-                'dong': article.get('dong', '')
-            }
-            merged_data[article_no] = row
-
-    # CSV 파일로 저장
-    with open('songdo_apartments_listings.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(merged_data.values())
+def fetch_complex_shard(complex_id, shard, targets, pbar, previous_data, incremental, watermark, journal, key,
+                        track=False):
+    """단지 요청의 필터 조각 하나를 페이지 순서대로 수집하여 TileResult 반환 (crawl_pages 참고)"""
+    real_estate_type, trade_type, area_nos = shard.filters()
 
-    # 마지막 업데이트 시간 저장
-    with open(get_resource_path('last_update.txt'), 'w', encoding='utf-8') as f:
-        f.write(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    def path(page, order):
+        return (
+            "/api/articles/complex/"
+            f"{complex_id}?realEstateType={real_estate_type}&tradeType={trade_type}&page={page}"
+            "&articleState=&viewerType=&complexNo="
+            f"{complex_id}&buildingNos=&areaNos={area_nos}&type=list&order={order}"
+        )
 
-def fetch_by_coordinates(lat_min, lat_max, lng_min, lng_max, complex_name, dong, pbar, previous_data):
-    """좌표 기반으로 매물 검색"""
-    all_articles = []
-    page = 1
-    max_pages = 50
-    no_new_data_count = 0
-    last_update = get_last_update_time()
+    query = PageQuery(path, f'https://new.land.naver.com/complexes/{complex_id}', ('complex', complex_id),
+                      shard.path)
+    return crawl_pages(query, targets, pbar, previous_data, incremental, watermark, journal, key, track,
+                       splittable=bool(shard.split()))
+
+def fetch_by_complex_id(complex_id, targets, pbar, previous_data, watermarks=None, journal=None,
+                        shard_workers=2, passes=None):
+    """단지 코드로 매물 검색
+
+    같은 단지를 가리키는 여러 대상(targets)은 한 번만 조회한 뒤 분류 규칙으로 나눠 줍니다.
+    매물이 페이지 상한(50페이지)을 넘는 단지는 거래 유형, 매물 유형, 면적대 순으로 요청을
+    나눠 병렬로 수집하고 매물번호 기준으로 합칩니다.
+    watermarks가 주어지면 최신순으로 조회하고 단지별 기준일보다 오래된 매물에서 중단합니다.
+    journal이 주어지면 페이지마다 체크포인트를 남기고, 이전 기록이 있으면 이어서 수집합니다.
+    passes가 주어지면 passes[단지 키]에 (확인한 매물번호, 마지막 페이지까지 확인했는지)를 기록합니다.
+    """
+    incremental = watermarks is not None
+    real_estate_type, trade_type = crawl_planner.query_filters(targets)
+    key = sync_state.complex_key(complex_id, real_estate_type, trade_type)
+    watermark = watermarks.get(key) if incremental else None
+
+    def crawl_shard(shard):
+        return fetch_complex_shard(
+            complex_id, shard, targets, pbar, previous_data,
+            incremental, watermark, journal, f"{key}#{shard.path}",
+            # 기준일 없이 처음부터 수집할 때만 끝까지 확인 (삭제 감지)
+            passes is not None and not watermark
+        )
+
+    return crawl_query(crawl_planner.QueryShard.root(targets), crawl_shard, key, watermarks, passes, shard_workers)
+
+def fetch_region_tile(tile, region, targets, pbar, previous_data, incremental, watermark, journal, key,
+                      track=False):
+    """좌표 영역의 타일 하나를 페이지 순서대로 수집하여 TileResult 반환 (crawl_pages 참고)
+
+    타일이 페이지 상한에 걸리면 crawl_tiles가 4개로 나눠 다시 수집합니다.
+    최대 깊이보다 얕은 타일은 조각처럼 마지막 페이지 확인과 지난 분할 기록으로 먼저 나눕니다.
+    """
+    lat_min, lat_max, lng_min, lng_max = region
+    real_estate_type, trade_type = crawl_planner.query_filters(targets)
 
-    while page <= max_pages:
+    def path(page, order):
         # 네이버 부동산 좌표 기반 검색 API
-        url = (
-            "https://new.land.naver.com/api/articles/region?"
-            f"lat={lat_min}&lon={lng_min}&lat2={lat_max}&lon2={lng_max}"
-            f"&realEstateType=APT&tradeType=&page={page}"
-            "&articleState=&viewerType=&type=list&order=rank"
+        return (
+            "/api/articles/region?"
+            f"lat={tile.lat_min}&lon={tile.lng_min}&lat2={tile.lat_max}&lon2={tile.lng_max}"
+            f"&realEstateType={real_estate_type}&tradeType={trade_type}&page={page}"
+            f"&articleState=&viewerType=&type=list&order={order}"
         )
 
-        try:
-            request_headers = headers.copy()
-            request_headers['Referer'] = 'https://new.land.naver.com/'
-            request_headers['Origin'] = 'https://new.land.naver.com'
-            request_headers['Host'] = 'new.land.naver.com'
-
-            request_cookies = cookies.copy()
-            request_cookies.update({
-                'nhn.realestate.article.rlet_type_cd': 'A01',
-                'nhn.realestate.article.trade_type_cd': '""',
-                'landHomeFlashUseYn': 'Y'
-            })
-
-            response = requests.get(
-                url,
-                headers=request_headers,
-                cookies=request_cookies,
-                timeout=10
-            )
-
-            if response.status_code != 200:
-                print(f"{complex_name} 좌표 검색 실패 (페이지 {page}): {response.status_code}")
-                break
+    def inside(article):
+        # 좌표 필터링 (정확한 범위 내에 있는지 확인)
+        article_lat = float(article.get('latitude', 0))
+        article_lng = float(article.get('longitude', 0))
+        return lat_min <= article_lat <= lat_max and lng_min <= article_lng <= lng_max
+
+    query = PageQuery(path, None, ('region', list(region)), f"타일 {tile.path}", inside)
+    return crawl_pages(query, targets, pbar, previous_data, incremental, watermark, journal, key, track,
+                       splittable=tile.depth < spatial_crawler.MAX_DEPTH)
+
+def fetch_by_coordinates(lat_min, lat_max, lng_min, lng_max, targets, pbar, previous_data,
+                         watermarks=None, journal=None, tile_workers=2, passes=None):
+    """좌표 기반으로 매물 검색
+
+    같은 영역을 가리키는 여러 대상(targets)은 한 번만 조회한 뒤 분류 규칙으로 나눠 줍니다.
+    영역을 타일로 수집하고, 결과가 페이지 상한에 걸린 타일만 4개로 나눠 다시 수집합니다.
+    watermarks가 주어지면 최신순으로 조회하고 영역별 기준일보다 오래된 매물에서 중단합니다.
+    journal이 주어지면 페이지마다 체크포인트를 남기고, 이전 기록이 있으면 이어서 수집합니다.
+    passes가 주어지면 passes[영역 키]에 (확인한 매물번호, 마지막 페이지까지 확인했는지)를 기록합니다.
+    """
+    region = (lat_min, lat_max, lng_min, lng_max)
+    incremental = watermarks is not None
+    key = sync_state.region_key(
+        crawl_planner.query_label(targets), lat_min, lat_max, lng_min, lng_max,
+        *crawl_planner.query_filters(targets)
+    )
+    watermark = watermarks.get(key) if incremental else None
+
+    def crawl_tile(tile):
+        return fetch_region_tile(
+            tile, region, targets, pbar, previous_data,
+            incremental, watermark, journal, f"{key}#{tile.path}",
+            # 기준일 없이 처음부터 수집할 때만 끝까지 확인 (삭제 감지)
+            passes is not None and not watermark
+        )
 
-            data = response.json()
-            articles = data.get("articleList", [])
-            
-            if not articles:
-                break
+    return crawl_query(spatial_crawler.Tile.root(*region), crawl_tile, key, watermarks, passes, tile_workers)
 
-            new_articles = []
-            for article in articles:
-                article_no = article.get('articleNo')
-                if article_no and article_no not in previous_data:
-                    # 좌표 필터링 (정확한 범위 내에 있는지 확인)
-                    article_lat = float(article.get('latitude', 0))
-                    article_lng = float(article.get('longitude', 0))
-                    
-                    if (lat_min <= article_lat <= lat_max and 
-                        lng_min <= article_lng <= lng_max):
-                        
-                        # complexName 설정
-                        article['complexName'] = complex_name
-                        article['dong'] = dong
-                        new_articles.append(article)
-                        pbar.update(1)
-
-            all_articles.extend(new_articles)
-            
-            if not new_articles:
-                no_new_data_count += 1
-                if no_new_data_count >= 3:
-                    break
-            else:
-                no_new_data_count = 0
+def save_to_csv(all_articles, previous_data, path=listing_store.LISTINGS_FILE):
+    """매물 정보를 CSV 변경분 파일에 저장
 
-            page += 1
-            time.sleep(1)
+    previous_data와 비교해 신규/변경된 행만 추가하고, 변경분이 커지면 백그라운드에서 압축합니다.
+    LISTING_STORAGE=full 이면 저장 직후 기본 파일까지 바로 다시 씁니다.
+    가격이 바뀐 매물은 가격 이력(*.prices.npz)에도 기록합니다.
+    (신규 수, 변경 수)를 반환합니다.
+    """
+    articles = [article for article in all_articles if article.get('articleNo')]
+    rows = [classify_row(listing_store.article_to_row(article)) for article in articles]
 
-        except Exception as e:
-            print(f"{complex_name} 좌표 검색 오류 (페이지 {page}): {str(e)}")
-            break
+    inserted, updated = listing_store.append_changes(rows, previous_data, path)
+    # 뷰어와 함께 쓰는 SQLite 저장소에도 반영 (CSV에 먼저 기록하므로 중단되면 다음 수집에서 다시 반영)
+    conn = listing_db.open_store(path)
+    try:
+        listing_db.upsert(conn, rows)
+    finally:
+        conn.close()
+    print(f"{path}: 신규 {inserted}개, 변경 {updated}개 매물을 저장했습니다.")
+    if metrics:
+        metrics.record_saved(path, inserted, updated)
+
+    history = PriceHistory(history_path(path))
+    price_changes = sum(
+        history.record(row['articleNo'], row['complexName'], row['dealOrWarrantPrc'],
+                       row['rentPrc'], article.get('priceChangeState', ''))
+        for row, article in zip(rows, articles)
+    )
+    history.save()
+    if price_changes:
+        print(f"{path}: {price_changes}개 매물의 가격 이력을 기록했습니다.")
+
+    if os.getenv('LISTING_STORAGE', 'delta') == 'full':
+        listing_store.compact(path)
+    else:
+        listing_store.compact_in_background(path)
 
-    return all_articles
+    # 마지막 업데이트 시간 저장
+    with open(get_resource_path('last_update.txt'), 'w', encoding='utf-8') as f:
+        f.write(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
-def main():
+    return inserted, updated
+
+def update_lifecycle(passes, stored, path, sweep=False):
+    """수집 결과로 매물 생애주기 기록을 갱신하고 (신규 등록 수, 삭제 수) 반환
+
+    삭제는 마지막 페이지까지 확인한 대상에서만 판단합니다. sweep이면(이번 실행에서 데이터셋의
+    모든 요청을 수집한 경우) passes의 모든 대상을 끝까지 확인했을 때 어느 대상에서도 보이지
+    않은 저장 매물까지 삭제로 기록합니다. 요청 일부만 수집했다면 sweep을 주지 않아야 합니다.
+    """
+    lifecycle = ListingLifecycle(lifecycle_path(path))
+    listed = removed = 0
+    for key, (seen, complete) in passes.items():
+        key_listed, key_removed = lifecycle.observe(key, seen, complete)
+        listed += key_listed
+        removed += key_removed
+    all_seen = set()
+    for seen, _ in passes.values():
+        all_seen |= seen
+    if metrics:
+        metrics.record_seen(path, len(all_seen))
+    if sweep and passes and all(complete for _, complete in passes.values()):
+        removed += lifecycle.sweep(stored.keys(), all_seen)
+    conn = listing_db.open_store(path)
+    try:
+        listing_db.mark_removed(conn, listing_db.removed_articles(lifecycle))
+    finally:
+        conn.close()
+    print(f"{path}: 새로 보인 매물 {listed}개, 삭제된 매물 {removed}개")
+    return listed, removed
+
+def query_key(query):
+    """계획된 요청(crawl_planner)의 기준일/생애주기 키"""
+    filters = crawl_planner.query_filters(query['targets'])
+    if 'id' in query:
+        return sync_state.complex_key(query['id'], *filters)
+    return sync_state.region_key(crawl_planner.query_label(query['targets']), *query['bbox'], *filters)
+
+def track_due(lifecycle, key, days, now=None):
+    """key를 마지막 페이지까지 확인한 지 days일이 지났는지 (기록이 없으면 True, days가 0 이하면 끄기)"""
+    if days <= 0:
+        return False
+    last_pass = lifecycle.passes.get(key)
+    if not last_pass:
+        return True
+    now = now or datetime.now()
+    return now - datetime.strptime(last_pass, '%Y-%m-%d %H:%M:%S') >= timedelta(days=days)
+
+def parse_args(argv):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="네이버 부동산 매물 수집")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('CRAWL_WORKERS', DEFAULT_WORKERS)),
+                        help='동시에 수집할 대상 수')
+    parser.add_argument('--rps', type=float,
+                        default=float(os.getenv('CRAWL_RPS', DEFAULT_RPS)),
+                        help='전체 초당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--full', action='store_true',
+                        help='대상별 기준일을 무시하고 전체 페이지를 다시 수집')
+    parser.add_argument('--track-days', type=float,
+                        default=float(os.getenv('CRAWL_TRACK_DAYS', DEFAULT_TRACK_DAYS)),
+                        help='증분 수집 중에도 마지막 완전 수집이 이 일수보다 오래된 대상은 삭제 감지를 위해 '
+                             '전체 페이지를 다시 확인 (0이면 --full에서만)')
+    parser.add_argument('--resume', action='store_true',
+                        help='중단된 이전 수집을 마지막 체크포인트부터 이어서 진행')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='API 응답 원본을 raw_archive에 보관하지 않음')
+    parser.add_argument('--targets', default=target_registry.TARGETS_FILE,
+                        help='수집 대상 등록 파일')
+    parser.add_argument('--metrics', default=crawl_metrics.METRICS_FILE,
+                        help='요청/페이지/저장 결과를 기록할 JSON 수집 보고서 경로')
+    parser.add_argument('--prometheus', default=os.getenv('CRAWL_PROMETHEUS_FILE'),
+                        help='수집 보고서를 Prometheus 텍스트 파일로도 저장할 경로 (textfile collector)')
+    parser.add_argument('--enrich', action='store_true',
+                        help='수집 후 새로 추가되거나 바뀐 매물의 상세 정보를 조회해 저장')
+    return parser.parse_args(argv)
+
+def connect(rps, workers):
+    """인증 후 모든 요청이 공유하는 클라이언트를 만들어 반환 (실패 시 None)"""
+    global client
+    auth_token, cookies = get_auth_session(get_naver_auth_and_cookies)
+    if not auth_token or not cookies:
+        return None
+
+    # 모든 요청이 공유하는 세션 (헤더/쿠키는 한 번만 설정)
+    client = NaverLandClient(
+        auth_token, cookies,
+        rate_limiter=TokenBucket(rps),
+        pool_size=workers * 2,
+        metrics=metrics
+    )
+    return client
+
+def main(argv=None):
     """메인 함수"""
     # Load environment variables
     load_dotenv()
+    args = parse_args(argv if argv is not None else [])
+
+    global page_executor, archive, page_hashes, stored_shards, metrics
+
+    # 요청 지연 시간, 전송량, 대상별 페이지/매물 수 등 수집 계측
+    metrics = crawl_metrics.CrawlMetrics()
+
+    # 수집 대상과 저장할 데이터셋 (crawl_targets.json)
+    registry = target_registry.load_registry(args.targets)
 
     # Get authentication
     print("매물 수집을 시작합니다...")
-    global auth_token, cookies, headers
-    auth_token, cookies = get_naver_auth_and_cookies()
-    if not auth_token or not cookies:
+    if connect(args.rps, args.workers) is None:
         print("인증 정보를 가져오지 못했습니다.")
         exit(1)
 
-    # Set headers with the obtained auth token
-    headers = {
-        'Authorization': auth_token,
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-        'Accept': '*/*',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Connection': 'keep-alive',
-        'Referer': 'https://new.land.naver.com/',
-        'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"macOS"',
-        'Sec-Fetch-Dest': 'empty',
-        'Sec-Fetch-Mode': 'cors',
-        'Sec-Fetch-Site': 'same-origin'
+    # 데이터셋별 이전 데이터 로드
+    previous_data = {
+        dataset: load_previous_data(target_registry.dataset_output(registry, dataset))
+        for dataset in registry['datasets']
     }
 
-    # 이전 데이터 로드
-    previous_data = load_previous_data()
-    
-    # ID 기반 수집 가능한 단지들 (센텀하이브 A동 제외)
-    complexes = [
-        {"id": "142817", "name": "더샵송도센텀하이브B", "dong": ""},
-        {"id": "142816", "name": "송도센트로드", "dong": ""},
-        {"id": "142815", "name": "송도아크베이", "dong": ""}
-    ]
-
-    # 센텀하이브 좌표 정보
-    centum_coordinates = {
-        "A동": {
-            "lat_min": 37.393104, "lat_max": 37.395104,
-            "lng_min": 126.637004, "lng_max": 126.639004,
-            "name": "센텀하이브A동오피스"
-        },
-        "B동상가": {
-            "lat_min": 37.393104, "lat_max": 37.395104,
-            "lng_min": 126.637004, "lng_max": 126.639004,
-            "name": "센텀하이브B동상가"
-        }
+    # 대상별 증분 수집 기준일 (--full이면 기존 방식으로 전체 수집)
+    watermarks = None if args.full else sync_state.load_watermarks()
+
+    # 지난 수집의 페이지 해시 (같은 페이지는 다시 처리하지 않음, --full이면 새로 기록)
+    # 기록된 수집 키는 --full에서도 조각 분할 여부를 판단하는 데 사용
+    stored_page_hashes = sync_state.load_page_hashes()
+    stored_shards = set(stored_page_hashes)
+    page_hashes = {} if args.full else stored_page_hashes
+
+    # 응답 원본 보관 (python raw_archive.py replay 로 네트워크 없이 재생성 가능)
+    archive = None if args.no_archive else RawArchive()
+
+    # 페이지 단위 체크포인트 저널 (--resume이면 이전 기록을 이어서 사용)
+    journal = CrawlJournal(resume=args.resume)
+
+    complex_queries = crawl_planner.plan_complex_queries(target_registry.complex_targets(registry))
+    region_queries = crawl_planner.plan_region_queries(target_registry.region_targets(registry))
+
+    # 증분 수집이라도 마지막 완전 수집이 오래된 요청은 기준일 없이 끝까지 확인 (삭제 감지)
+    lifecycles = {
+        dataset: ListingLifecycle(lifecycle_path(target_registry.dataset_output(registry, dataset)))
+        for dataset in registry['datasets']
     }
-    
-    all_articles = []
-    # Estimate total articles for progress bar
-    total_articles = len(complexes) * 50 + len(centum_coordinates) * 30
-
-    with tqdm(total=total_articles, desc="전체 진행률", unit="매물") as pbar:
-        # ID 기반 수집 (기존 단지들)
-        for complex_info in complexes:
-            articles = fetch_by_complex_id(
-                complex_info["id"],
-                complex_info["name"],
-                complex_info["dong"],
+    tracked = set()
+    if watermarks is not None:
+        tracked = {
+            id(query) for query in complex_queries + region_queries
+            if track_due(lifecycles[query["dataset"]], query_key(query), args.track_days)
+        }
+        if tracked:
+            print(f"{len(tracked)}개 요청은 삭제 감지를 위해 전체 페이지를 다시 확인합니다.")
+
+    def query_watermarks(query):
+        return None if id(query) in tracked else watermarks
+
+    all_articles = {dataset: [] for dataset in registry['datasets']}
+    # 대상별로 확인한 매물번호 (삭제 감지용)
+    passes = {dataset: {} for dataset in registry['datasets']}
+    # 신규/변경 매물 수는 미리 알 수 없으므로 개수만 표시 (실제 규모는 수집 보고서 참고)
+    with tqdm(desc="신규/변경 매물", unit="매물") as pbar, \
+            ThreadPoolExecutor(max_workers=args.workers * 2) as page_pool, \
+            ThreadPoolExecutor(max_workers=args.workers) as target_pool:
+        page_executor = page_pool
+        futures = []
+
+        # ID 기반 수집
+        for query in complex_queries:
+            futures.append((query["dataset"], target_pool.submit(
+                fetch_by_complex_id,
+                query["id"],
+                query["targets"],
                 pbar,
-                previous_data
-            )
-            all_articles.extend(articles)
+                previous_data[query["dataset"]],
+                query_watermarks(query),
+                journal,
+                passes=passes[query["dataset"]]
+            )))
         
-        # 좌표 기반 수집 (센텀하이브 A동, B동 상가)
-        for coord_key, coord_info in centum_coordinates.items():
-            articles = fetch_by_coordinates(
-                coord_info["lat_min"], coord_info["lat_max"],
-                coord_info["lng_min"], coord_info["lng_max"],
-                coord_info["name"], coord_key, pbar, previous_data
-            )
-            all_articles.extend(articles)
+        # 좌표 기반 수집 (같은 영역의 대상들은 한 번만 조회)
+        for query in region_queries:
+            futures.append((query["dataset"], target_pool.submit(
+                fetch_by_coordinates,
+                *query["bbox"], query["targets"], pbar, previous_data[query["dataset"]],
+                query_watermarks(query), journal, passes=passes[query["dataset"]]
+            )))
+
+        # 제출 순서대로 결과를 모아 기존과 같은 병합 순서 유지
+        for dataset, future in futures:
+            all_articles[dataset].extend(future.result())
+        page_executor = None
     
-    # 수집된 매물 저장
-    save_to_csv(all_articles, previous_data)
+    # 수집된 매물을 데이터셋별로 저장
+    query_counts = Counter(query["dataset"] for query in complex_queries + region_queries)
+    for dataset, articles in all_articles.items():
+        output = target_registry.dataset_output(registry, dataset)
+        save_to_csv(articles, previous_data[dataset], output)
+        # 데이터셋의 모든 요청이 이번 실행에서 결과를 남겼을 때만 데이터셋 전체 삭제 판단
+        update_lifecycle(
+            passes[dataset], previous_data[dataset], output,
+            sweep=len(passes[dataset]) == query_counts[dataset]
+        )
+    if watermarks is not None:
+        sync_state.save_watermarks(watermarks)
+    sync_state.save_page_hashes(page_hashes)
+
+    # 실패한 대상이 있으면 저널을 남겨 --resume으로 이어서 수집
+    pending = journal.pending_targets()
+    journal.close(completed=not pending)
+    if pending:
+        print(f"{len(pending)}개 대상의 수집이 완료되지 않았습니다. --resume 옵션으로 이어서 수집할 수 있습니다.")
     
-    print(f"총 {len(all_articles)}개의 새로운/업데이트된 매물 발견")
-    print(f"전체 {len(previous_data)}개의 매물 정보를 저장했습니다.")
+    print(f"총 {sum(len(articles) for articles in all_articles.values())}개의 새로운/업데이트된 매물 발견")
+    print(f"전체 {sum(len(data) for data in previous_data.values())}개의 매물 정보를 저장했습니다.")
+
+    # 수집 보고서 (JSON, 선택적으로 Prometheus 텍스트 파일)
+    crawl_metrics.write_report(metrics, args.metrics)
+    if args.prometheus:
+        crawl_metrics.write_prometheus(metrics, args.prometheus)
+    report = metrics.report()
+    print(f"요청 {report['requests']}회 (재시도 {report['retries']}회), {report['bytes'] / 1024:.0f}KB, "
+          f"대기 {report['wait_seconds']:.1f}초, 파싱 {report['parse_seconds']:.1f}초 - {args.metrics}")
+
+    # 상세 정보 보강 (python enrich_details.py 로 따로 실행할 수도 있음)
+    if args.enrich:
+        import enrich_details
+        store = enrich_details.DetailStore()
+        for dataset in registry['datasets']:
+            output = target_registry.dataset_output(registry, dataset)
+            fetched, failed = enrich_details.enrich_dataset(client, store, output)
+            print(f"{output}: 상세 정보 {fetched}건 저장, 실패 {failed}건")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(sys.argv[1:]) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+import numpy as np
+
+# 매물번호 접두어 검색의 상한 (접두어 뒤에 붙을 수 있는 가장 큰 문자)
+_PREFIX_END = '\uffff'
+
+
+def _category_masks(codes, size):
+    """범주 부호 배열 -> (범주 수, 행 수) 불리언 행렬 (i번째 행이 부호 i인 매물)"""
+    masks = np.zeros((size, len(codes)), dtype=bool)
+    masks[codes, np.arange(len(codes))] = True
+    return masks
+
+
+class FilterIndex:
+    """검색 조건별 불리언 마스크를 미리 만들어 두는 필터 색인
+
+    단지/동/거래유형 값마다, 그리고 저장한 매물에 대해 행 수만큼의 불리언 배열을 한 번 만들어 두고,
+    검색할 때는 해당하는 배열을 AND로 합치기만 합니다. 매물번호 접두어는 정렬해 둔 매물번호에서
+    searchsorted로 범위를 찾습니다. 데이터를 다시 불러오면 새로 만들고, 저장 여부는 set_saved로
+    해당 비트만 바꿉니다.
+    """
+
+    def __init__(self, table, saved_items=()):
+        self.table = table
+        self.masks = {
+            column: _category_masks(getattr(table, column), len(table.categories[column]))
+            for column in table.categories
+        }
+        self.saved = np.isin(table.article_nos, [str(no) for no in saved_items])
+        self.article_order = np.argsort(table.article_nos, kind='stable')
+        self.sorted_article_nos = table.article_nos[self.article_order]
+
+    def set_saved(self, article_no, saved):
+        """매물 하나의 저장 여부 갱신 (표에 없는 매물은 무시)"""
+        position = self.table.positions.get(str(article_no))
+        if position is not None:
+            self.saved[position] = saved
+
+    def _category(self, column, value):
+        code = self.table.code(column, value)
+        if code < 0:
+            return np.zeros(len(self.table), dtype=bool)
+        return self.masks[column][code]
+
+    def _prefix(self, article_prefix):
+        lo = np.searchsorted(self.sorted_article_nos, article_prefix, side='left')
+        hi = np.searchsorted(self.sorted_article_nos, article_prefix + _PREFIX_END, side='left')
+        mask = np.zeros(len(self.table), dtype=bool)
+        mask[self.article_order[lo:hi]] = True
+        return mask
+
+    def mask(self, complex_name=None, dong=None, trade_type=None, article_prefix=None, saved_only=False):
+        """조건을 모두 만족하는 행의 불리언 배열 (None/빈 조건은 무시)"""
+        masks = [
+            self._category(column, value)
+            for column, value in (('complex', complex_name), ('dong', dong), ('trade', trade_type))
+            if value is not None
+        ]
+        if article_prefix:
+            masks.append(self._prefix(article_prefix))
+        if saved_only:
+            masks.append(self.saved)
+        if not masks:
+            return np.ones(len(self.table), dtype=bool)
+        result = masks[0].copy()
+        for mask in masks[1:]:
+            result &= mask
+        return result
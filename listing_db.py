@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import threading
+
+import listing_store
+from crawl_planner import parse_floor
+from listing_store import FIELDS
+from listing_table import SORT_COLUMNS
+from price_history import parse_price
+
+# 정렬/범위 조회용 숫자 열 (문자열 필드에서 계산, 뷰어 정렬 대상과 같은 열)
+NUMERIC_COLUMNS = list(SORT_COLUMNS.values())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    articleNo TEXT PRIMARY KEY,
+    complexName TEXT NOT NULL DEFAULT '',
+    articleName TEXT NOT NULL DEFAULT '',
+    tradeTypeName TEXT NOT NULL DEFAULT '',
+    dealOrWarrantPrc TEXT NOT NULL DEFAULT '',
+    rentPrc TEXT NOT NULL DEFAULT '',
+    floorInfo TEXT NOT NULL DEFAULT '',
+    area1 TEXT NOT NULL DEFAULT '',
+    area2 TEXT NOT NULL DEFAULT '',
+    direction TEXT NOT NULL DEFAULT '',
+    articleConfirmYmd TEXT NOT NULL DEFAULT '',
+    articleFeatureDesc TEXT NOT NULL DEFAULT '',
+    realtorName TEXT NOT NULL DEFAULT '',
+    realtorId TEXT NOT NULL DEFAULT '',
+    dong TEXT NOT NULL DEFAULT '',
+    price INTEGER,
+    rent INTEGER,
+    floor INTEGER,
+    area REAL,
+    removed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS listings_complex_dong ON listings (complexName, dong);
+CREATE INDEX IF NOT EXISTS listings_trade_type ON listings (tradeTypeName);
+CREATE INDEX IF NOT EXISTS listings_complex_trade_area ON listings (complexName, tradeTypeName, area);
+CREATE INDEX IF NOT EXISTS listings_confirm_date ON listings (articleConfirmYmd);
+DROP INDEX IF EXISTS listings_price;
+DROP INDEX IF EXISTS listings_rent;
+DROP INDEX IF EXISTS listings_area;
+""" + ''.join(
+    # 거래유형을 고른 뒤 숫자 열로 정렬하는 조회를 색인 순서로 읽음
+    f"CREATE INDEX IF NOT EXISTS listings_trade_{column} ON listings (tradeTypeName, {column});\n"
+    for column in NUMERIC_COLUMNS
+)
+
+_write_lock = threading.Lock()
+
+
+def db_path(path):
+    """매물 CSV 옆에 두는 SQLite 저장소 경로 (*.db)"""
+    base, _ = os.path.splitext(path)
+    return f"{base}.db"
+
+
+def connect(path):
+    """WAL 모드로 저장소를 열고 테이블/색인이 없으면 생성
+
+    WAL 모드에서는 수집기가 쓰는 동안에도 뷰어가 마지막으로 커밋된 상태를 읽을 수 있습니다.
+    """
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def open_store(path, lifecycle=None):
+    """매물 CSV의 SQLite 저장소를 열고, 비어 있으면 CSV(기본 파일 + 변경분)로 채움
+
+    lifecycle(ListingLifecycle)이 주어지면 처음 채울 때 삭제된 매물을 표시합니다.
+    """
+    conn = connect(db_path(path))
+    if count(conn) == 0:
+        listings = listing_store.load_listings(path)
+        if listings:
+            replace_all(conn, listings.values())
+            if lifecycle is not None:
+                mark_removed(conn, removed_articles(lifecycle))
+    return conn
+
+
+def removed_articles(lifecycle):
+    """생애주기 기록에서 삭제된 매물번호"""
+    return [article_no for article_no in lifecycle.listings if not lifecycle.is_active(article_no)]
+
+
+def parse_area(area_text):
+    try:
+        return float(area_text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _values(row):
+    numeric = {
+        'price': int(round(parse_price(row.get('dealOrWarrantPrc')))),
+        'rent': int(round(parse_price(row.get('rentPrc')))),
+        'floor': parse_floor(row.get('floorInfo'))[0],
+        'area': parse_area(row.get('area2'))
+    }
+    return [row.get(field) or '' for field in FIELDS] + [numeric[column] for column in NUMERIC_COLUMNS]
+
+
+_COLUMNS = FIELDS + NUMERIC_COLUMNS
+_UPSERT = (
+    f"INSERT INTO listings ({', '.join(_COLUMNS)}, removed) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)}, 0) "
+    f"ON CONFLICT(articleNo) DO UPDATE SET "
+    + ', '.join(f"{column} = excluded.{column}" for column in _COLUMNS if column != 'articleNo')
+)
+
+
+def upsert(conn, rows):
+    """행을 매물번호 기준으로 추가/갱신 (삭제 표시는 mark_removed로 갱신)"""
+    with _write_lock, conn:
+        conn.executemany(_UPSERT, [_values(row) for row in rows if row.get('articleNo')])
+
+
+def replace_all(conn, rows):
+    """저장소의 모든 행을 주어진 행으로 교체"""
+    with _write_lock, conn:
+        conn.execute("DELETE FROM listings")
+        conn.executemany(_UPSERT, [_values(row) for row in rows if row.get('articleNo')])
+
+
+def mark_removed(conn, article_nos):
+    """생애주기 기록에서 삭제된 매물 표시 (그 외 매물은 표시 해제)"""
+    with _write_lock, conn:
+        conn.execute("UPDATE listings SET removed = 0 WHERE removed = 1")
+        conn.executemany("UPDATE listings SET removed = 1 WHERE articleNo = ?", [(no,) for no in article_nos])
+
+
+def count(conn, confirmed_since=None, include_removed=True):
+    """매물 수 (confirmed_since가 주어지면 그 날 이후 확인된 매물만)"""
+    where, params = _where(include_removed=include_removed, confirmed_since=confirmed_since)
+    return conn.execute(f"SELECT COUNT(*) FROM listings{where}", params).fetchone()[0]
+
+
+def latest_confirm_date(conn):
+    """가장 최근 확인일 (YYYYMMDD, 비어 있으면 None)"""
+    return conn.execute("SELECT MAX(articleConfirmYmd) FROM listings WHERE articleConfirmYmd != ''").fetchone()[0]
+
+
+def load_all(conn, include_removed=True):
+    """{매물번호: 행} (CSV에서 읽은 것과 같은 문자열 값)"""
+    sql = f"SELECT {', '.join(FIELDS)} FROM listings"
+    if not include_removed:
+        sql += " WHERE removed = 0"
+    return {row[1]: dict(zip(FIELDS, row)) for row in conn.execute(sql)}
+
+
+def _where(complex_name=None, dong=None, trade_type=None, article_prefix=None, article_nos=None,
+           include_removed=False, area=None, area_window=5.0, confirmed_since=None):
+    clauses, params = [], []
+    if not include_removed:
+        clauses.append("removed = 0")
+    if complex_name:
+        clauses.append("complexName = ?")
+        params.append(complex_name)
+    if dong:
+        clauses.append("dong = ?")
+        params.append(dong)
+    if trade_type:
+        clauses.append("tradeTypeName = ?")
+        params.append(trade_type)
+    if article_prefix:
+        # 매물번호 색인(기본 키)을 쓰도록 LIKE 대신 범위 조건 사용
+        clauses.append("articleNo >= ? AND articleNo < ?")
+        params.extend([article_prefix, article_prefix + '\uffff'])
+    if article_nos is not None:
+        clauses.append("articleNo IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps([str(no) for no in article_nos]))
+    if area is not None:
+        clauses.append("area BETWEEN ? AND ?")
+        params.extend([area - area_window, area + area_window])
+    if confirmed_since:
+        clauses.append("articleConfirmYmd >= ?")
+        params.append(confirmed_since)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def query(conn, complex_name=None, dong=None, trade_type=None, article_prefix=None, article_nos=None,
+          sort=None, descending=False, limit=None, offset=0, include_removed=False,
+          area=None, area_window=5.0, confirmed_since=None):
+    """조건에 맞는 행을 정렬해 반환 (sort는 SORT_COLUMNS의 열 이름)
+
+    area가 주어지면 전용면적 ±area_window, confirmed_since(YYYYMMDD)가 주어지면 그 날 이후
+    확인된 매물만 반환합니다. 값이 없는 숫자(예: '저/48' 층)는 정렬 방향과 관계없이 맨 뒤에 둡니다.
+    거래유형이 주어지면 정렬은 (거래유형, 열) 색인 순서로 읽습니다.
+    """
+    where, params = _where(complex_name, dong, trade_type, article_prefix, article_nos, include_removed,
+                           area, area_window, confirmed_since)
+    select = f"SELECT {', '.join(FIELDS)} FROM listings{where}"
+    if sort not in NUMERIC_COLUMNS:
+        return _fetch(conn, select + " ORDER BY rowid", params, limit, offset)
+
+    # 'IS NULL' 정렬 키는 색인을 쓰지 못하므로 값이 있는 행과 없는 행을 나눠 읽음
+    joiner = " AND " if where else " WHERE "
+    direction = 'DESC' if descending else 'ASC'
+    valued = f"{select}{joiner}{sort} IS NOT NULL"
+    rows = _fetch(conn, f"{valued} ORDER BY {sort} {direction}, rowid {direction}", params, limit, offset)
+    if limit is not None and len(rows) >= limit:
+        return rows
+    if limit is not None:
+        valued_count = conn.execute(f"SELECT COUNT(*) FROM ({valued})", params).fetchone()[0]
+        limit, offset = limit - len(rows), max(offset - valued_count, 0)
+    return rows + _fetch(conn, f"{select}{joiner}{sort} IS NULL ORDER BY rowid", params, limit, offset)
+
+
+def _fetch(conn, sql, params, limit=None, offset=0):
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = params + [limit, offset]
+    return [dict(zip(FIELDS, row)) for row in conn.execute(sql, params)]
+
+
+def distinct(conn, column, complex_name=None, include_removed=False):
+    """열의 서로 다른 값 목록 (빈 값 제외, 정렬)"""
+    if column not in FIELDS:
+        raise ValueError(f"알 수 없는 열: {column}")
+    where, params = _where(complex_name=complex_name, include_removed=include_removed)
+    where += (" AND " if where else " WHERE ") + f"{column} != ''"
+    return [row[0] for row in conn.execute(f"SELECT DISTINCT {column} FROM listings{where} ORDER BY {column}", params)]
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+def lifecycle_path(path):
+    """매물 CSV 옆에 두는 생애주기 기록 경로 (*.lifecycle.jsonl)"""
+    base, _ = os.path.splitext(path)
+    return f"{base}.lifecycle.jsonl"
+
+
+class ListingLifecycle:
+    """매물의 등록/삭제를 한 줄씩 추가하는 생애주기 기록
+
+    기록 종류:
+      listed  - 처음 보였거나 삭제 후 다시 보인 매물 (scope: 처음 본 수집 대상 키)
+      pass    - scope의 모든 페이지를 끝까지 확인한 수집
+      removed - 자기 scope의 완전한 수집에서 보이지 않은 매물 (last_seen: 마지막으로 확인된 시각)
+    매 수집마다 모든 매물을 다시 쓰지 않으므로 기록은 변화가 있을 때만 늘어납니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.listings = {}  # articleNo -> {'scope', 'first_seen', 'last_seen', 'removed'}
+        self.passes = {}  # scope -> 마지막 완전 수집 시각
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        except FileNotFoundError:
+            return
+
+    def _apply(self, record):
+        if record['type'] == 'listed':
+            self.listings[record['articleNo']] = {
+                'scope': record['scope'], 'first_seen': record['at'],
+                'last_seen': record['at'], 'removed': None
+            }
+        elif record['type'] == 'removed':
+            # 기록 이전부터 저장되어 있던 매물은 삭제 기록만 있음
+            entry = self.listings.setdefault(record['articleNo'], {
+                'scope': None, 'first_seen': None, 'last_seen': None, 'removed': None
+            })
+            entry['removed'] = record['at']
+            entry['last_seen'] = record.get('last_seen') or entry['last_seen']
+        elif record['type'] == 'pass':
+            self.passes[record['scope']] = record['at']
+
+    def _append(self, records):
+        if not records:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                self._apply(record)
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def observe(self, scope, seen, complete, at=None):
+        """수집 대상 하나의 결과를 반영하고 (신규 등록 수, 삭제 수) 반환
+
+        seen은 이번 수집에서 보인 매물번호입니다. complete가 True(모든 페이지를 끝까지
+        확인)일 때만 scope에 속한 매물 중 보이지 않은 것을 삭제로 기록합니다.
+        """
+        at = at or time.strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            records = []
+            for article_no in seen:
+                entry = self.listings.get(article_no)
+                if entry is None or entry['removed']:
+                    records.append({'type': 'listed', 'articleNo': article_no, 'scope': scope, 'at': at})
+            listed = len(records)
+
+            removed = 0
+            if complete:
+                last_pass = self.passes.get(scope)
+                for article_no, entry in self.listings.items():
+                    if entry['scope'] == scope and not entry['removed'] and article_no not in seen:
+                        records.append({
+                            'type': 'removed', 'articleNo': article_no, 'at': at,
+                            'last_seen': max(last_pass or entry['first_seen'], entry['first_seen'])
+                        })
+                        removed += 1
+                records.append({'type': 'pass', 'scope': scope, 'at': at})
+
+            self._append(records)
+            return listed, removed
+
+    def sweep(self, article_nos, seen, at=None):
+        """모든 대상을 완전히 수집한 뒤, 어디에서도 보이지 않은 저장 매물을 삭제로 기록
+
+        기록을 시작하기 전에 저장된 매물이나 등록에서 빠진 대상의 매물처럼 scope가 없는
+        매물도 여기서 정리됩니다. 삭제한 매물 수를 반환합니다.
+        """
+        at = at or time.strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            records = [
+                {'type': 'removed', 'articleNo': article_no, 'at': at, 'last_seen': self.last_seen(article_no)}
+                for article_no in article_nos
+                if article_no not in seen and self.is_active(article_no)
+            ]
+            self._append(records)
+            return len(records)
+
+    def is_active(self, article_no):
+        """삭제로 기록되지 않은 매물인지 확인 (기록이 없는 이전 매물은 활성으로 간주)"""
+        entry = self.listings.get(article_no)
+        return entry is None or not entry['removed']
+
+    def last_seen(self, article_no):
+        """마지막으로 확인된 시각 (활성 매물은 자기 scope의 마지막 완전 수집 시각)"""
+        entry = self.listings.get(article_no)
+        if entry is None:
+            return None
+        if entry['removed'] or entry['first_seen'] is None:
+            return entry['last_seen']
+        return max(self.passes.get(entry['scope']) or entry['first_seen'], entry['first_seen'])
+
+    def days_on_market(self, article_no, now=None):
+        """처음 본 날부터 삭제일(활성 매물은 현재)까지의 일수"""
+        entry = self.listings.get(article_no)
+        if entry is None or entry['first_seen'] is None:
+            return None
+        first_seen = datetime.strptime(entry['first_seen'], '%Y-%m-%d %H:%M:%S')
+        if entry['removed']:
+            end = datetime.strptime(entry['removed'], '%Y-%m-%d %H:%M:%S')
+        else:
+            end = now or datetime.now()
+        return (end - first_seen).days
+
+
+def active_listings(listings, lifecycle):
+    """삭제된 매물을 제외한 {매물번호: 행}"""
+    return {
+        article_no: row for article_no, row in listings.items()
+        if lifecycle.is_active(article_no)
+    }
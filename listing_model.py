@@ -0,0 +1,165 @@
+import math
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QEvent, QModelIndex, QUrl
+from PySide6.QtGui import QColor, QDesktopServices
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionButton, QApplication
+
+# (헤더, 행 필드) - 필드가 None인 열은 계산해서 표시
+COLUMNS = [
+    ("단지명", "complexName"),
+    ("동", "dong"),
+    ("층", "floorInfo"),
+    ("매물번호", "articleNo"),
+    ("거래유형", "tradeTypeName"),
+    ("보증금/매매가", "dealOrWarrantPrc"),
+    ("월세", "rentPrc"),
+    ("면적(m²)", "area2"),
+    ("중개사", None),
+    ("시세비교", None),
+    ("저장", None),
+]
+ARTICLE_NO_COLUMN = 3
+REALTOR_COLUMN = 8
+COMPARISON_COLUMN = 9
+SAVED_COLUMN = 10
+
+LINK_COLOR = QColor("#0066cc")
+CHEAPER_COLOR = QColor("green")
+PRICIER_COLOR = QColor("red")
+
+
+def realtor_url(article):
+    """중개사 정보 페이지 주소 (중개사 ID나 이름이 없으면 None)"""
+    realtor_id = article.get("realtorId", "")
+    if realtor_id and article.get("realtorName", ""):
+        return f"https://m.land.naver.com/agency/info/{realtor_id}"
+    return None
+
+
+def format_deviation(percent):
+    """평균 대비 가격 차이(%)를 시세비교 열 문자열로 (NaN이면 '-')"""
+    if percent is None or math.isnan(percent):
+        return "-"
+    if percent < 0:
+        return f"▼ {abs(percent):.1f}%"
+    if percent > 0:
+        return f"▲ {percent:.1f}%"
+    return "평균"
+
+
+class ListingTableModel(QAbstractTableModel):
+    """검색 결과 매물 표의 모델
+
+    행마다 위젯을 만들지 않고, 뷰가 화면에 보이는 칸을 그릴 때만 data()로 값을 계산합니다.
+    deviation(article)은 평균 대비 가격 차이(%)를, is_saved(article_no)는 저장 여부를 돌려줍니다.
+    검색 결과가 없으면 '-'로 채운 행 하나를 보여줍니다.
+    """
+
+    def __init__(self, deviation, is_saved, parent=None):
+        super().__init__(parent)
+        self.deviation = deviation
+        self.is_saved = is_saved
+        self.articles = []
+
+    def set_articles(self, articles):
+        self.beginResetModel()
+        self.articles = list(articles)
+        self.endResetModel()
+
+    def article(self, row):
+        """행의 매물 (빈 결과 행이면 None)"""
+        if 0 <= row < len(self.articles):
+            return self.articles[row]
+        return None
+
+    def refresh_saved(self, row):
+        """저장 여부가 바뀐 행의 저장 열만 다시 그리기"""
+        index = self.index(row, SAVED_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(len(self.articles), 1)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def display_text(self, row, column):
+        """칸에 표시하는 문자열 (엑셀 저장에도 사용)"""
+        article = self.article(row)
+        if article is None:
+            return "-"
+        field = COLUMNS[column][1]
+        if field is not None:
+            return str(article.get(field, "") or "")
+        if column == REALTOR_COLUMN:
+            return article.get("realtorName", "") or "-"
+        if column == COMPARISON_COLUMN:
+            return format_deviation(self.deviation(article))
+        return ""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        article = self.article(row)
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(row, column)
+        if article is None:
+            return None
+        if role == Qt.ItemDataRole.CheckStateRole and column == SAVED_COLUMN:
+            saved = self.is_saved(str(article.get("articleNo", "")))
+            return Qt.CheckState.Checked if saved else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column == REALTOR_COLUMN and realtor_url(article):
+                return LINK_COLOR
+            if column == COMPARISON_COLUMN:
+                percent = self.deviation(article)
+                if percent < 0:
+                    return CHEAPER_COLOR
+                if percent > 0:
+                    return PRICIER_COLOR
+        if role == Qt.ItemDataRole.TextAlignmentRole and column >= REALTOR_COLUMN:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ToolTipRole and column == REALTOR_COLUMN:
+            return realtor_url(article)
+        return None
+
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    """저장 열의 체크 상태를 칸 가운데에 체크박스로 그림 (클릭 처리는 뷰의 clicked 신호에서)"""
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        state = index.data(Qt.ItemDataRole.CheckStateRole)
+        if state is None:
+            return
+        checkbox = QStyleOptionButton()
+        checkbox.state = QStyle.StateFlag.State_Enabled
+        checkbox.state |= QStyle.StateFlag.State_On if state == Qt.CheckState.Checked else QStyle.StateFlag.State_Off
+        indicator = style.subElementRect(QStyle.SubElement.SE_CheckBoxIndicator, checkbox, option.widget)
+        indicator.moveCenter(option.rect.center())
+        checkbox.rect = indicator
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, checkbox, painter, option.widget)
+
+
+class LinkDelegate(QStyledItemDelegate):
+    """중개사 열: 링크 색으로 그려진 중개사 이름을 클릭하면 중개사 정보 페이지를 브라우저로 엶"""
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            url = index.data(Qt.ItemDataRole.ToolTipRole)
+            if url:
+                QDesktopServices.openUrl(QUrl(url))
+                return True
+        return super().editorEvent(event, model, option, index)
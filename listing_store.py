@@ -0,0 +1,188 @@
+import csv
+import hashlib
+import os
+import threading
+
+LISTINGS_FILE = 'songdo_apartments_listings.csv'
+
+# CSV에 저장하는 필드
+FIELDS = [
+    'complexName', 'articleNo', 'articleName', 'tradeTypeName',
+    'dealOrWarrantPrc', 'rentPrc', 'floorInfo', 'area1', 'area2',
+    'direction', 'articleConfirmYmd', 'articleFeatureDesc',
+    'realtorName', 'realtorId', 'dong'
+]
+
+COMPACT_RATIO = 0.25  # 변경분 파일이 기본 파일 크기의 이 비율을 넘으면 압축
+
+_compact_lock = threading.Lock()
+# 변경분 파일 추가와 압축 시작 시의 이름 변경이 겹치지 않도록 보호
+# (압축 전체가 아니라 이름 변경만 막으므로 압축 중에도 새 변경분은 계속 추가됨)
+_delta_lock = threading.Lock()
+
+
+def article_to_row(article):
+    """API 매물 레코드를 CSV 행(문자열 값)으로 변환"""
+    row = {
+        'complexName': article.get('complexName', ''),
+        'articleNo': article.get('articleNo', ''),
+        'articleName': article.get('articleName', ''),
+        'tradeTypeName': article.get('tradeTypeName', ''),
+        'dealOrWarrantPrc': article.get('dealOrWarrantPrc', ''),
+        'rentPrc': article.get('rentPrc', ''),
+        'floorInfo': article.get('floorInfo', ''),
+        'area1': article.get('area2', ''),
+        'area2': article.get('area1', ''),
+        'direction': article.get('direction', ''),
+        'articleConfirmYmd': article.get('articleConfirmYmd', ''),
+        'articleFeatureDesc': article.get('articleFeatureDesc', ''),
+        'realtorName': article.get('realtorName', ''),
+        'realtorId': article.get('realtorId', ''),
+        'dong': article.get('dong', '')
+    }
+    # CSV에서 읽은 값과 비교할 수 있도록 문자열로 통일
+    return {field: str(value) for field, value in row.items()}
+
+
+def row_hash(row):
+    """저장하는 필드 값으로 계산한 행 내용 해시 (필드 순서 고정)"""
+    content = '\x1f'.join(str(row.get(field) or '') for field in FIELDS)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def delta_path(path):
+    """추가/변경된 행만 기록하는 변경분 파일 경로"""
+    base, ext = os.path.splitext(path)
+    return f"{base}.delta{ext}"
+
+
+def compacting_path(path):
+    """압축 중인 변경분 파일 경로"""
+    base, ext = os.path.splitext(path)
+    return f"{base}.compacting{ext}"
+
+
+def _read_rows(path):
+    """CSV 행을 FIELDS 형식으로 읽음
+
+    엑셀로 저장한 BOM 포함 파일도 읽고, complexName 열이 없는 이전 형식 파일
+    (예: songdo_officetel_listings.csv)은 articleName을 단지명으로 씁니다.
+    없는 열은 빈 값으로 채우며, 다음 압축 때 FIELDS 형식으로 다시 저장됩니다.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            legacy = 'complexName' not in (reader.fieldnames or [])
+            for row in reader:
+                converted = {field: row.get(field) or '' for field in FIELDS}
+                if legacy:
+                    converted['complexName'] = converted['articleName']
+                yield converted
+    except FileNotFoundError:
+        return
+
+
+def load_listings(path=LISTINGS_FILE):
+    """기본 파일과 변경분 파일을 순서대로 읽어 매물번호별 최신 행 반환"""
+    listings = {}
+    for source in (path, compacting_path(path), delta_path(path)):
+        for row in _read_rows(source):
+            if row['articleNo']:
+                listings[row['articleNo']] = row
+    return listings
+
+
+def append_changes(rows, previous, path=LISTINGS_FILE):
+    """이전 데이터와 다른 행(신규/변경)만 변경분 파일에 추가
+
+    previous는 이번 변경을 반영하도록 갱신되며, (신규 수, 변경 수)를 반환합니다.
+    """
+    inserted = updated = 0
+    changed = []
+    for row in rows:
+        article_no = row['articleNo']
+        old = previous.get(article_no)
+        if old is not None and row_hash(old) == row_hash(row):
+            continue
+        if old is None:
+            inserted += 1
+        else:
+            updated += 1
+        previous[article_no] = row
+        changed.append(row)
+
+    if changed:
+        target = delta_path(path)
+        with _delta_lock:
+            write_header = not os.path.exists(target)
+            with open(target, 'a', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(changed)
+                f.flush()
+                os.fsync(f.fileno())
+    return inserted, updated
+
+
+def needs_compaction(path=LISTINGS_FILE):
+    """변경분 파일이 충분히 커졌는지 확인"""
+    try:
+        delta_size = os.path.getsize(delta_path(path))
+    except FileNotFoundError:
+        return False
+    try:
+        base_size = os.path.getsize(path)
+    except FileNotFoundError:
+        return True
+    return delta_size > base_size * COMPACT_RATIO
+
+
+def compact(path=LISTINGS_FILE):
+    """기본 파일과 변경분을 합쳐 새 기본 파일로 교체"""
+    with _compact_lock:
+        pending = compacting_path(path)
+        delta = delta_path(path)
+        # 압축 중에도 새 변경분은 별도 파일에 계속 추가될 수 있도록 먼저 이름 변경
+        with _delta_lock:
+            if not os.path.exists(pending) and os.path.exists(delta):
+                os.replace(delta, pending)
+        if not os.path.exists(pending):
+            return
+
+        merged = {}
+        for source in (path, pending):
+            for row in _read_rows(source):
+                if row['articleNo']:
+                    merged[row['articleNo']] = row
+
+        _write_base(merged, path)
+        os.remove(pending)
+
+
+def _write_base(listings, path):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(listings.values())
+    os.replace(temp_path, path)
+
+
+def rewrite(listings, path=LISTINGS_FILE):
+    """변경분 없이 주어진 매물만으로 기본 파일을 새로 작성"""
+    with _compact_lock:
+        _write_base(listings, path)
+        with _delta_lock:
+            for stale in (compacting_path(path), delta_path(path)):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+
+def compact_in_background(path=LISTINGS_FILE):
+    """필요한 경우 별도 스레드에서 압축 시작"""
+    if not needs_compaction(path):
+        return None
+    thread = threading.Thread(target=compact, args=(path,), name='listing-compaction')
+    thread.start()
+    return thread
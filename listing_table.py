@@ -0,0 +1,99 @@
+import numpy as np
+
+from crawl_planner import parse_floor
+from price_history import parse_price
+
+# 사전 부호화한 범주 열 -> CSV 필드
+CATEGORY_FIELDS = {'complex': 'complexName', 'dong': 'dong', 'trade': 'tradeTypeName'}
+
+# 뷰어 정렬 대상 -> 열
+SORT_COLUMNS = {'보증금/매매가': 'price', '월세': 'rent', '층수': 'floor', '면적': 'area'}
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_date(confirm_ymd):
+    text = str(confirm_ymd or '')
+    if len(text) == 8 and text.isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    return 'NaT'
+
+
+def _encode(values):
+    """문자열 목록을 (정수 부호 배열, 정렬된 범주 목록)으로 사전 부호화"""
+    categories = sorted(set(values))
+    lookup = {value: code for code, value in enumerate(categories)}
+    return np.array([lookup[value] for value in values], dtype=np.int32), categories
+
+
+class ListingTable:
+    """뷰어가 쓰는 열 단위 매물 표
+
+    불러올 때 한 번만 가격/면적/층/확인일을 숫자 배열로 바꾸고, 단지/동/거래유형은
+    정수 부호로 바꿔 둡니다. 필터링/정렬/통계는 이 배열로 계산하고, 화면에 표시할
+    때만 rows(원래 문자열 행)를 꺼냅니다.
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.article_nos = np.array([str(row.get('articleNo', '')) for row in self.rows], dtype=str)
+        self.positions = {article_no: i for i, article_no in enumerate(self.article_nos.tolist())}
+
+        self.price = np.array([parse_price(row.get('dealOrWarrantPrc')) for row in self.rows], dtype=np.float64)
+        self.rent = np.array([parse_price(row.get('rentPrc')) for row in self.rows], dtype=np.float64)
+        self.area = np.array([_to_float(row.get('area2')) for row in self.rows], dtype=np.float64)
+        floors = [parse_floor(row.get('floorInfo', '')) for row in self.rows]
+        self.floor = np.array([np.nan if f is None else f for f, _ in floors], dtype=np.float64)
+        self.total_floors = np.array([np.nan if t is None else t for _, t in floors], dtype=np.float64)
+        self.confirmed = np.array([_to_date(row.get('articleConfirmYmd')) for row in self.rows],
+                                  dtype='datetime64[D]')
+
+        self.categories = {}
+        for column, field in CATEGORY_FIELDS.items():
+            codes, names = _encode([row.get(field, '') or '' for row in self.rows])
+            setattr(self, column, codes)
+            self.categories[column] = names
+
+    def __len__(self):
+        return len(self.rows)
+
+    def code(self, column, value):
+        """범주 값의 정수 부호 (없는 값은 -1)"""
+        names = self.categories[column]
+        i = np.searchsorted(names, value)
+        return int(i) if i < len(names) and names[i] == value else -1
+
+    def mask(self, complex_name=None, dong=None, trade_type=None):
+        """범주 조건을 모두 만족하는 행의 불리언 배열 (None인 조건은 무시, 검색 필터는 FilterIndex)"""
+        mask = np.ones(len(self.rows), dtype=bool)
+        for column, value in (('complex', complex_name), ('dong', dong), ('trade', trade_type)):
+            if value is not None:
+                mask &= getattr(self, column) == self.code(column, value)
+        return mask
+
+    def sort(self, indices, column, descending=False):
+        """행 번호를 숫자 열 기준으로 안정 정렬 (NaN은 방향과 관계없이 맨 뒤)"""
+        values = getattr(self, column)[indices]
+        order = np.argsort(-values if descending else values, kind='stable')
+        return indices[order]
+
+    def rows_at(self, indices):
+        """행 번호 순서대로 원래 문자열 행 목록"""
+        return [self.rows[i] for i in indices]
+
+    def values(self, column, mask=None):
+        """범주 열의 서로 다른 값 (mask가 있으면 해당 행만, 빈 값 제외)"""
+        codes = getattr(self, column)
+        if mask is not None:
+            codes = codes[mask]
+        names = self.categories[column]
+        return [names[code] for code in np.unique(codes) if names[code]]
+
+    def comparison_price(self):
+        """거래유형별 비교 가격 (월세는 월세, 매매/전세는 매매가/보증금)"""
+        return np.where(self.trade == self.code('trade', '월세'), self.rent, self.price)
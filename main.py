@@ -1,9 +1,9 @@
 import sys
 import pandas as pd
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QTextBrowser, QSplitter,
-    QLineEdit, QPushButton, QHBoxLayout, QComboBox, QFileDialog, QLabel, QTextEdit, QMessageBox, QCheckBox,
-    QTabWidget, QInputDialog
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QTableView, QTextBrowser, QSplitter,
+    QLineEdit, QPushButton, QHBoxLayout, QComboBox, QFileDialog, QLabel, QTextEdit, QMessageBox,
+    QTabWidget, QInputDialog, QHeaderView
 )
 import os
 from PySide6.QtCore import Qt
@@ -11,11 +11,9 @@ import datetime
 import json
 import subprocess
 import numpy as np
-import requests
 from openai import OpenAI
 from dotenv import load_dotenv
 import time
-import pickle
 import importlib.util
 import base64
 from selenium import webdriver
@@ -26,6 +24,19 @@ from selenium.common.exceptions import TimeoutException
 from seleniumwire import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from naver_client import NaverLandClient, RetryPolicy
+from rate_limiter import TokenBucket
+from auth_store import get_auth_session, load_session
+import listing_store
+import listing_db
+from listing_table import ListingTable, SORT_COLUMNS
+import comparables
+from filter_index import FilterIndex
+import listing_model
+from listing_model import ListingTableModel, CheckBoxDelegate, LinkDelegate
+from listing_lifecycle import ListingLifecycle, lifecycle_path
+import price_history
+from detail_store import DetailStore
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -188,7 +199,7 @@ class RealEstateViewer(QMainWindow):
 
         # Try to get authentication automatically
         print("네이버 인증 정보를 가져오는 중...")
-        self.naver_auth, self.naver_cookies = get_naver_auth_and_cookies()
+        self.naver_auth, self.naver_cookies = get_auth_session(get_naver_auth_and_cookies)
         
         if not self.naver_auth or not self.naver_cookies:
             raise RuntimeError("네이버 인증정보를 자동으로 가져오지 못했습니다. 환경변수 NAVER_ID, NAVER_PW를 확인하세요.")
@@ -196,13 +207,19 @@ class RealEstateViewer(QMainWindow):
         print(f"Authentication successful. Token: {self.naver_auth}")
         print(f"Cookies: {self.naver_cookies}")
 
+        # 상세 정보 API용 공유 세션 (1초에 1회 요청 제한, 화면이 오래 멈추지 않도록 재시도는 짧게)
+        self.naver_client = NaverLandClient(
+            self.naver_auth, self.naver_cookies, rate_limiter=TokenBucket(1.0),
+            retry_policy=RetryPolicy(max_attempts=2, max_delay=3.0)
+        )
+
+        self.saved_items = self.load_saved_items()
         self.data = self.load_data()
         self.notes = self.load_notes()
-        self.saved_items = self.load_saved_items()
         self.current_article = None  # 현재 선택된 매물 정보 저장
-        self.article_details_cache = self.load_cache()  # 캐시 로드
+        # 매물 상세 정보 저장소 (python enrich_details.py 로 미리 채울 수 있음)
+        self.detail_store = DetailStore(get_resource_path('article_details.jsonl'), get_resource_path('api_cache.pkl'))
         self.description_cache = self.load_description_cache()  # GPT 설명 캐시 로드
-        self.last_api_call = 0  # API 호출 시간 제한을 위한 변수
         
         # OpenAI API 키가 있는 경우에만 클라이언트 초기화
         api_key = os.getenv('OPENAI_API_KEY')
@@ -216,9 +233,22 @@ class RealEstateViewer(QMainWindow):
         self.init_ui()
 
     def load_data(self):
+        # 수집기와 함께 쓰는 SQLite 저장소에서 로드 (없으면 기본 CSV와 변경분 파일로 생성)
         csv_path = get_resource_path('songdo_apartments_listings.csv')
-        df = pd.read_csv(csv_path, dtype=str)
-        return df.fillna("").to_dict(orient="records")
+        self.lifecycle = ListingLifecycle(lifecycle_path(csv_path))
+        self.price_history = price_history.PriceHistory(price_history.history_path(csv_path))
+        if getattr(self, 'listing_conn', None) is not None:
+            self.listing_conn.close()
+        self.listing_conn = listing_db.open_store(csv_path, self.lifecycle)
+        # 삭제된 매물은 제외 (SHOW_REMOVED_LISTINGS=1 이면 모두 표시)
+        self.include_removed = os.getenv('SHOW_REMOVED_LISTINGS') == '1'
+        # 가격/면적/층/확인일은 여기서 한 번만 숫자 배열로 변환
+        self.listing_table = ListingTable(listing_db.load_all(self.listing_conn, self.include_removed).values())
+        # 가격 비교 열은 데이터를 다시 불러올 때만 한 번에 계산
+        self.price_deviations = comparables.price_deviations(self.listing_table)
+        # 검색 조건별 마스크 (저장 여부는 save_to_saved_items에서 갱신)
+        self.filter_index = FilterIndex(self.listing_table, self.saved_items)
+        return self.listing_table.rows
 
     def load_notes(self):
         try:
@@ -232,27 +262,9 @@ class RealEstateViewer(QMainWindow):
         try:
             saved_items_path = get_resource_path('saved_properties.json')
             with open(saved_items_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return set(json.load(f))
         except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def load_cache(self):
-        """파일에서 API 응답 캐시를 로드합니다."""
-        try:
-            cache_path = get_resource_path('api_cache.pkl')
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
-        except (FileNotFoundError, pickle.UnpicklingError):
-            return {}
-
-    def save_cache(self):
-        """API 응답 캐시를 파일에 저장합니다."""
-        try:
-            cache_path = get_resource_path('api_cache.pkl')
-            with open(cache_path, 'wb') as f:
-                pickle.dump(self.article_details_cache, f)
-        except Exception as e:
-            print(f"캐시 저장 중 오류 발생: {e}")
+            return set()
 
     def load_description_cache(self):
         """GPT 설명 캐시를 로드합니다."""
@@ -287,17 +299,18 @@ class RealEstateViewer(QMainWindow):
 
     def save_to_saved_items(self, article_no, row):
         if article_no not in self.saved_items:
-            self.saved_items.append(article_no)
+            self.saved_items.add(article_no)
         else:
-            self.saved_items.remove(article_no)
+            self.saved_items.discard(article_no)
+        self.filter_index.set_saved(article_no, article_no in self.saved_items)
             
         # 파일 저장
         saved_items_path = get_resource_path('saved_properties.json')
         with open(saved_items_path, 'w', encoding='utf-8') as f:
-            json.dump(self.saved_items, f, ensure_ascii=False, indent=2)
+            json.dump(sorted(self.saved_items), f, ensure_ascii=False, indent=2)
         
         # 체크박스 상태만 업데이트
-        self.create_save_checkbox(row, article_no)
+        self.table_model.refresh_saved(row)
 
     def get_last_update(self):
         try:
@@ -307,55 +320,25 @@ class RealEstateViewer(QMainWindow):
         except Exception:
             return "알 수 없음"
 
-    def get_article_detail(self, article_no):
+    def get_article_detail(self, article_no, row_hash=None):
         """매물 상세 정보를 가져옵니다."""
         if not article_no:
             return None
             
-        # Check cache first
-        if article_no in self.article_details_cache:
-            return self.article_details_cache[article_no]
+        # 저장된 상세 정보가 지금 행 내용으로 조회한 것이면 사용 (행이 바뀌었으면 다시 조회)
+        if self.detail_store.is_current(article_no, row_hash):
+            return self.detail_store.get(article_no)
             
-        # Rate limiting
-        current_time = time.time()
-        if current_time - self.last_api_call < 1.0:  # 1초 간격
-            time.sleep(1.0 - (current_time - self.last_api_call))
-        self.last_api_call = time.time()
-        
         try:
-            url = f"https://new.land.naver.com/api/articles/{article_no}?complexNo="
-            headers = {
-                'Authorization': self.naver_auth,
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Accept': '*/*',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Connection': 'keep-alive',
-                'Host': 'new.land.naver.com',
-                'Referer': 'https://new.land.naver.com/',
-                'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"macOS"',
-                'Sec-Fetch-Dest': 'empty',
-                'Sec-Fetch-Mode': 'cors',
-                'Sec-Fetch-Site': 'same-origin'
-            }
-            
-            response = requests.get(
-                url,
-                headers=headers,
-                cookies=self.naver_cookies,
-                timeout=10
-            )
+            # 요청 간격 제한은 공유 세션의 토큰 버킷이 처리
+            response = self.naver_client.get(f"/api/articles/{article_no}?complexNo=")
             
             if response.status_code == 200:
                 data = response.json()
-                self.article_details_cache[article_no] = data
-                self.save_cache()  # 캐시 저장
+                self.detail_store.put(article_no, data, row_hash)  # 저장소에 기록
                 return data
             else:
                 print(f"API 요청 실패 - Status: {response.status_code}")
-                print(f"Response: {response.text}")
                 return None
                 
         except Exception as e:
@@ -475,7 +458,7 @@ class RealEstateViewer(QMainWindow):
         search_layout.addWidget(complex_label)
         self.complex_combo = QComboBox()
         self.complex_combo.addItem("전체 단지")
-        complex_names = sorted(list(set(d.get("complexName", "") for d in self.data)))
+        complex_names = self.listing_table.values('complex')
         self.complex_combo.addItems(complex_names)
         search_layout.addWidget(self.complex_combo)
         
@@ -523,14 +506,16 @@ class RealEstateViewer(QMainWindow):
 
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
-        # 테이블 위젯
-        self.table = QTableWidget()
-        self.table.setColumnCount(11)  # Changed from 10 to 11 (added price comparison column)
-        self.table.setHorizontalHeaderLabels([
-            "단지명", "동", "층", "매물번호", "거래유형", "보증금/매매가", "월세", "면적(m²)", "중개사", "시세비교", "저장"
-        ])
-        self.table.cellClicked.connect(self.show_detail)
-        self.table.resizeColumnsToContents()
+        # 테이블 (모델/뷰: 화면에 보이는 행만 그림)
+        self.table_model = ListingTableModel(self.get_price_deviation, lambda article_no: article_no in self.saved_items)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setItemDelegateForColumn(listing_model.REALTOR_COLUMN, LinkDelegate(self.table))
+        self.table.setItemDelegateForColumn(listing_model.SAVED_COLUMN, CheckBoxDelegate(self.table))
+        self.table.clicked.connect(lambda index: self.show_detail(index.row(), index.column()))
+        # 열 너비는 첫 검색 결과로 한 번만 맞추고, 이후에는 사용자가 조절한 너비를 유지
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.columns_sized = False
         self.table.setMinimumHeight(400)
 
         # 검색/필터/정렬 기능 연결
@@ -631,11 +616,10 @@ class RealEstateViewer(QMainWindow):
         self.dong_combo.addItem("전체 동")
         
         if selected_complex != "전체 단지":
-            # 선택된 단지의 동 목록 가져오기
-            dong_list = sorted(list(set(
-                d.get("dong", "") for d in self.data 
-                if d.get("complexName", "") == selected_complex and d.get("dong", "")
-            )))
+            # 선택된 단지의 동 목록 가져오기 (단지/동 색인 사용)
+            dong_list = listing_db.distinct(
+                self.listing_conn, 'dong', complex_name=selected_complex, include_removed=self.include_removed
+            )
             self.dong_combo.addItems(dong_list)
         
         # 이전 선택 복원 시도
@@ -652,79 +636,22 @@ class RealEstateViewer(QMainWindow):
         show_saved_only = self.show_saved_only.isChecked()
         article_no = self.article_no_input.text().strip()  # 매물번호 검색어
 
-        # 1. 필터링
-        filtered = self.data
-        
-        # 매물번호 필터
-        if article_no:
-            filtered = [a for a in filtered if str(a.get("articleNo", "")).startswith(article_no)]
-            
-        # 저장된 매물 필터
-        if show_saved_only:
-            filtered = [a for a in filtered if a.get("articleNo", "") in self.saved_items]
-            
-        # 단지명 필터
-        if complex_name != "전체 단지":
-            filtered = [a for a in filtered if a.get("complexName", "") == complex_name]
-            # 동 필터
-            if dong != "전체 동":
-                filtered = [a for a in filtered if a.get("dong", "") == dong]
-        # 거래유형 필터
-        if trade_type != "전체":
-            filtered = [a for a in filtered if a.get("tradeTypeName", "") == trade_type]
-
-        # 2. 정렬
-        if sort_target != "정렬대상 없음":
-            reverse = sort_order == "내림차순"
-            if sort_target == "보증금/매매가":
-                def parse_price(val):
-                    if not val:
-                        return 0
-                    val = str(val).replace(",", "").replace(" ", "")
-                    if "억" in val:
-                        parts = val.split("억")
-                        num = int(parts[0]) * 10000
-                        if len(parts) > 1 and parts[1].strip():
-                            try:
-                                num += int(parts[1])
-                            except:
-                                pass
-                        return num
-                    try:
-                        return int(val)
-                    except:
-                        return 0
-                filtered = sorted(filtered, key=lambda a: parse_price(a.get("dealOrWarrantPrc", "")), reverse=reverse)
-            elif sort_target == "월세":
-                def parse_rent(val):
-                    try:
-                        return int(val)
-                    except:
-                        return 0
-                filtered = sorted(filtered, key=lambda a: parse_rent(a.get("rentPrc", "")), reverse=reverse)
-            elif sort_target == "층수":
-                def parse_floor(val):
-                    if not val:
-                        return (-1, "")  # 층수 정보가 없는 경우
-                    val = str(val).split("/")[0].strip()  # "12/48" 형태에서 실제 층수만 추출
-                    try:
-                        return (0, int(val))  # 숫자인 경우 (0은 정상 데이터를 의미)
-                    except:
-                        return (1, val)  # 숫자가 아닌 경우 (예: "저층", "고층" 등) 맨 아래로
-                filtered = sorted(filtered, key=lambda a: parse_floor(a.get("floorInfo", "")))  # 오름차순 기준
-                if reverse:  # 내림차순인 경우 숫자만 역순으로, 텍스트는 그대로 아래에
-                    nums = [x for x in filtered if parse_floor(x.get("floorInfo", ""))[0] == 0]
-                    texts = [x for x in filtered if parse_floor(x.get("floorInfo", ""))[0] != 0]
-                    filtered = list(reversed(nums)) + texts
-            elif sort_target == "면적":  # 면적 정렬 추가
-                def parse_area(val):
-                    try:
-                        return float(str(val))
-                    except:
-                        return 0
-                filtered = sorted(filtered, key=lambda a: parse_area(a.get("area2", "0")), reverse=reverse)
-
-        self.update_table(filtered)
+        # 1. 필터링 (미리 만들어 둔 조건별 마스크를 AND로 합침)
+        table = self.listing_table
+        mask = self.filter_index.mask(
+            complex_name=complex_name if complex_name != "전체 단지" else None,
+            dong=dong if complex_name != "전체 단지" and dong != "전체 동" else None,
+            trade_type=trade_type if trade_type != "전체" else None,
+            article_prefix=article_no or None,
+            saved_only=show_saved_only
+        )
+        indices = np.flatnonzero(mask)
+
+        # 2. 정렬 (숫자로 읽을 수 없는 값은 맨 뒤)
+        if sort_target in SORT_COLUMNS:
+            indices = table.sort(indices, SORT_COLUMNS[sort_target], sort_order == "내림차순")
+
+        self.update_table(table.rows_at(indices))
 
     def remove_outliers(self, prices):
         """극단적인 가격(이상치)을 제거
@@ -743,76 +670,36 @@ class RealEstateViewer(QMainWindow):
         filtered_prices = [p for p in prices if lower_bound <= p <= upper_bound]
         return filtered_prices if filtered_prices else prices  # 필터링 후 데이터가 없으면 원본 반환
 
-    def get_price_comparison(self, article):
-        """매물의 가격을 같은 단지 내 동일 거래유형 매물들과 비교"""
-        complex_name = article.get('complexName', '')
-        trade_type = article.get('tradeTypeName', '')
-        
-        # 거래유형별로 비교할 가격 결정
-        if trade_type == "매매":
-            price = self.parse_price(article.get('dealOrWarrantPrc', '0'))
-            price_type = "매매가"
-        elif trade_type == "전세":
-            price = self.parse_price(article.get('dealOrWarrantPrc', '0'))
-            price_type = "보증금"
-        elif trade_type == "월세":
-            price = self.parse_price(article.get('rentPrc', '0'))  # 월세 금액으로 변경
-            price_type = "월세"
-        else:
-            return "-"
-        
-        # 같은 단지, 같은 거래유형, 비슷한 면적의 매물들과 비교
-        area = float(article.get('area2', 0))
-        same_complex_articles = [
-            a for a in self.data 
-            if a.get('complexName') == complex_name 
-            and a.get('tradeTypeName') == trade_type
-            and a.get('articleNo') != article.get('articleNo')
-            and abs(float(a.get('area2', 0)) - area) <= 5  # 면적 차이 5m² 이내
-        ]
-        
-        if same_complex_articles and price > 0:
-            # 거래유형별로 적절한 가격 비교
-            if trade_type == "매매":
-                prices = [self.parse_price(a.get('dealOrWarrantPrc', '0')) for a in same_complex_articles]
-            elif trade_type == "전세":
-                prices = [self.parse_price(a.get('dealOrWarrantPrc', '0')) for a in same_complex_articles]
-            elif trade_type == "월세":
-                prices = [self.parse_price(a.get('rentPrc', '0')) for a in same_complex_articles]  # 월세 금액 비교로 변경
-            
-            # 이상치 제거
-            filtered_prices = self.remove_outliers(prices)
-            
-            if filtered_prices:
-                avg_price = sum(filtered_prices) / len(filtered_prices)
-                price_diff_percent = ((price - avg_price) / avg_price) * 100
-                
-                if price_diff_percent < 0:
-                    return f'<span style="color: green;">▼ {abs(price_diff_percent):.1f}%</span>'
-                elif price_diff_percent > 0:
-                    return f'<span style="color: red;">▲ {price_diff_percent:.1f}%</span>'
-                else:
-                    return "평균"
-        return "-"
+    def get_price_deviation(self, article):
+        """매물의 가격이 같은 단지 내 동일 거래유형, 비슷한 면적(5m² 이내) 매물들의 평균보다 몇 % 높은지
+        (load_data에서 미리 계산한 값 사용, 비교할 수 없으면 NaN)"""
+        position = self.listing_table.positions.get(str(article.get('articleNo', '')))
+        if position is None:
+            return float('nan')
+        return float(self.price_deviations[position])
+
+    def similar_listings(self, article):
+        """같은 단지, 같은 거래유형, 전용면적 차이 5m² 이내인 다른 매물의 불리언 배열
+
+        단지/거래유형/면적 색인으로 저장소에서 찾은 뒤 화면의 매물 표 위치로 바꿉니다.
+        """
+        table = self.listing_table
+        similar = listing_db.query(
+            self.listing_conn,
+            complex_name=article.get('complexName', ''),
+            trade_type=article.get('tradeTypeName', ''),
+            area=listing_db.parse_area(article.get('area2')) or 0.0,
+            include_removed=self.include_removed
+        )
+        mask = np.zeros(len(table), dtype=bool)
+        own = str(article.get('articleNo', ''))
+        positions = [table.positions.get(row['articleNo']) for row in similar if row['articleNo'] != own]
+        mask[[position for position in positions if position is not None]] = True
+        return mask
 
     def parse_price(self, price_text):
         """가격 문자열을 숫자로 변환"""
-        if not price_text:
-            return 0
-        price_text = str(price_text).replace(",", "").replace(" ", "")
-        if "억" in price_text:
-            parts = price_text.split("억")
-            price = float(parts[0]) * 10000
-            if len(parts) > 1 and parts[1].strip():
-                try:
-                    price += float(parts[1])
-                except:
-                    pass
-            return price
-        try:
-            return float(price_text)
-        except:
-            return 0
+        return price_history.parse_price(price_text)
 
     def format_price(self, price_text):
         """가격을 포맷팅합니다."""
@@ -838,87 +725,30 @@ class RealEstateViewer(QMainWindow):
             return price_text
 
     def update_table(self, articles):
-        self.table.setRowCount(0)
+        self.table_model.set_articles(articles)
         if not articles:
-            self.table.setRowCount(1)
-            for col in range(self.table.columnCount()):
-                self.table.setItem(0, col, QTableWidgetItem("-"))
             self.detail.setHtml("검색 결과가 없습니다.")
             return
-        self.table.setRowCount(len(articles))
-        for row, article in enumerate(articles):
-            article_no = article.get("articleNo", "")
-            self.table.setItem(row, 0, QTableWidgetItem(article.get("complexName", "")))
-            self.table.setItem(row, 1, QTableWidgetItem(article.get("dong", "")))
-            self.table.setItem(row, 2, QTableWidgetItem(article.get("floorInfo", "")))
-            self.table.setItem(row, 3, QTableWidgetItem(article_no))
-            self.table.setItem(row, 4, QTableWidgetItem(article.get("tradeTypeName", "")))
-            self.table.setItem(row, 5, QTableWidgetItem(article.get("dealOrWarrantPrc", "")))
-            self.table.setItem(row, 6, QTableWidgetItem(article.get("rentPrc", "")))
-            self.table.setItem(row, 7, QTableWidgetItem(str(article.get("area2", ""))))
-            
-            # 중개사 정보 (링크)
-            realtor_name = article.get("realtorName", "")
-            realtor_id = article.get("realtorId", "")
-            if realtor_id and realtor_name:
-                url = f"https://m.land.naver.com/agency/info/{realtor_id}"
-                link_label = QLabel(f'<a href="{url}" style="color: #0066cc; text-decoration: none;">{realtor_name}</a>')
-                link_label.setOpenExternalLinks(True)
-                link_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            else:
-                link_label = QLabel(realtor_name or "-")
-                link_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 8, link_label)
-            
-            # 시세비교 정보
-            price_comparison_label = QLabel(self.get_price_comparison(article))
-            price_comparison_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 9, price_comparison_label)
-            
-            # 저장 체크박스
-            self.create_save_checkbox(row, article_no)
-
-        self.table.resizeColumnsToContents()
+        if not self.columns_sized:
+            self.table.resizeColumnsToContents()
+            self.columns_sized = True
         self.detail.clear()
 
-    def create_save_checkbox(self, row, article_no):
-        checkbox_container = QWidget()
-        layout = QHBoxLayout(checkbox_container)
-        layout.setContentsMargins(4, 0, 4, 0)  # 좌우 여백 추가
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        checkbox = QCheckBox()
-        checkbox.setChecked(article_no in self.saved_items)
-        checkbox.clicked.connect(lambda checked, a=article_no, r=row: self.save_to_saved_items(a, r))
-        
-        layout.addWidget(checkbox)
-        self.table.setCellWidget(row, 10, checkbox_container) # Changed column index to 10
-
     def show_detail(self, row, column):
-        if column == 10:  # 저장 체크박스 열
-            article_no_item = self.table.item(row, 3)  # 매물번호 열
-            if article_no_item is None:
-                return
-            article_no = article_no_item.text()
-            self.save_to_saved_items(article_no, row)
+        article = self.table_model.article(row)
+        if not article:
+            return
+        if column == listing_model.SAVED_COLUMN:  # 저장 체크박스 열
+            self.save_to_saved_items(str(article.get('articleNo', '')), row)
             return
+        if column == listing_model.REALTOR_COLUMN and listing_model.realtor_url(article):
+            return  # 중개사 링크는 LinkDelegate가 브라우저로 엶
 
         # 현재 선택된 매물 정보 저장
-        article_no_item = self.table.item(row, 3)  # 매물번호
-        if article_no_item is None:
-            return
-        self.current_article_no = article_no_item.text()
-        article = next((a for a in self.data if str(a.get('articleNo')) == self.current_article_no), None)
-        if not article:
-            return
+        self.current_article_no = str(article.get('articleNo', ''))
 
-        # 캐시된 상세 정보 확인
-        detail_info = None
-        if self.current_article_no in self.article_details_cache:
-            detail_info = self.article_details_cache[self.current_article_no]
-        else:
-            # 캐시에 없는 경우에만 API 호출
-            detail_info = self.get_article_detail(self.current_article_no)
+        # 저장된 상세 정보가 없거나 그 뒤로 매물 행이 바뀐 경우에만 API 호출
+        detail_info = self.get_article_detail(self.current_article_no, listing_store.row_hash(article))
         
         # HTML 스타일 정의
         style = """
@@ -965,8 +795,26 @@ class RealEstateViewer(QMainWindow):
         if article.get('direction'):
             detail_text += f"방향: {article.get('direction', '')}<br>"
         detail_text += f"확인일자: {article.get('articleConfirmYmd', '')}<br>"
+        days_on_market = self.lifecycle.days_on_market(self.current_article_no)
+        if days_on_market is not None:
+            status = "삭제됨" if not self.lifecycle.is_active(self.current_article_no) else "게시 중"
+            detail_text += f"노출 기간: {days_on_market}일 ({status})<br>"
         detail_text += '</div>'
         detail_text += '<hr>'
+
+        # 가격 변동 이력 (처음 기록된 가격부터)
+        history = self.price_history.listing(self.current_article_no)
+        if len(history['ts']) > 1:
+            detail_text += '<div class="section-title">가격 변동</div>'
+            detail_text += '<div class="content">'
+            for ts, deal, rent in zip(history['ts'], history['deal'], history['rent']):
+                day = datetime.datetime.fromtimestamp(int(ts)).strftime('%Y-%m-%d')
+                detail_text += f"{day}: {self.format_price_korean(int(deal))}"
+                if rent:
+                    detail_text += f" / 월세 {int(rent)}만원"
+                detail_text += "<br>"
+            detail_text += '</div>'
+            detail_text += '<hr>'
         
         # 중개사 정보
         detail_text += '<div class="section-title">중개사 정보</div>'
@@ -1044,7 +892,7 @@ class RealEstateViewer(QMainWindow):
         price_text = article.get('dealOrWarrantPrc', '0')
         rent_price_text = article.get('rentPrc', '0')
         rent_price = self.parse_price(rent_price_text)
-        area = float(article.get('area2', 0))  # 전용면적 (m²)
+        area = listing_db.parse_area(article.get('area2')) or 0.0  # 전용면적 (m²)
         floor_info = article.get('floorInfo', '')
         complex_name = article.get('complexName', '')
         dong = article.get('dong', '')
@@ -1080,35 +928,15 @@ class RealEstateViewer(QMainWindow):
             analysis_text += f"• 평당 가격: {price_per_pyeong:.1f}만원/평<br>"
             
             # 같은 단지 내 매물들과 비교 (비슷한 면적대)
-            complex_name = article.get('complexName', '')
-            if complex_name in ['센텀하이브B동오피스', '센텀하이브B동상가']:
-                same_complex_articles = [
-                    a for a in self.data
-                    if a.get('complexName') == complex_name
-                    and a.get('tradeTypeName') == trade_type
-                    and a.get('articleNo') != article.get('articleNo')
-                    and abs(float(a.get('area2', 0)) - area) <= 5
-                ]
-            else:
-                same_complex_articles = [
-                    a for a in self.data
-                    if a.get('complexName') == complex_name
-                    and a.get('tradeTypeName') == trade_type
-                    and a.get('articleNo') != article.get('articleNo')
-                    and abs(float(a.get('area2', 0)) - area) <= 5
-                ]
+            table = self.listing_table
+            same_complex = self.similar_listings(article)
             
-            if same_complex_articles:
+            if same_complex.any():
                 analysis_text += f"<br>▶ 같은 단지 내 비슷한 면적의 {trade_type} 매물 비교<br>"
                 
-                # 가격 통계
-                if trade_type == "매매":
-                    prices = [self.parse_price(a.get('dealOrWarrantPrc', '0')) for a in same_complex_articles]
-                elif trade_type == "전세":
-                    prices = [self.parse_price(a.get('dealOrWarrantPrc', '0')) for a in same_complex_articles]
-                elif trade_type == "월세":
-                    prices = [self.parse_price(a.get('rentPrc', '0')) for a in same_complex_articles]
-                    rent_prices = [self.parse_price(a.get('rentPrc', '0')) for a in same_complex_articles]
+                # 가격 통계 (월세는 월세 금액 기준)
+                prices = table.comparison_price()[same_complex].tolist()
+                rent_prices = table.rent[same_complex].tolist() if trade_type == "월세" else []
                 
                 # 이상치 제거
                 if prices:
@@ -1169,9 +997,9 @@ class RealEstateViewer(QMainWindow):
                         analysis_text += f"• 최고 월세: {max_rent:.0f}만원<br>"
                 
                 # 면적 분포
-                areas = [float(a.get('area2', 0)) for a in same_complex_articles]
-                if areas:
-                    avg_area = sum(areas) / len(areas)
+                areas = table.area[same_complex]
+                if len(areas):
+                    avg_area = float(areas.mean())
                     analysis_text += f"<br>▶ 면적 분포<br>"
                     analysis_text += f"• 평균 면적: {avg_area:.1f}m²<br>"
                     
@@ -1179,6 +1007,20 @@ class RealEstateViewer(QMainWindow):
                     area_diff_percent = ((area - avg_area) / avg_area) * 100
                     analysis_text += f"• 평균 대비: {area_diff_percent:+.1f}%<br>"
         
+        # 최근 90일 같은 단지/거래유형의 가격 변동 (가격 이력)
+        price_column = 'rent' if trade_type == "월세" else 'deal'
+        changed_articles, changed_ts, diffs = price_history.price_changes(
+            self.price_history.complex_range(complex_name), price_column
+        )
+        same_trade_nos = self.listing_table.article_nos[
+            self.listing_table.mask(complex_name=complex_name, trade_type=trade_type)
+        ]
+        same_trade = [int(no) for no in same_trade_nos if no.isdigit()]
+        recent = (changed_ts >= time.time() - 90 * 24 * 3600) & np.isin(changed_articles, same_trade)
+        if recent.any():
+            analysis_text += f"<br>▶ 최근 90일 단지 내 {trade_type} 가격 변동<br>"
+            analysis_text += f"• 인하 {int((diffs[recent] < 0).sum())}건, 인상 {int((diffs[recent] > 0).sum())}건<br>"
+
         self.analysis_browser.setHtml(analysis_text)
 
     def pre_filter_properties(self, preferences):
@@ -1271,8 +1113,8 @@ class RealEstateViewer(QMainWindow):
             
             # 캐시된 상세 정보가 있는 경우 포함
             article_no = article.get('articleNo', '')
-            if article_no in self.article_details_cache:
-                detail_info = self.article_details_cache[article_no]
+            if article_no in self.detail_store:
+                detail_info = self.detail_store.get(article_no)
                 if detail_info:
                     # 상세 설명 추가
                     if detail_info.get('articleDetail', {}).get('detailDescription'):
@@ -1353,7 +1195,7 @@ class RealEstateViewer(QMainWindow):
                 complex_name = article.get('complexName', '')
                 trade_type = article.get('tradeTypeName', '')
                 floor_info = article.get('floorInfo', '')
-                detail_info = self.article_details_cache.get(article_no, {})
+                detail_info = self.detail_store.get(article_no, {})
                 
                 # 특징 정보 압축
                 features = []
@@ -1503,30 +1345,17 @@ class RealEstateViewer(QMainWindow):
             QMessageBox.critical(self, "분석 오류", f"매물 분석 중 오류가 발생했습니다:\n{str(e)}")
 
     def download_excel(self):
-        row_count = self.table.rowCount()
-        col_count = self.table.columnCount()
+        model = self.table_model
+        headers = [header for header, _ in listing_model.COLUMNS]
         data = []
-        headers = []
         
-        # 헤더 처리
-        for i in range(col_count):
-            header_item = self.table.horizontalHeaderItem(i)
-            headers.append(header_item.text() if header_item else "")
-            
-        # 데이터 처리
-        for row in range(row_count):
-            row_data = []
-            for col in range(col_count):
-                cell_widget = self.table.cellWidget(row, col)
-                if cell_widget:
-                    if isinstance(cell_widget, QLabel):
-                        row_data.append(cell_widget.text().replace('<a href="', '').split('">')[0])
-                    elif isinstance(cell_widget, QWidget):  # 체크박스 컨테이너
-                        checkbox = cell_widget.findChild(QCheckBox)
-                        row_data.append("✓" if checkbox and checkbox.isChecked() else "")
-                else:
-                    item = self.table.item(row, col)
-                    row_data.append(item.text() if item else "")
+        # 데이터 처리 (중개사는 링크 주소, 저장 여부는 ✓)
+        for row in range(model.rowCount()):
+            article = model.article(row)
+            row_data = [model.display_text(row, col) for col in range(model.columnCount())]
+            if article is not None:
+                row_data[listing_model.REALTOR_COLUMN] = listing_model.realtor_url(article) or row_data[listing_model.REALTOR_COLUMN]
+                row_data[listing_model.SAVED_COLUMN] = "✓" if str(article.get('articleNo', '')) in self.saved_items else ""
             data.append(row_data)
             
         df = pd.DataFrame(data)
@@ -1552,6 +1381,9 @@ class RealEstateViewer(QMainWindow):
             
             # Import and run fetch_all.py directly as a module
             import fetch_all
+
+            # 수집 후 새로 확인된 매물 수를 알리기 위한 기준 (확인일 색인 사용)
+            previous_confirm = listing_db.latest_confirm_date(self.listing_conn)
             
             # Capture stdout and stderr
             import io
@@ -1595,7 +1427,7 @@ class RealEstateViewer(QMainWindow):
             current_complex = self.complex_combo.currentText()
             self.complex_combo.clear()
             self.complex_combo.addItem("전체 단지")
-            complex_names = sorted(list(set(d.get("complexName", "") for d in self.data)))
+            complex_names = self.listing_table.values('complex')
             self.complex_combo.addItems(complex_names)
             
             # Try to restore previous selection
@@ -1612,15 +1444,12 @@ class RealEstateViewer(QMainWindow):
             # Close the updating message
             msg.close()
             
-            # Show success message
-            QMessageBox.information(self, "업데이트 완료", "데이터가 성공적으로 업데이트되었습니다.")
-            
-            # After updating the CSV, run the post-processing script
-            import subprocess
-            try:
-                subprocess.run(['python', 'update_centum_b_office.py'], check=True)
-            except Exception as e:
-                print(f'센텀하이브B동오피스 변환 스크립트 실행 중 오류 발생: {e}')
+            # Show success message (센텀하이브 분류는 저장 시 fetch_all에서 적용)
+            message = "데이터가 성공적으로 업데이트되었습니다."
+            if previous_confirm:
+                recent = listing_db.count(self.listing_conn, previous_confirm, self.include_removed)
+                message += f"\n{previous_confirm} 이후 확인된 매물: {recent}개"
+            QMessageBox.information(self, "업데이트 완료", message)
             
         except Exception as e:
             print(f"Update data error: {str(e)}")
@@ -1630,8 +1459,8 @@ if __name__ == "__main__":
     import traceback
     try:
         app = QApplication(sys.argv)
-        # Prompt for NAVER_ID/PW if missing
-        if not os.getenv('NAVER_ID') or not os.getenv('NAVER_PW'):
+        # Prompt for NAVER_ID/PW if missing (저장된 인증 정보가 유효하면 생략)
+        if (not os.getenv('NAVER_ID') or not os.getenv('NAVER_PW')) and not load_session()[0]:
             prompt_for_naver_credentials(env_path)
             load_dotenv(env_path, override=True)
         viewer = RealEstateViewer()
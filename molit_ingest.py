@@ -0,0 +1,430 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from naver_client import RetryPolicy, RETRY_STATUSES
+from rate_limiter import TokenBucket
+
+# 국토교통부 아파트 매매 실거래가 상세 자료 (API_DOCUMENTATION.md)
+MOLIT_BASE_URL = 'https://apis.data.go.kr/1613000/RTMSDataSvcAptTradeDev'
+OPERATION = '/getRTMSDataSvcAptTradeDev'
+DB_FILE = 'molit_transactions.db'
+QUOTA_FILE = 'molit_quota.json'
+DAILY_QUOTA = 10000  # 개발계정 일일 요청 수 제한
+ROWS_PER_PAGE = 1000
+SETTLE_DAYS = 30  # 계약 후 신고 기한 (이 기간이 지난 달은 더 바뀌지 않으므로 다시 조회하지 않음)
+DEFAULT_LAWD_CD = '28185'  # 인천 연수구 (송도)
+DEFAULT_WORKERS = 4
+DEFAULT_RPS = 5.0
+
+# 정상 응답과 자료 없음 결과코드 (신규 API는 세 자리 코드 사용)
+OK_CODES = {'00', '000'}
+NO_DATA_CODES = {'03', '003'}
+QUOTA_CODES = {'22', '022'}
+
+# 응답 항목명 (이전 한글/영문 항목명과 신규 API 항목명 모두 지원)
+ITEM_FIELDS = {
+    'dealAmount': 'deal_amount', '거래금액': 'deal_amount',
+    'buildYear': 'build_year', '건축년도': 'build_year',
+    'dong': 'dong', 'umdNm': 'dong', '법정동': 'dong',
+    'apartment': 'apartment', 'aptNm': 'apartment', '아파트': 'apartment',
+    'area': 'area', 'excluUseAr': 'area', '전용면적': 'area',
+    'floor': 'floor', '층': 'floor',
+    'dealYear': 'deal_year', '년': 'deal_year',
+    'dealMonth': 'deal_month', '월': 'deal_month',
+    'dealDay': 'deal_day', '일': 'deal_day'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    lawd_cd TEXT NOT NULL,
+    deal_ymd TEXT NOT NULL,
+    deal_date TEXT NOT NULL,
+    apartment TEXT NOT NULL,
+    dong TEXT,
+    area REAL,
+    floor INTEGER,
+    deal_amount INTEGER,
+    build_year INTEGER
+);
+CREATE INDEX IF NOT EXISTS transactions_month ON transactions (lawd_cd, deal_ymd);
+CREATE INDEX IF NOT EXISTS transactions_apartment ON transactions (apartment, deal_date);
+CREATE TABLE IF NOT EXISTS months (
+    lawd_cd TEXT NOT NULL,
+    deal_ymd TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    settled INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ymd)
+);
+"""
+
+
+class QuotaExceeded(Exception):
+    """일일 요청 수 제한에 도달함"""
+
+
+class DailyQuota:
+    """날짜별 요청 수를 세며 일일 제한을 넘지 않게 하는 카운터
+
+    요청마다 파일을 다시 쓰지 않고, 달 하나를 받을 때마다와 끝날 때 save로 기록합니다.
+    """
+
+    def __init__(self, limit=DAILY_QUOTA, path=QUOTA_FILE):
+        self.limit = limit
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.counts = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.counts = {}
+
+    def remaining(self):
+        return max(self.limit - self.counts.get(date.today().isoformat(), 0), 0)
+
+    def reserve(self):
+        """요청 하나를 기록 (오늘 제한을 다 썼으면 QuotaExceeded)"""
+        today = date.today().isoformat()
+        with self.lock:
+            used = self.counts.get(today, 0)
+            if used >= self.limit:
+                raise QuotaExceeded(f"오늘 요청 수 {used}회가 제한 {self.limit}회에 도달했습니다.")
+            self.counts = {today: used + 1}
+            self.dirty = True
+
+    def exhaust(self):
+        """서버가 제한 초과를 알린 경우 오늘 남은 요청을 모두 사용한 것으로 기록"""
+        with self.lock:
+            self.counts = {date.today().isoformat(): self.limit}
+            self.dirty = True
+        self.save()
+
+    def save(self):
+        """바뀐 요청 수를 임시 파일에 쓴 뒤 교체 (바뀐 것이 없으면 무시)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.counts, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+
+
+def month_range(start, end):
+    """YYYYMM 문자열 start부터 end까지의 월 목록"""
+    year, month = int(start[:4]), int(start[4:])
+    months = []
+    while f"{year:04d}{month:02d}" <= end:
+        months.append(f"{year:04d}{month:02d}")
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
+def recent_months(count, today=None):
+    """이번 달을 포함한 최근 count개월 (오래된 순)"""
+    today = today or date.today()
+    year, month = today.year, today.month - count + 1
+    while month < 1:
+        year, month = year - 1, month + 12
+    return month_range(f"{year:04d}{month:02d}", f"{today.year:04d}{today.month:02d}")
+
+
+def is_settled(deal_ymd, today=None):
+    """신고 기한이 지나 더 바뀌지 않는 달인지 확인"""
+    today = today or date.today()
+    year, month = int(deal_ymd[:4]), int(deal_ymd[4:])
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return today >= next_month + timedelta(days=SETTLE_DAYS)
+
+
+def _to_int(value):
+    try:
+        return int(str(value).replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+def to_transaction(fields, lawd_cd, deal_ymd):
+    """응답 항목 하나를 저장할 거래 튜플로 변환"""
+    deal_date = "{}-{:0>2}-{:0>2}".format(
+        fields.get('deal_year') or deal_ymd[:4], fields.get('deal_month') or deal_ymd[4:],
+        fields.get('deal_day') or '01'
+    )
+    return (
+        lawd_cd, deal_ymd, deal_date, fields.get('apartment', ''), fields.get('dong', ''),
+        _to_float(fields.get('area', '')), _to_int(fields.get('floor', '')),
+        _to_int(fields.get('deal_amount', '')), _to_int(fields.get('build_year', ''))
+    )
+
+
+def parse_page(stream, lawd_cd, deal_ymd):
+    """XML 응답을 항목 단위로 읽어 (결과코드, 결과메시지, 전체 건수, 거래 목록) 반환
+
+    전체 문서를 메모리에 올리지 않도록 item 요소를 읽을 때마다 변환하고 비웁니다.
+    """
+    code = message = None
+    total = 0
+    transactions = []
+    fields = None
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == 'item':
+                fields = {}
+            continue
+        if tag == 'item':
+            transactions.append(to_transaction(fields, lawd_cd, deal_ymd))
+            fields = None
+            element.clear()
+        elif fields is not None and tag in ITEM_FIELDS:
+            fields[ITEM_FIELDS[tag]] = (element.text or '').strip()
+        elif tag == 'resultCode':
+            code = (element.text or '').strip()
+        elif tag == 'resultMsg':
+            message = (element.text or '').strip()
+        elif tag == 'totalCount':
+            total = _to_int(element.text or '0') or 0
+    return code, message, total, transactions
+
+
+class MolitClient:
+    """실거래가 API 요청용 세션 (요청 수 제한, 일일 제한, 재시도 공유)"""
+
+    def __init__(self, service_key, quota, rate_limiter=None, pool_size=10, timeout=30, base_url=None,
+                 retry_policy=None):
+        # MOLIT_BASE_URL로 로컬 대체 서버(stub_server.py)를 가리킬 수 있음
+        self.base_url = base_url or os.getenv('MOLIT_BASE_URL') or MOLIT_BASE_URL
+        self.service_key = service_key
+        self.quota = quota
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch_page(self, lawd_cd, deal_ymd, page):
+        """한 페이지를 받아 (전체 건수, 거래 목록) 반환"""
+        params = {
+            'serviceKey': self.service_key, 'LAWD_CD': lawd_cd, 'DEAL_YMD': deal_ymd,
+            'pageNo': page, 'numOfRows': ROWS_PER_PAGE
+        }
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            last_attempt = attempt == policy.max_attempts - 1
+            self.quota.reserve()
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(self.base_url + OPERATION, params=params,
+                                            timeout=self.timeout, stream=True)
+            except requests.RequestException:
+                if last_attempt:
+                    raise
+                time.sleep(policy.delay(attempt))
+                continue
+
+            with response:
+                if response.status_code in RETRY_STATUSES and not last_attempt:
+                    time.sleep(policy.delay(attempt, response))
+                    continue
+                response.raise_for_status()
+                response.raw.decode_content = True
+                code, message, total, transactions = parse_page(response.raw, lawd_cd, deal_ymd)
+
+            if code in QUOTA_CODES:
+                self.quota.exhaust()
+                raise QuotaExceeded(message)
+            if code in NO_DATA_CODES:
+                return 0, []
+            if code not in OK_CODES:
+                raise RuntimeError(f"{lawd_cd} {deal_ymd}: {code} {message}")
+            return total, transactions
+
+    def fetch_month(self, lawd_cd, deal_ymd):
+        """지역/계약월 하나의 모든 거래를 페이지 순서대로 받아 반환"""
+        transactions = []
+        page = 1
+        while True:
+            total, rows = self.fetch_page(lawd_cd, deal_ymd, page)
+            transactions.extend(rows)
+            if not rows or len(transactions) >= total:
+                return transactions
+            page += 1
+
+    def close(self):
+        self.session.close()
+
+
+def open_db(path=DB_FILE):
+    """거래 저장소를 열고 테이블이 없으면 생성"""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def cached_months(conn):
+    """다시 조회할 필요가 없는(신고 기한이 지난 뒤 받은) (지역코드, 계약월) 집합"""
+    return set(conn.execute("SELECT lawd_cd, deal_ymd FROM months WHERE settled = 1"))
+
+
+def store_month(conn, lawd_cd, deal_ymd, transactions, settled):
+    """지역/계약월 하나의 거래를 교체하여 저장"""
+    with conn:
+        conn.execute("DELETE FROM transactions WHERE lawd_cd = ? AND deal_ymd = ?", (lawd_cd, deal_ymd))
+        conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", transactions)
+        conn.execute(
+            "INSERT OR REPLACE INTO months VALUES (?, ?, ?, ?, ?)",
+            (lawd_cd, deal_ymd, len(transactions), int(settled), time.strftime('%Y-%m-%d %H:%M:%S'))
+        )
+
+
+def ingest(client, conn, pairs, workers=DEFAULT_WORKERS):
+    """(지역코드, 계약월) 목록을 동시에 조회해 저장하고 (저장한 달 수, 거래 수, 남은 목록) 반환
+
+    이미 신고 기한이 지난 뒤 저장한 달은 건너뜁니다. 일일 제한에 도달하면 남은 달은
+    다음 실행으로 미룹니다. 저장은 호출한 스레드에서만 합니다.
+    """
+    cached = cached_months(conn)
+    pending = [pair for pair in pairs if pair not in cached]
+    stored = rows = 0
+    remaining = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(client.fetch_month, *pair): pair for pair in pending}
+        for future in as_completed(futures):
+            lawd_cd, deal_ymd = futures[future]
+            client.quota.save()
+            try:
+                transactions = future.result()
+            except QuotaExceeded:
+                remaining.append((lawd_cd, deal_ymd))
+                continue
+            except Exception as e:
+                print(f"{lawd_cd} {deal_ymd} 조회 실패: {e}")
+                remaining.append((lawd_cd, deal_ymd))
+                continue
+            store_month(conn, lawd_cd, deal_ymd, transactions, is_settled(deal_ymd))
+            stored += 1
+            rows += len(transactions)
+    return stored, rows, sorted(remaining)
+
+
+def query(conn, apartment=None, lawd_cd=None, since=None, area=None, area_window=5.0):
+    """저장된 거래 조회 (아파트명, 지역코드, 시작일 YYYY-MM-DD, 전용면적 ±area_window 조건)"""
+    sql = "SELECT * FROM transactions WHERE 1 = 1"
+    params = []
+    if apartment:
+        sql += " AND apartment = ?"
+        params.append(apartment)
+    if lawd_cd:
+        sql += " AND lawd_cd = ?"
+        params.append(lawd_cd)
+    if since:
+        sql += " AND deal_date >= ?"
+        params.append(since)
+    if area is not None:
+        sql += " AND area BETWEEN ? AND ?"
+        params.extend([area - area_window, area + area_window])
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(sql + " ORDER BY deal_date DESC", params)]
+    finally:
+        conn.row_factory = None
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="국토교통부 아파트 매매 실거래가를 지역/계약월별로 받아 저장")
+    parser.add_argument('--lawd-cd', action='append',
+                        help=f'법정동 코드 앞 5자리 (여러 번 지정 가능, 기본값 {DEFAULT_LAWD_CD})')
+    parser.add_argument('--months', type=int, default=12, help='이번 달을 포함해 조회할 최근 개월 수')
+    parser.add_argument('--start', help='시작 계약월 YYYYMM (지정하면 --months 대신 사용)')
+    parser.add_argument('--end', help='마지막 계약월 YYYYMM (기본값 이번 달)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='동시에 조회할 지역/계약월 수')
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS, help='초당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--quota', type=int, default=int(os.getenv('MOLIT_DAILY_QUOTA', DAILY_QUOTA)),
+                        help='일일 요청 수 제한')
+    parser.add_argument('--db', default=DB_FILE, help='거래 저장소 (SQLite)')
+    parser.add_argument('--query', nargs='?', const='', metavar='APARTMENT',
+                        help='조회하지 않고 저장된 거래를 출력 (아파트명, 생략하면 전체)')
+    parser.add_argument('--since', help='--query: 시작 계약일 YYYY-MM-DD')
+    parser.add_argument('--area', type=float, help='--query: 전용면적 (±5m² 이내)')
+    return parser.parse_args(argv)
+
+
+def print_transactions(conn, args):
+    """--query 조건으로 저장된 거래를 최근 계약순으로 출력"""
+    lawd_cds = args.lawd_cd or [None]
+    transactions = []
+    for lawd_cd in lawd_cds:
+        transactions.extend(query(conn, args.query or None, lawd_cd, args.since, args.area))
+    transactions.sort(key=lambda row: row['deal_date'], reverse=True)
+    for row in transactions:
+        print(f"{row['deal_date']}  {row['apartment']} {row['dong'] or ''}  "
+              f"{row['area']}m²  {row['floor']}층  {row['deal_amount'] or 0:,}만원")
+    print(f"{len(transactions)}건")
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv if argv is not None else [])
+
+    if args.query is not None:
+        conn = open_db(args.db)
+        try:
+            print_transactions(conn, args)
+        finally:
+            conn.close()
+        return
+
+    service_key = os.getenv('MOLIT_SERVICE_KEY')
+    if not service_key:
+        print("MOLIT_SERVICE_KEY 환경변수를 설정하세요.")
+        sys.exit(1)
+
+    if args.start:
+        months = month_range(args.start, args.end or date.today().strftime('%Y%m'))
+    else:
+        months = recent_months(args.months)
+    pairs = [(lawd_cd, month) for lawd_cd in (args.lawd_cd or [DEFAULT_LAWD_CD]) for month in months]
+
+    quota = DailyQuota(args.quota)
+    client = MolitClient(service_key, quota, TokenBucket(args.rps), pool_size=args.workers)
+    conn = open_db(args.db)
+    print(f"{len(pairs)}개 지역/계약월 조회 (오늘 남은 요청 {quota.remaining()}회)")
+    try:
+        stored, rows, remaining = ingest(client, conn, pairs, args.workers)
+    finally:
+        quota.save()
+        client.close()
+        conn.close()
+    print(f"{stored}개월 {rows}건의 거래를 저장했습니다.")
+    if remaining:
+        print(f"{len(remaining)}개 지역/계약월을 받지 못했습니다. 다음 실행에서 이어서 조회합니다.")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
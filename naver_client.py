@@ -0,0 +1,206 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = 'https://new.land.naver.com'
+
+# 일시적인 오류로 보고 다시 시도하는 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+    'Origin': BASE_URL,
+    'Referer': f'{BASE_URL}/',
+    'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"macOS"',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin'
+}
+
+# 매물 목록 API가 요구하는 추가 쿠키
+DEFAULT_COOKIES = {
+    'nhn.realestate.article.rlet_type_cd': 'A01',
+    'nhn.realestate.article.trade_type_cd': '""',
+    'landHomeFlashUseYn': 'Y'
+}
+
+
+class RetryPolicy:
+    """지터가 있는 지수 백오프 재시도 정책 (Retry-After 헤더 우선)"""
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, response=None):
+        """attempt번째(0부터) 실패 후 기다릴 시간(초)"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(self.max_delay, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(self.max_delay, max(0.0, wait))
+                except (TypeError, ValueError):
+                    pass
+        # full jitter: 0 ~ base * 2^attempt 사이에서 무작위
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """최근 요청의 실패 비율이 높아지면 일정 시간 모든 요청을 멈추는 차단기"""
+
+    def __init__(self, window=20, min_requests=10, failure_ratio=0.5, cooldown=30.0):
+        self.outcomes = deque(maxlen=window)
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """차단 중이면 해제될 때까지 대기"""
+        while True:
+            with self.lock:
+                remaining = self.open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record(self, success):
+        """요청 결과를 기록하고 실패가 몰리면 차단"""
+        with self.lock:
+            self.outcomes.append(success)
+            failures = self.outcomes.count(False)
+            if (len(self.outcomes) >= self.min_requests
+                    and failures / len(self.outcomes) >= self.failure_ratio):
+                self.open_until = time.monotonic() + self.cooldown
+                self.outcomes.clear()
+                print(f"요청 오류가 급증하여 {self.cooldown:.0f}초 동안 수집을 멈춥니다.")
+
+
+# 호스트별로 공유하는 차단기 (같은 호스트를 쓰는 모든 클라이언트가 함께 멈춤)
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def wire_size(response):
+    """응답 본문이 네트워크로 전송된 크기 (gzip 등 압축된 바이트 수)
+
+    urllib3가 읽은 원본 바이트 수를 쓰고, 알 수 없으면(chunked 응답 등) Content-Length,
+    그것도 없으면 풀린 본문 크기를 씁니다.
+    """
+    try:
+        size = int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        size = 0
+    if size > 0:
+        return size
+    length = response.headers.get('Content-Length', '')
+    if length.isdigit():
+        return int(length)
+    return len(response.content)
+
+
+def get_circuit_breaker(host):
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+class NaverLandClient:
+    """네이버 부동산 API 호출에 공유하는 HTTP 세션
+
+    헤더와 쿠키는 생성 시 한 번만 설정하고, 커넥션 풀로 keep-alive 연결을 재사용합니다.
+    metrics(crawl_metrics.CrawlMetrics)가 있으면 요청별 지연 시간, 응답 크기, 대기 시간을 기록합니다.
+    """
+
+    def __init__(self, auth_token, cookies, rate_limiter=None, pool_size=10, timeout=10, base_url=None,
+                 retry_policy=None, metrics=None):
+        # NAVER_LAND_BASE_URL로 로컬 대체 서버(stub_server.py)를 가리킬 수 있음
+        self.base_url = base_url or os.getenv('NAVER_LAND_BASE_URL') or BASE_URL
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics
+        self.circuit_breaker = get_circuit_breaker(urlparse(self.base_url).netloc)
+        self.request_count = 0  # 재시도를 포함한 실제 요청 수
+        self.count_lock = threading.Lock()
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers['Authorization'] = auth_token
+        self.session.cookies.update(cookies)
+        self.session.cookies.update(DEFAULT_COOKIES)
+
+    def get(self, path, referer=None):
+        """API 경로(쿼리 포함)에 GET 요청
+
+        연결 오류와 429/5xx 응답은 재시도 정책에 따라 다시 시도하며, 마지막 시도의
+        응답을 반환하거나 예외를 그대로 전달합니다.
+        """
+        request_headers = {'Referer': referer} if referer else None
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            last_attempt = attempt == policy.max_attempts - 1
+            waited = time.perf_counter()
+            self.circuit_breaker.wait()
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            started = time.perf_counter()
+            self._record_wait(started - waited)
+            with self.count_lock:
+                self.request_count += 1
+            try:
+                response = self.session.get(self.base_url + path, headers=request_headers, timeout=self.timeout)
+            except requests.RequestException:
+                if self.metrics:
+                    self.metrics.observe_request(time.perf_counter() - started, retry=attempt > 0)
+                self.circuit_breaker.record(False)
+                if last_attempt:
+                    raise
+                self._backoff(policy.delay(attempt))
+                continue
+
+            if self.metrics:
+                self.metrics.observe_request(
+                    time.perf_counter() - started, response.status_code, wire_size(response), attempt > 0
+                )
+            if response.status_code in RETRY_STATUSES:
+                self.circuit_breaker.record(False)
+                if last_attempt:
+                    return response
+                self._backoff(policy.delay(attempt, response))
+                continue
+
+            self.circuit_breaker.record(True)
+            return response
+
+    def _record_wait(self, seconds):
+        if self.metrics:
+            self.metrics.add_wait(seconds)
+
+    def _backoff(self, delay):
+        time.sleep(delay)
+        self._record_wait(delay)
+
+    def close(self):
+        self.session.close()
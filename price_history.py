@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# 저장하는 열과 자료형 (행은 매물번호, 시각 순으로 정렬)
+DTYPES = {
+    'article': np.int64,  # 매물번호
+    'ts': np.int64,  # 기록 시각 (epoch 초)
+    'deal': np.int32,  # 매매가/보증금 (만원)
+    'rent': np.int32,  # 월세 (만원)
+    'state': np.int8,  # priceChangeState 코드 (PRICE_STATES의 위치)
+    'complex': np.int16  # 단지명 코드 (complex_names의 위치)
+}
+
+PRICE_STATES = ['', 'SAME', 'INCREASE', 'DECREASE']
+
+
+def history_path(path):
+    """매물 CSV 옆에 두는 가격 이력 경로 (*.prices.npz)"""
+    base, _ = os.path.splitext(path)
+    return f"{base}.prices.npz"
+
+
+def parse_price(price_text):
+    """'4억 3,680' 같은 가격 문자열을 만원 단위 숫자로 변환 (알 수 없으면 0)"""
+    if not price_text:
+        return 0
+    price_text = str(price_text).replace(",", "").replace(" ", "")
+    if "억" in price_text:
+        parts = price_text.split("억")
+        try:
+            price = float(parts[0]) * 10000
+        except ValueError:
+            return 0
+        if len(parts) > 1 and parts[1].strip():
+            try:
+                price += float(parts[1])
+            except ValueError:
+                pass
+        return price
+    try:
+        return float(price_text)
+    except ValueError:
+        return 0
+
+
+class PriceHistory:
+    """매물별 가격 변동 이력을 열 단위 numpy 배열로 보관하는 저장소
+
+    가격(매매가/보증금, 월세)이 직전 기록과 다를 때만 한 행을 추가합니다.
+    행은 (매물번호, 시각) 순으로 정렬해 두므로 매물별 조회는 이진 탐색으로 찾습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in DTYPES.items()}
+        self.complex_names = []
+        self.pending = []
+        self.last = None  # 매물번호 -> (매매가/보증금, 월세), 기록할 때 처음 계산
+        self._load()
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self.columns = {name: data[name].astype(dtype) for name, dtype in DTYPES.items()}
+                self.complex_names = [str(name) for name in data['complex_names']]
+        except FileNotFoundError:
+            return
+
+    def _last_values(self):
+        if self.last is None:
+            self._flush()
+            article = self.columns['article']
+            # 정렬되어 있으므로 다음 행의 매물번호가 바뀌는 위치가 매물별 마지막 기록
+            last_rows = np.flatnonzero(np.r_[article[1:] != article[:-1], True]) if len(article) else []
+            deal, rent = self.columns['deal'], self.columns['rent']
+            self.last = {int(article[i]): (int(deal[i]), int(rent[i])) for i in last_rows}
+        return self.last
+
+    def _complex_code(self, complex_name):
+        if complex_name not in self.complex_names:
+            self.complex_names.append(complex_name)
+        return self.complex_names.index(complex_name)
+
+    def record(self, article_no, complex_name, deal_text, rent_text, state='', ts=None):
+        """가격이 직전 기록과 다르면 한 행을 추가하고 True 반환"""
+        try:
+            key = int(article_no)
+        except (TypeError, ValueError):
+            return False
+        deal = int(round(parse_price(deal_text)))
+        rent = int(round(parse_price(rent_text)))
+        with self.lock:
+            last = self._last_values()
+            if last.get(key) == (deal, rent):
+                return False
+            last[key] = (deal, rent)
+            self.pending.append((
+                key, int(ts or time.time()), deal, rent,
+                PRICE_STATES.index(state) if state in PRICE_STATES else 0,
+                self._complex_code(complex_name)
+            ))
+            return True
+
+    def _flush(self):
+        """추가된 행을 배열에 합치고 (매물번호, 시각) 순으로 다시 정렬"""
+        if not self.pending:
+            return
+        added = list(zip(*self.pending))
+        self.pending = []
+        columns = {
+            name: np.concatenate([self.columns[name], np.array(values, dtype=DTYPES[name])])
+            for name, values in zip(DTYPES, added)
+        }
+        order = np.lexsort((columns['ts'], columns['article']))
+        self.columns = {name: values[order] for name, values in columns.items()}
+
+    def save(self):
+        """추가된 행이 있으면 임시 파일에 쓴 뒤 교체하여 저장"""
+        with self.lock:
+            if not self.pending:
+                return
+            self._flush()
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(f, complex_names=np.array(self.complex_names, dtype=str), **self.columns)
+            os.replace(temp_path, self.path)
+
+    def _select(self, rows, start, end):
+        ts = self.columns['ts'][rows]
+        mask = np.ones(len(ts), dtype=bool)
+        if start is not None:
+            mask &= ts >= start
+        if end is not None:
+            mask &= ts < end
+        return {name: values[rows][mask] for name, values in self.columns.items()}
+
+    def listing(self, article_no, start=None, end=None):
+        """매물 하나의 [start, end) 기간 이력을 열별 배열로 반환 (시각 순)"""
+        with self.lock:
+            self._flush()
+            try:
+                key = int(article_no)
+            except (TypeError, ValueError):
+                return self._select(slice(0, 0), start, end)
+            article = self.columns['article']
+            lo = np.searchsorted(article, key, side='left')
+            hi = np.searchsorted(article, key, side='right')
+            return self._select(slice(lo, hi), start, end)
+
+    def complex_range(self, complex_name, start=None, end=None):
+        """단지 하나의 [start, end) 기간 이력을 열별 배열로 반환 (매물번호, 시각 순)"""
+        with self.lock:
+            self._flush()
+            if complex_name not in self.complex_names:
+                return self._select(slice(0, 0), start, end)
+            rows = np.flatnonzero(self.columns['complex'] == self.complex_names.index(complex_name))
+            return self._select(rows, start, end)
+
+
+def price_changes(history, price_column):
+    """이력 배열에서 같은 매물의 직전 기록 대비 가격 변화가 있는 행의 (매물번호, 시각, 변화량) 반환"""
+    article = history['article']
+    prices = history[price_column].astype(np.int64)
+    same_article = article[1:] == article[:-1]
+    diff = prices[1:] - prices[:-1]
+    changed = same_article & (diff != 0)
+    rows = np.flatnonzero(changed) + 1
+    return article[rows], history['ts'][rows], diff[changed]
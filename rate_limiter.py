@@ -0,0 +1,28 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """여러 스레드가 공유하는 초당 요청 수 제한기 (토큰 버킷)"""
+
+    def __init__(self, rate, burst=None):
+        # rate <= 0 이면 제한 없음
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기한 뒤 소비"""
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # 부족분은 미리 예약하고 그만큼만 대기 (재확인 루프는 부동소수 오차로 멈출 수 있음)
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
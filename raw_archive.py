@@ -0,0 +1,150 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import crawl_planner
+import listing_db
+import listing_store
+import target_registry
+from listing_lifecycle import ListingLifecycle, lifecycle_path
+from update_centum_b_office import classify_row
+
+ARCHIVE_DIR = 'raw_archive'
+
+
+class RawArchive:
+    """수집한 API 응답 원본을 내용 해시로 저장하는 압축 보관소
+
+    objects/ab/abcd....json.gz 에 응답 본문을 한 번만 저장하고, index.jsonl 에
+    (요청, 페이지, 수집 시각, 본문 해시)와 분류 대상 정보를 한 줄씩 기록합니다.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.json.gz")
+
+    def store(self, body, kind, query, page, targets):
+        """응답 본문(bytes)을 저장하고 인덱스에 기록한 뒤 해시 반환"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, path)
+
+        entry = {
+            'hash': digest, 'kind': kind, 'query': query, 'page': page,
+            'fetched_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'targets': targets
+        }
+        with self.lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return digest
+
+    def load(self, digest):
+        """저장된 응답 본문을 JSON으로 로드"""
+        with gzip.open(self.object_path(digest), 'rb') as f:
+            return json.loads(f.read())
+
+    def entries(self):
+        """인덱스 항목을 기록된 순서대로 반환"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+
+def articles_from_page(entry, data):
+    """보관된 페이지에서 수집 시와 같은 규칙으로 매물을 골라 분류"""
+    targets = entry['targets']
+    articles = []
+    for article in data.get('articleList', []):
+        if not article.get('articleNo'):
+            continue
+        if entry['kind'] == 'region':
+            lat_min, lat_max, lng_min, lng_max = entry['query']
+            article_lat = float(article.get('latitude', 0))
+            article_lng = float(article.get('longitude', 0))
+            if not (lat_min <= article_lat <= lat_max and lng_min <= article_lng <= lng_max):
+                continue
+        if crawl_planner.label_article(article, targets):
+            articles.append(article)
+    return articles
+
+
+def replay(archive, registry):
+    """네트워크 없이 보관된 응답으로 데이터셋별 매물 저장소를 갱신
+
+    보관된 페이지의 매물을 기존 저장소 위에 덮어쓰며, 보관소에 없는 매물은 그대로 둡니다.
+    보관된 페이지가 하나도 없는 데이터셋은 건드리지 않습니다.
+    """
+    listings = {dataset: {} for dataset in registry['datasets']}
+    pages = 0
+    for entry in archive.entries():
+        try:
+            data = archive.load(entry['hash'])
+        except (FileNotFoundError, OSError, json.JSONDecodeError) as e:
+            print(f"보관된 응답을 읽지 못했습니다 ({entry['hash']}): {e}")
+            continue
+        pages += 1
+        # 같은 요청의 대상들은 데이터셋이 같음 (데이터셋 도입 전 기록은 기본 데이터셋)
+        dataset = entry['targets'][0].get('dataset') or registry['default_dataset']
+        if dataset not in listings:
+            continue
+        # 나중에 수집된 페이지의 값이 우선
+        for article in articles_from_page(entry, data):
+            row = classify_row(listing_store.article_to_row(article))
+            listings[dataset][row['articleNo']] = row
+
+    print(f"보관된 {pages}개 페이지로 매물 저장소를 갱신합니다.")
+    for dataset, rows in listings.items():
+        output = target_registry.dataset_output(registry, dataset)
+        if not rows:
+            print(f"{output}: 보관된 매물이 없어 그대로 둡니다.")
+            continue
+        merged = listing_store.load_listings(output)
+        existing = len(merged)
+        merged.update(rows)
+        listing_store.rewrite(merged, output)
+        conn = listing_db.connect(listing_db.db_path(output))
+        try:
+            listing_db.replace_all(conn, merged.values())
+            lifecycle = ListingLifecycle(lifecycle_path(output))
+            listing_db.mark_removed(conn, listing_db.removed_articles(lifecycle))
+        finally:
+            conn.close()
+        print(f"{output}: 보관된 매물 {len(rows)}개 반영 (전체 {len(merged)}개, 새로 추가 {len(merged) - existing}개)")
+    return listings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수집 원본 보관소 관리")
+    parser.add_argument('command', choices=['replay'], help='replay: 보관된 응답으로 매물 저장소 갱신')
+    parser.add_argument('--archive', default=ARCHIVE_DIR, help='보관소 경로')
+    parser.add_argument('--targets', default=target_registry.TARGETS_FILE,
+                        help='데이터셋별 출력 경로를 정의한 대상 등록 파일')
+    args = parser.parse_args(argv)
+
+    if args.command == 'replay':
+        replay(RawArchive(args.archive), target_registry.load_registry(args.targets))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
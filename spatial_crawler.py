@@ -0,0 +1,66 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+MAX_DEPTH = 5  # 최대 분할 깊이 (루트 영역의 1/4^5 크기까지)
+DEFAULT_WORKERS = 4
+
+# crawl_tile()이 반환하는 타일 수집 결과
+# saturated: 페이지 상한에 도달했는데 더 많은 매물이 남아 있는 경우
+# complete: 마지막 페이지까지 확인한 경우, seen: 확인한 모든 매물번호 (삭제 감지용)
+TileResult = namedtuple('TileResult', 'articles saturated failed watermark complete seen',
+                        defaults=(False, None))
+
+
+class Tile(namedtuple('Tile', 'lat_min lat_max lng_min lng_max depth path')):
+    """위경도 사각형 타일 (path는 '0', '0.2', '0.2.1'처럼 분할 경로)"""
+
+    @classmethod
+    def root(cls, lat_min, lat_max, lng_min, lng_max):
+        return cls(lat_min, lat_max, lng_min, lng_max, 0, '0')
+
+    def split(self):
+        """네 개의 하위 타일로 분할"""
+        lat_mid = round((self.lat_min + self.lat_max) / 2, 6)
+        lng_mid = round((self.lng_min + self.lng_max) / 2, 6)
+        quadrants = [
+            (self.lat_min, lat_mid, self.lng_min, lng_mid),
+            (self.lat_min, lat_mid, lng_mid, self.lng_max),
+            (lat_mid, self.lat_max, self.lng_min, lng_mid),
+            (lat_mid, self.lat_max, lng_mid, self.lng_max),
+        ]
+        return [
+            Tile(*bounds, self.depth + 1, f"{self.path}.{i}")
+            for i, bounds in enumerate(quadrants)
+        ]
+
+
+def crawl_tiles(root, crawl_tile, max_depth=MAX_DEPTH, workers=DEFAULT_WORKERS):
+    """영역을 적응형 쿼드트리로 수집
+
+    각 타일을 병렬로 crawl_tile(tile)에 넘기고, 결과가 페이지 상한에 걸린 타일만 4개로
+    다시 나눕니다. 타일 경계에서 중복된 매물은 articleNo 기준으로 한 번만 남깁니다.
+    (중복 제거된 매물 목록, 타일별 결과 목록, 전체 영역을 끝까지 확인했는지)를 반환합니다.
+    depth와 split()을 가진 다른 분할 단위(crawl_planner.QueryShard)에도 그대로 사용합니다.
+    """
+    articles = {}
+    results = []
+    complete = True
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(crawl_tile, root): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                tile = pending.pop(future)
+                result = future.result()
+                results.append(result)
+                for article in result.articles:
+                    articles.setdefault(article.get('articleNo'), article)
+                children = []
+                if result.saturated and not result.failed and tile.depth < max_depth:
+                    children = tile.split()
+                for child in children:
+                    pending[executor.submit(crawl_tile, child)] = child
+                # 나눠서 다시 수집한 타일은 하위 타일의 결과로 판단
+                if not children and not result.complete:
+                    complete = False
+    return list(articles.values()), results, complete
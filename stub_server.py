@@ -0,0 +1,277 @@
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+FIXTURE_FILE = '송도_매물.json'
+FIRST_COMPLEX_ID = 142800  # 대체 서버의 단지 번호는 이 값부터 차례로 부여
+AREA_BAND_SIZE = 20  # areaNo 하나가 묶는 전용면적 폭 (m²)
+
+
+class StubConfig:
+    """로컬 대체 서버 동작 설정"""
+
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, error_status=500,
+                 pages=10, page_size=20, fixture=FIXTURE_FILE, seed=None, molit_rows=30,
+                 complexes=1, real_estate_types=('APT',)):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.pages = pages  # 단지마다 필터 없이 조회했을 때의 페이지 수
+        self.page_size = page_size
+        self.complexes = complexes
+        self.real_estate_types = tuple(real_estate_types)  # 매물에 차례로 부여하는 매물 유형 코드
+        self.fixture = fixture
+        self.molit_rows = molit_rows  # 실거래가 API의 지역/계약월별 평균 거래 수
+        self.random = random.Random(seed)
+
+
+def area_no(article):
+    """전용면적을 AREA_BAND_SIZE 단위로 나눈 면적대 번호 ('1'부터)"""
+    try:
+        area = float(article.get('area2') or 0)
+    except ValueError:
+        area = 0.0
+    return str(int(area // AREA_BAND_SIZE) + 1)
+
+
+def build_listings(fixture, count):
+    """녹화된 매물 레코드를 count개가 될 때까지 반복 (반복분은 매물번호를 바꿔 고유하게)"""
+    with open(fixture, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    listings = []
+    copy = 0
+    while len(listings) < count and records:
+        for record in records:
+            if len(listings) >= count:
+                break
+            article = dict(record)
+            if copy:
+                article['articleNo'] = f"{record['articleNo']}{copy:02d}"
+            listings.append(article)
+        copy += 1
+    return listings
+
+
+def complex_ids(config):
+    """대체 서버가 매물을 나눠 주는 단지 번호 목록"""
+    return [str(FIRST_COMPLEX_ID + i) for i in range(config.complexes)]
+
+
+def filter_listings(articles, params, complex_id=None):
+    """요청의 단지 번호, realEstateType, tradeType, areaNos('1:2'처럼 콜론으로 연결) 조건 적용"""
+    conditions = [
+        (key, set(params[param].split(':')))
+        for param, key in (('realEstateType', 'realEstateTypeCode'), ('tradeType', 'tradeTypeCode'),
+                           ('areaNos', 'areaNo'))
+        if params.get(param)
+    ]
+    if complex_id is not None:
+        conditions.append(('complexNo', {complex_id}))
+    return [a for a in articles if all(a.get(key) in values for key, values in conditions)]
+
+
+class StubState:
+    """서버가 응답하는 매물 목록과 매물번호 색인
+
+    단지마다 pages * page_size개의 매물을 만들고, 매물 유형 코드는 real_estate_types를 차례로,
+    면적대 번호(areaNo)는 전용면적으로 부여합니다. 거래 유형은 녹화된 값(A1/B2/B3)을 그대로 씁니다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        ids = complex_ids(config)
+        per_complex = config.pages * config.page_size
+        self.listings = build_listings(config.fixture, per_complex * len(ids))
+        for i, article in enumerate(self.listings):
+            article['complexNo'] = ids[i // per_complex]
+            article['realEstateTypeCode'] = config.real_estate_types[i % len(config.real_estate_types)]
+            article['areaNo'] = area_no(article)
+        self.by_date = sorted(self.listings, key=lambda a: a.get('articleConfirmYmd', ''), reverse=True)
+        self.by_no = {a['articleNo']: a for a in self.listings}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def bbox(self):
+        """고정 매물 전체를 포함하는 좌표 영역 (lat_min, lat_max, lng_min, lng_max)"""
+        lats = [float(a['latitude']) for a in self.listings]
+        lngs = [float(a['longitude']) for a in self.listings]
+        return min(lats), max(lats), min(lngs), max(lngs)
+
+    def area_bands(self):
+        """고정 매물에 쓰인 면적대 번호 목록 (작은 면적부터)"""
+        return sorted({a['areaNo'] for a in self.listings}, key=int)
+
+
+def molit_transactions(state, lawd_cd, deal_ymd):
+    """지역/계약월마다 항상 같은 가상 실거래 목록 (단지명은 고정 매물에서 사용)"""
+    rng = random.Random(f"{lawd_cd}{deal_ymd}")
+    names = sorted({a.get('complexName', '') for a in state.listings if a.get('complexName')}) or ['대체아파트']
+    count = rng.randint(state.config.molit_rows // 2, state.config.molit_rows * 3 // 2)
+    return [{
+        'dealAmount': f"{rng.randint(30000, 150000):,}",
+        'buildYear': str(rng.randint(2005, 2022)),
+        'dong': '송도동',
+        'apartment': rng.choice(names),
+        'area': f"{rng.choice([59.9, 74.8, 84.9, 101.2, 134.5]):.2f}",
+        'floor': str(rng.randint(1, 49)),
+        'dealYear': deal_ymd[:4],
+        'dealMonth': str(int(deal_ymd[4:])),
+        'dealDay': str(rng.randint(1, 28))
+    } for _ in range(count)]
+
+
+def molit_response(items, page, rows):
+    """실거래가 API 형식의 XML 응답"""
+    start = (page - 1) * rows
+    body = ''.join(
+        '<item>' + ''.join(f"<{key}>{escape(value)}</{key}>" for key, value in item.items()) + '</item>'
+        for item in items[start:start + rows]
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><response>'
+        '<header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE</resultMsg></header>'
+        f'<body><items>{body}</items><numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo>'
+        f'<totalCount>{len(items)}</totalCount></body></response>'
+    )
+
+
+def page_response(articles, page, page_size):
+    start = (page - 1) * page_size
+    return {
+        'isMoreData': start + page_size < len(articles),
+        'articleList': articles[start:start + page_size]
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/api/articles/complex/{id}, /api/articles/region, /api/articles/{no}와 실거래가 API 응답 흉내"""
+
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 보내므로 Nagle 알고리즘을 끔 (켜 두면 지연 ACK와 겹쳐 응답마다 40ms 안팎이 더해짐)
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        config = self.state.config
+        with self.state.lock:
+            self.state.requests += 1
+
+        delay = config.latency_ms + config.random.uniform(0, config.jitter_ms)
+        time.sleep(delay / 1000)
+
+        if config.random.random() < config.error_rate:
+            self.send_json({'message': 'stub error'}, config.error_status)
+            return
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        page = int(params.get('page') or 1)
+        articles = self.state.by_date if params.get('order') == 'dateDesc' else self.state.listings
+
+        if re.fullmatch(r'/api/articles/complex/\d+', url.path):
+            complex_id = url.path.rsplit('/', 1)[1]
+            self.send_json(page_response(filter_listings(articles, params, complex_id), page, config.page_size))
+        elif url.path == '/api/articles/region':
+            lat_min, lat_max = float(params['lat']), float(params['lat2'])
+            lng_min, lng_max = float(params['lon']), float(params['lon2'])
+            inside = [
+                a for a in filter_listings(articles, params)
+                if lat_min <= float(a['latitude']) <= lat_max and lng_min <= float(a['longitude']) <= lng_max
+            ]
+            self.send_json(page_response(inside, page, config.page_size))
+        elif re.fullmatch(r'/api/articles/\d+', url.path):
+            article = self.state.by_no.get(url.path.rsplit('/', 1)[1])
+            if article is None:
+                self.send_json({'message': 'not found'}, 404)
+                return
+            self.send_json({
+                'articleDetail': {
+                    'articleNo': article['articleNo'],
+                    'detailDescription': article.get('articleFeatureDesc', ''),
+                    'articleFeatureDesc': article.get('articleFeatureDesc', '')
+                },
+                'articleAddition': article
+            })
+        elif url.path.endswith('/getRTMSDataSvcAptTradeDev'):
+            items = molit_transactions(self.state, params.get('LAWD_CD', ''), params.get('DEAL_YMD', ''))
+            rows = int(params.get('numOfRows') or 10)
+            self.send_body(molit_response(items, int(params.get('pageNo') or 1), rows).encode('utf-8'),
+                           'application/xml;charset=UTF-8')
+        elif re.fullmatch(r'/api/complexes/\d+', url.path):
+            self.send_json({'complexDetail': {'complexNo': url.path.rsplit('/', 1)[1]}})
+        else:
+            self.send_json({'message': 'unknown path'}, 404)
+
+    def send_json(self, payload, status=200):
+        self.send_body(json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json;charset=UTF-8',
+                       status)
+
+    def send_body(self, body, content_type, status=200):
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(config, host='127.0.0.1', port=0):
+    """별도 스레드에서 서버를 시작하고 (서버, 상태, 기본 URL) 반환"""
+    state = StubState(config)
+    handler = type('BoundStubHandler', (StubHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, state, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 부동산 API 로컬 대체 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50, help='기본 응답 지연')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='추가 무작위 지연 상한')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율 (0~1)')
+    parser.add_argument('--error-status', type=int, default=500, help='오류 응답 상태 코드 (예: 429, 500)')
+    parser.add_argument('--pages', type=int, default=10, help='단지별 페이지 수 (필터 없이 조회할 때)')
+    parser.add_argument('--complexes', type=int, default=1,
+                        help=f'매물을 나눠 주는 단지 수 (단지 번호 {FIRST_COMPLEX_ID}부터)')
+    parser.add_argument('--real-estate-types', default='APT', help="매물에 차례로 부여할 매물 유형 (예: APT:OPST)")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--fixture', default=FIXTURE_FILE, help='녹화된 매물 JSON')
+    parser.add_argument('--molit-rows', type=int, default=30, help='실거래가 API의 지역/계약월별 평균 거래 수')
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+                        args.pages, args.page_size, args.fixture, molit_rows=args.molit_rows,
+                        complexes=args.complexes, real_estate_types=args.real_estate_types.split(':'))
+    server, _, base_url = start_server(config, port=args.port)
+    print(f"대체 서버 실행 중: {base_url} (NAVER_LAND_BASE_URL={base_url}, "
+          f"MOLIT_BASE_URL={base_url}/1613000/RTMSDataSvcAptTradeDev)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+import json
+import os
+
+WATERMARK_FILE = 'sync_watermarks.json'
+PAGE_HASH_FILE = 'page_hashes.json'
+
+
+def _filter_suffix(real_estate_type, trade_type):
+    # 기본 필터(아파트, 전체 거래)는 기존 키를 그대로 사용
+    if real_estate_type == 'APT' and not trade_type:
+        return ''
+    return f"/{real_estate_type}/{trade_type}"
+
+
+def complex_key(complex_id, real_estate_type='APT', trade_type=''):
+    """단지 단위 워터마크 키"""
+    return f"complex:{complex_id}{_filter_suffix(real_estate_type, trade_type)}"
+
+
+def region_key(complex_name, lat_min, lat_max, lng_min, lng_max, real_estate_type='APT', trade_type=''):
+    """좌표 영역 단위 워터마크 키 (영역이 바뀌면 새 키)"""
+    return (
+        f"region:{complex_name}@{lat_min},{lng_min},{lat_max},{lng_max}"
+        f"{_filter_suffix(real_estate_type, trade_type)}"
+    )
+
+
+def load_watermarks(path=WATERMARK_FILE):
+    """대상별 마지막 동기화 기준일(articleConfirmYmd) 로드"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_watermarks(watermarks, path=WATERMARK_FILE):
+    """워터마크를 임시 파일에 쓴 뒤 교체하여 저장"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(watermarks, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def load_page_hashes(path=PAGE_HASH_FILE):
+    """수집 키별 지난 수집의 페이지 본문 해시 로드"""
+    return load_watermarks(path)
+
+
+def save_page_hashes(page_hashes, path=PAGE_HASH_FILE):
+    """페이지 해시를 임시 파일에 쓴 뒤 교체하여 저장"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(page_hashes, f, ensure_ascii=False, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def advance(watermark, confirm_ymd):
+    """두 기준일 중 더 최근 값 반환 (YYYYMMDD 문자열 비교)"""
+    if not confirm_ymd:
+        return watermark
+    if not watermark or confirm_ymd > watermark:
+        return confirm_ymd
+    return watermark
@@ -0,0 +1,77 @@
+import json
+
+TARGETS_FILE = 'crawl_targets.json'
+
+# 네이버 부동산 API의 realEstateType / tradeType 코드
+REAL_ESTATE_TYPES = {'APT': '아파트', 'OPST': '오피스텔', 'SG': '상가'}
+TRADE_TYPES = {'A1': '매매', 'B1': '전세', 'B2': '월세', 'B3': '단기임대'}
+
+
+def normalize_target(target, defaults, datasets):
+    """기본값을 채우고 코드 값을 확인한 대상 반환 (잘못된 항목은 ValueError)"""
+    merged = dict(defaults)
+    merged.update(target)
+    name = merged.get('name')
+    if not name:
+        raise ValueError(f"대상 이름이 없습니다: {target}")
+
+    if 'bbox' in merged and 'id' in merged:
+        raise ValueError(f"{name}: id와 bbox 중 하나만 지정해야 합니다.")
+    if 'bbox' in merged:
+        try:
+            lat_min, lat_max, lng_min, lng_max = (float(v) for v in merged.pop('bbox'))
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: bbox는 [lat_min, lat_max, lng_min, lng_max] 형식이어야 합니다.")
+        merged.update(lat_min=lat_min, lat_max=lat_max, lng_min=lng_min, lng_max=lng_max)
+    elif 'id' in merged:
+        merged['id'] = str(merged['id'])
+    else:
+        raise ValueError(f"{name}: id 또는 bbox가 필요합니다.")
+
+    unknown = set(merged['real_estate_types']) - set(REAL_ESTATE_TYPES)
+    if not merged['real_estate_types'] or unknown:
+        raise ValueError(f"{name}: 알 수 없는 real_estate_types {sorted(unknown)}")
+    unknown = set(merged['trade_types']) - set(TRADE_TYPES)
+    if unknown:
+        raise ValueError(f"{name}: 알 수 없는 trade_types {sorted(unknown)}")
+    if not all(isinstance(band, str) for band in merged.get('area_nos', [])):
+        raise ValueError(f"{name}: area_nos는 '1' 또는 '1:2' 같은 문자열 목록이어야 합니다.")
+    if merged['dataset'] not in datasets:
+        raise ValueError(f"{name}: 정의되지 않은 dataset '{merged['dataset']}'")
+    merged.setdefault('dong', '')
+    return merged
+
+
+def load_registry(path=TARGETS_FILE):
+    """대상 등록 파일을 읽어 {'datasets': {...}, 'targets': [...]} 반환
+
+    enabled가 false인 대상은 제외하고, 각 대상에 defaults 값을 채웁니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    datasets = config.get('datasets', {})
+    defaults = {'real_estate_types': ['APT'], 'trade_types': [], 'dataset': next(iter(datasets), None)}
+    defaults.update(config.get('defaults', {}))
+
+    targets = [
+        normalize_target(target, defaults, datasets)
+        for target in config.get('targets', [])
+        if target.get('enabled', True)
+    ]
+    return {'datasets': datasets, 'default_dataset': defaults['dataset'], 'targets': targets}
+
+
+def complex_targets(registry):
+    """단지 ID로 조회하는 대상"""
+    return [target for target in registry['targets'] if 'id' in target]
+
+
+def region_targets(registry):
+    """좌표 영역으로 조회하는 대상"""
+    return [target for target in registry['targets'] if 'lat_min' in target]
+
+
+def dataset_output(registry, dataset):
+    """데이터셋을 저장할 매물 CSV 경로"""
+    return registry['datasets'][dataset or registry['default_dataset']]['output']
@@ -0,0 +1,45 @@
+import base64
+import json
+import time
+
+import auth_store
+
+
+def _token(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).decode().rstrip('=')
+    return f"Bearer header.{payload}.signature"
+
+
+def test_token_expiry_reads_jwt_exp():
+    assert auth_store.token_expiry(_token(1700000000)) == 1700000000
+    assert auth_store.token_expiry('Bearer not-a-jwt') is None
+
+
+def test_expired_or_nearly_expired_session_is_not_loaded(tmp_path):
+    path = str(tmp_path / 'auth_session.json')
+    token = _token(int(time.time()) + 3600)
+    auth_store.save_session(token, {'NID': 'a'}, path)
+    assert auth_store.load_session(path) == (token, {'NID': 'a'})
+
+    auth_store.save_session(_token(int(time.time()) + auth_store.EXPIRY_MARGIN - 1), {'NID': 'a'}, path)
+    assert auth_store.load_session(path) == (None, None)
+
+
+def test_rejected_session_falls_back_to_login(tmp_path, monkeypatch):
+    path = str(tmp_path / 'auth_session.json')
+    token = _token(int(time.time()) + 3600)
+    auth_store.save_session(token, {'NID': 'old'}, path)
+    logins = []
+
+    def login():
+        logins.append(1)
+        return token, {'NID': 'new'}
+
+    monkeypatch.setattr(auth_store, 'probe_session', lambda auth_token, cookies: True)
+    assert auth_store.get_auth_session(login, path) == (token, {'NID': 'old'})
+    assert logins == []
+
+    monkeypatch.setattr(auth_store, 'probe_session', lambda auth_token, cookies: False)
+    assert auth_store.get_auth_session(login, path) == (token, {'NID': 'new'})
+    assert logins == [1]
+    assert auth_store.load_session(path) == (token, {'NID': 'new'})
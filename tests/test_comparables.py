@@ -0,0 +1,54 @@
+import numpy as np
+
+from comparables import price_deviations
+from listing_table import ListingTable
+
+
+def _row(article_no, price, area, trade='매매', complex_name='단지', rent=''):
+    return {
+        'articleNo': article_no, 'complexName': complex_name, 'tradeTypeName': trade,
+        'dealOrWarrantPrc': price, 'rentPrc': rent, 'area2': area, 'floorInfo': '5/20'
+    }
+
+
+def test_compares_within_area_window_of_same_complex_and_trade():
+    table = ListingTable([
+        _row('1', '100000', '84.9'),
+        _row('2', '100000', '84.0'),
+        _row('3', '13억', '80.1'),
+        _row('4', '100000', '120.0'),  # 면적 차이가 5m²를 넘음
+        _row('5', '100000', '84.9', complex_name='다른단지'),
+        _row('6', '100000', '84.9', trade='전세'),
+    ])
+
+    deviations = price_deviations(table)
+
+    # 1: 2, 3의 평균(115,000) 대비, 3: 면적 창(75.1~85.1) 안의 1, 2 평균 대비
+    assert np.isclose(deviations[0], (100000 - 115000) / 115000 * 100)
+    assert np.isclose(deviations[2], 30.0)
+    assert np.isnan(deviations[3:]).all()
+
+
+def test_monthly_rent_compares_rent_and_skips_unknown_prices():
+    table = ListingTable([
+        _row('1', '5000', '59.9', trade='월세', rent='100'),
+        _row('2', '1000', '59.9', trade='월세', rent='150'),
+        _row('3', '', '59.9'),
+        _row('4', '50000', ''),
+    ])
+
+    deviations = price_deviations(table)
+
+    assert np.isclose(deviations[0], -100 / 3)
+    assert np.isclose(deviations[1], 50.0)
+    # 가격이나 면적을 알 수 없는 매물은 비교하지 않음
+    assert np.isnan(deviations[2]) and np.isnan(deviations[3])
+
+
+def test_outliers_are_trimmed_from_comparison_mean():
+    table = ListingTable([_row(str(i), '100', '84.9') for i in range(5)] + [_row('9', '1000', '84.9')])
+
+    deviations = price_deviations(table)
+
+    assert np.allclose(deviations[:5], 0.0)
+    assert np.isclose(deviations[5], 900.0)
@@ -0,0 +1,76 @@
+import json
+import os
+
+from crawl_journal import CrawlJournal
+
+
+def _journal(tmp_path, resume=False):
+    return CrawlJournal(str(tmp_path / 'crawl_journal.jsonl'), resume=resume)
+
+
+def test_resumes_after_last_contiguous_page(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_page('complex:1', 1, [{'articleNo': '1'}], '20250701', seen={'1'})
+    journal.record_page('complex:1', 2, [{'articleNo': '2'}], '20250702', seen={'2'})
+    # 3페이지 없이 기록된 4페이지는 이어서 수집할 때 쓰지 않음
+    journal.record_page('complex:1', 4, [{'articleNo': '4'}], seen={'4'})
+    journal.close()
+
+    resumed = _journal(tmp_path, resume=True)
+    articles, next_page, watermark, done = resumed.resume_state('complex:1')
+    assert [a['articleNo'] for a in articles] == ['1', '2']
+    assert next_page == 3
+    assert watermark == '20250702'
+    assert not done
+    assert resumed.resumed_seen('complex:1') == {'1', '2'}
+    assert resumed.pending_targets() == ['complex:1']
+    assert resumed.resume_state('complex:2') == ([], 1, None, False)
+
+
+def test_done_target_is_not_pending(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_page('region:a', 1, [], seen=())
+    journal.record_done('region:a', '20250710', saturated=True, complete=True)
+    journal.close()
+
+    resumed = _journal(tmp_path, resume=True)
+    assert resumed.resume_state('region:a')[3]
+    assert resumed.was_saturated('region:a')
+    assert resumed.was_complete('region:a')
+    assert resumed.pending_targets() == []
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_page('complex:1', 1, [{'articleNo': '1'}], seen={'1'})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "page", "target": "complex:1", "pa')
+
+    resumed = _journal(tmp_path, resume=True)
+    assert resumed.resume_state('complex:1')[1] == 2
+    # 잘린 줄을 지운 뒤에 이어서 기록
+    resumed.record_page('complex:1', 2, [{'articleNo': '2'}], seen={'2'})
+    resumed.close()
+
+    with open(journal.path, encoding='utf-8') as f:
+        assert [json.loads(line)['page'] for line in f] == [1, 2]
+    assert _journal(tmp_path, resume=True).resume_state('complex:1')[1] == 3
+
+
+def test_legacy_page_records_have_unknown_seen(tmp_path):
+    path = tmp_path / 'crawl_journal.jsonl'
+    path.write_text(json.dumps({'type': 'page', 'target': 'complex:1', 'page': 1, 'articles': []}) + '\n',
+                    encoding='utf-8')
+
+    journal = _journal(tmp_path, resume=True)
+    assert journal.resume_state('complex:1')[1] == 2
+    assert journal.resumed_seen('complex:1') is None
+
+
+def test_completed_journal_is_removed(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_done('complex:1')
+    journal.close(completed=True)
+
+    assert not os.path.exists(journal.path)
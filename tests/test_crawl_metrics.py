@@ -0,0 +1,43 @@
+import crawl_metrics
+from crawl_metrics import CrawlMetrics
+
+
+def _metrics():
+    metrics = CrawlMetrics()
+    metrics.observe_request(0.03, 200, size=1000)
+    metrics.observe_request(0.3, 429, size=10, retry=True)
+    metrics.observe_request(20.0)  # 연결 실패, 가장 큰 구간보다 느림
+    metrics.record_page('complex:1', 20, 3, unmatched=1)
+    metrics.record_page('complex:1', 20, 0, unchanged_page=True)
+    metrics.record_saved('listings.csv', 2, 1)
+    metrics.record_seen('listings.csv', 40)
+    return metrics
+
+
+def test_report_counts_and_cumulative_latency_buckets():
+    report = _metrics().report()
+
+    assert (report['requests'], report['retries'], report['errors']) == (3, 1, 1)
+    assert report['statuses'] == {'200': 1, '429': 1}
+    assert report['bytes'] == 1010
+    buckets = dict(report['latency']['buckets'])
+    assert buckets[0.05] == 1 and buckets[0.5] == 2 and buckets[10.0] == 2
+    assert report['targets']['complex:1'] == {
+        'pages': 2, 'unchanged_pages': 1, 'articles': 40, 'changed': 3, 'unmatched': 1
+    }
+    assert report['datasets']['listings.csv']['unchanged'] == 37
+
+
+def test_prometheus_text_format():
+    report = _metrics().report()
+    report['targets']['region:"송도"'] = crawl_metrics._target_entry()
+
+    lines = crawl_metrics.prometheus_text(report).splitlines()
+
+    assert '# TYPE naver_crawl_request_duration_seconds histogram' in lines
+    assert 'naver_crawl_request_duration_seconds_bucket{le="0.5"} 2' in lines
+    assert 'naver_crawl_request_duration_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'naver_crawl_responses{status="429"} 1' in lines
+    assert 'naver_crawl_listings{dataset="listings.csv",result="unchanged"} 37' in lines
+    # 레이블 값의 따옴표는 이스케이프
+    assert 'naver_crawl_pages{target="region:\\"송도\\""} 0' in lines
@@ -0,0 +1,90 @@
+import pytest
+
+import crawl_planner
+from crawl_planner import QueryShard
+from target_registry import TRADE_TYPES
+
+
+def test_root_merges_area_bands_of_all_targets():
+    root = QueryShard.root([
+        {'real_estate_types': ['APT', 'OPST'], 'area_nos': ['1', '2']},
+        {'real_estate_types': ['APT', 'OPST'], 'area_nos': ['2', '3']}
+    ])
+
+    assert root.area_bands == ('1', '2', '3')
+    assert root.filters() == ('APT:OPST', '', '')
+    assert root.path == 'all'
+
+
+def test_split_by_trade_type_then_estate_type_then_area():
+    root = QueryShard.root([{'real_estate_types': ['APT', 'OPST'], 'area_nos': ['1', '2']}])
+
+    by_trade = root.split()
+    assert [shard.path for shard in by_trade] == [f'all/{code}' for code in TRADE_TYPES]
+    by_type = by_trade[0].split()
+    assert [shard.path for shard in by_type] == ['all/A1/APT', 'all/A1/OPST']
+    by_area = by_type[0].split()
+    assert [shard.path for shard in by_area] == ['all/A1/APT/area1', 'all/A1/APT/area2']
+    assert by_area[1].filters() == ('APT', 'A1', '2')
+    assert by_area[1].depth == 3
+    assert by_area[1].split() == []
+
+
+def test_split_skips_levels_that_cannot_be_divided():
+    root = QueryShard.root([{'real_estate_types': ['APT'], 'trade_types': ['B2']}])
+
+    assert root.split() == []
+
+    # 등록한 거래 유형이 여럿이면 그 유형들로만 나눔
+    root = QueryShard.root([{'real_estate_types': ['OPST'], 'trade_types': ['B1', 'B2'], 'area_nos': ['4']}])
+    assert [shard.path for shard in root.split()] == ['all/B1', 'all/B2']
+    assert [shard.path for shard in root.split()[0].split()] == ['all/B1/area4']
+
+
+@pytest.mark.parametrize('floor_info, expected', [
+    ('12/29', (12, 29)),
+    ('12', (12, None)),
+    ('B1/20', (-1, 20)),
+    ('저/29', (None, 29)),
+    (' 3 / 39 ', (3, 39)),
+    ('', (None, None)),
+    (None, (None, None)),
+])
+def test_parse_floor(floor_info, expected):
+    assert crawl_planner.parse_floor(floor_info) == expected
+
+
+@pytest.mark.parametrize('floor_info, matched', [
+    ('4/39', True),
+    ('39/39', True),
+    ('3/39', False),
+    ('10/29', False),
+    ('고/39', False),
+    ('12', False),
+])
+def test_matches_rule_total_floors_and_floor_min(floor_info, matched):
+    rule = {'total_floors': 39, 'floor_min': 4}
+
+    assert crawl_planner.matches_rule({'floorInfo': floor_info}, rule) is matched
+
+
+def test_matches_rule_floor_max_includes_basement():
+    rule = {'floor_max': 2}
+
+    assert crawl_planner.matches_rule({'floorInfo': 'B1/29'}, rule)
+    assert crawl_planner.matches_rule({'floorInfo': '2'}, rule)
+    assert not crawl_planner.matches_rule({'floorInfo': '3/29'}, rule)
+
+
+def test_label_article_uses_first_matching_target():
+    targets = [
+        {'name': '오피스', 'dong': 'A동', 'rules': [{'total_floors': 39, 'floor_min': 4}]},
+        {'name': '상가', 'dong': 'B동상가', 'rules': [{'total_floors': 29, 'floor_max': 2}]},
+    ]
+
+    article = {'floorInfo': '1/29'}
+    assert crawl_planner.label_article(article, targets)
+    assert (article['complexName'], article['dong']) == ('상가', 'B동상가')
+    assert not crawl_planner.label_article({'floorInfo': '5/29'}, targets)
+    # 규칙이 없는 대상은 나머지 매물을 모두 받음
+    assert crawl_planner.classify({'floorInfo': '5/29'}, targets + [{'name': '기타'}])['name'] == '기타'
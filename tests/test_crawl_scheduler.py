@@ -0,0 +1,49 @@
+import crawl_scheduler
+from crawl_scheduler import MAX_INTERVAL, MIN_INTERVAL, TARGET_CHANGES
+
+
+def test_busy_target_gets_shorter_interval():
+    entry = {'last_run': 0}
+    crawl_scheduler.record_run(entry, changes=8, requests=4, now=3600)
+
+    # 시간당 8건 변경 -> 한 번에 TARGET_CHANGES건 정도 바뀌는 주기 (최소 주기 이상)
+    assert entry['churn'] == 8
+    assert entry['interval'] == max(MIN_INTERVAL, TARGET_CHANGES / 8 * 3600)
+    assert entry['next_due'] == 3600 + entry['interval']
+
+
+def test_quiet_target_backs_off_to_max_interval():
+    entry = {'last_run': 0}
+    crawl_scheduler.record_run(entry, changes=0, requests=1, now=3600)
+    assert entry['interval'] == MAX_INTERVAL
+
+    # 이동평균이라 한 번 조용해도 바로 최대 주기로 가지 않음
+    entry = {'last_run': 0, 'churn': 4.0, 'cost': 2}
+    crawl_scheduler.record_run(entry, changes=0, requests=2, now=3600)
+    assert entry['churn'] == 4.0 * (1 - crawl_scheduler.CHURN_ALPHA)
+    assert MIN_INTERVAL < entry['interval'] < MAX_INTERVAL
+
+
+def test_fit_budget_scales_intervals_without_storing_them():
+    schedule = {
+        'a': {'last_run': 0, 'interval': 900, 'cost': 10},
+        'b': {'last_run': 0, 'interval': 3600, 'cost': 20},
+    }
+
+    demand, scale = crawl_scheduler.fit_budget(schedule, budget=30)
+
+    assert demand == 60 and scale == 2
+    assert schedule['a']['next_due'] == 1800 and schedule['a']['interval'] == 900
+    assert crawl_scheduler.fit_budget(schedule, budget=100) == (60, 1.0)
+    assert schedule['a']['next_due'] == 900
+
+
+def test_due_queries_ordered_by_churn_and_respect_retry():
+    schedule = {
+        'a': {'next_due': 100, 'churn': 1.0},
+        'b': {'next_due': 50, 'churn': 5.0},
+        'c': {'next_due': 50, 'retry_at': 500},
+    }
+    queries = [('a', {}), ('b', {}), ('c', {}), ('new', {})]
+
+    assert [key for key, _ in crawl_scheduler.due_queries(queries, schedule, now=200)] == ['b', 'a', 'new']
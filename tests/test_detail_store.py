@@ -0,0 +1,34 @@
+import pickle
+
+from detail_store import DetailStore
+
+
+def _legacy_cache(tmp_path):
+    legacy_path = tmp_path / 'api_cache.pkl'
+    with open(legacy_path, 'wb') as f:
+        pickle.dump({1001: {'articleNo': '1001'}, 1002: {'articleNo': '1002'}, 1003: None}, f)
+    return legacy_path
+
+
+def test_migrates_into_empty_store(tmp_path):
+    path = tmp_path / 'article_details.jsonl'
+    path.touch()
+
+    store = DetailStore(str(path), str(_legacy_cache(tmp_path)))
+
+    assert len(store) == 2
+    assert store.get('1001') == {'articleNo': '1001'}
+
+
+def test_migrated_details_stay_current_until_row_changes(tmp_path):
+    path = tmp_path / 'article_details.jsonl'
+    store = DetailStore(str(path), str(_legacy_cache(tmp_path)))
+
+    # 옮겨 온 매물은 행 해시를 기록하기 전까지 최신으로 봄
+    assert store.is_current('1001', 'a')
+    assert store.pin({'1001': 'a', '1002': 'b', '9999': 'c'}) == 2
+
+    reopened = DetailStore(str(path), str(_legacy_cache(tmp_path)))
+    assert reopened.is_current('1001', 'a')
+    assert not reopened.is_current('1001', 'changed')
+    assert reopened.pin({'1001': 'changed'}) == 0
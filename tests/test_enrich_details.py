@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import enrich_details
+import listing_store
+from detail_store import DetailStore
+
+
+class _Client:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.requested = []
+
+    def get(self, path):
+        article_no = path.split('/')[3].split('?')[0]
+        self.requested.append(article_no)
+        if article_no in self.failing:
+            return SimpleNamespace(status_code=500)
+        return SimpleNamespace(status_code=200, json=lambda: {'articleNo': article_no})
+
+
+def _listings(*article_nos, price='1억'):
+    listings = {}
+    for article_no in article_nos:
+        row = {field: '' for field in listing_store.FIELDS}
+        row.update(articleNo=article_no, dealOrWarrantPrc=price)
+        listings[article_no] = row
+    return listings
+
+
+def test_resumes_with_failed_and_changed_listings_only(tmp_path):
+    path = str(tmp_path / 'article_details.jsonl')
+    listings = _listings('1', '2', '3')
+
+    client = _Client(failing={'2'})
+    assert enrich_details.enrich(client, DetailStore(path, None), listings, workers=1) == (2, 1)
+
+    # 다시 열면 실패한 매물만 조회
+    client = _Client()
+    assert enrich_details.enrich(client, DetailStore(path, None), listings, workers=1) == (1, 0)
+    assert client.requested == ['2']
+
+    # 행 내용이 바뀐 매물은 다시 조회
+    listings.update(_listings('3', price='2억'))
+    client = _Client()
+    assert enrich_details.enrich(client, DetailStore(path, None), listings, workers=1) == (1, 0)
+    assert client.requested == ['3']
+
+
+def test_limit_caps_requests_per_run(tmp_path):
+    store = DetailStore(str(tmp_path / 'article_details.jsonl'), None)
+    client = _Client()
+
+    assert enrich_details.enrich(client, store, _listings('1', '2', '3'), workers=2, limit=2) == (2, 0)
+    assert len(client.requested) == 2
+    assert len(store) == 2
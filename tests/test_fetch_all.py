@@ -0,0 +1,97 @@
+import json
+
+import fetch_all
+from fetch_all import PageQuery
+
+TARGETS = [{'name': '단지'}]
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, data):
+        self.content = json.dumps(data).encode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _Client:
+    """page=N 요청에 pages[N - 1]을 돌려주고 요청한 페이지를 기록"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, path, referer=None):
+        page = int(path.rpartition('page=')[2])
+        self.requested.append(page)
+        articles = self.pages[page - 1] if page <= len(self.pages) else []
+        return _Response({'articleList': articles, 'isMoreData': page < len(self.pages)})
+
+
+class _Progress:
+    def update(self, count):
+        pass
+
+
+def _article(article_no, confirm_ymd):
+    return {'articleNo': article_no, 'articleConfirmYmd': confirm_ymd, 'floorInfo': '5/20'}
+
+
+def _crawl(monkeypatch, pages, incremental=False, watermark=None, hashes=None, previous=None):
+    client = _Client(pages)
+    monkeypatch.setattr(fetch_all, 'client', client)
+    monkeypatch.setattr(fetch_all, 'page_hashes', hashes)
+    monkeypatch.setattr(fetch_all, 'archive', None)
+    monkeypatch.setattr(fetch_all, 'metrics', None)
+    query = PageQuery(lambda page, order: f"/api/articles?order={order}&page={page}", None, ('complex', '1'), 'all')
+    result = fetch_all.crawl_pages(query, TARGETS, _Progress(), previous or {}, incremental, watermark,
+                                   None, 'complex:1#all')
+    return result, sorted(set(client.requested))
+
+
+def test_incremental_crawl_stops_at_watermark(monkeypatch):
+    pages = [
+        [_article('1', '20260110'), _article('2', '20260107')],
+        [_article('3', '20260106'), _article('4', '20260101'), _article('5', '20260101')],
+        [_article('6', '20251201')],
+    ]
+
+    result, requested = _crawl(monkeypatch, pages, incremental=True, watermark='20260105')
+
+    assert [article['articleNo'] for article in result.articles] == ['1', '2', '3']
+    assert result.watermark == '20260110'
+    assert not result.complete
+    # 기준일에 닿은 페이지 뒤로는 요청하지 않음
+    assert requested == [1, 2]
+
+
+def test_unchanged_pages_are_skipped(monkeypatch):
+    pages = [[_article(str(page * 10 + i), '20260101') for i in range(3)] for page in range(1, 6)]
+    hashes = {}
+
+    first, requested = _crawl(monkeypatch, pages, hashes=hashes)
+    assert len(first.articles) == 15 and first.complete
+    assert requested == [1, 2, 3, 4, 5]
+
+    stored = {article['articleNo']: fetch_all.classify_row(fetch_all.listing_store.article_to_row(article))
+              for article in first.articles}
+    second, requested = _crawl(monkeypatch, pages, hashes=hashes, previous=stored)
+
+    # 같은 본문이 연속으로 나오면 파싱하지 않고 중단하며, 기록한 매물번호로 확인 목록을 채움
+    assert second.articles == []
+    assert requested == list(range(1, fetch_all.UNCHANGED_PAGES_STOP + 1))
+    assert second.seen == {'10', '11', '12', '20', '21', '22'}
+
+
+def test_changed_page_is_parsed_again(monkeypatch):
+    pages = [[_article('1', '20260101')], [_article('2', '20260101')]]
+    hashes = {}
+    _crawl(monkeypatch, pages, hashes=hashes)
+
+    pages[1] = [_article('2', '20260102')]
+    result, _ = _crawl(monkeypatch, pages, hashes=hashes, previous={})
+
+    assert [article['articleNo'] for article in result.articles] == ['2']
+    assert result.complete and result.seen == {'1', '2'}
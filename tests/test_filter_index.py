@@ -0,0 +1,49 @@
+import numpy as np
+
+from filter_index import FilterIndex
+from listing_table import ListingTable
+
+
+def _table():
+    return ListingTable([
+        {'articleNo': '2500001', 'complexName': '센트로드', 'dong': '', 'tradeTypeName': '매매'},
+        {'articleNo': '2500002', 'complexName': '센텀하이브', 'dong': 'A동', 'tradeTypeName': '월세'},
+        {'articleNo': '2510003', 'complexName': '센텀하이브', 'dong': 'B동상가', 'tradeTypeName': '월세'},
+        {'articleNo': '2400004', 'complexName': '센텀하이브', 'dong': 'A동', 'tradeTypeName': '전세'},
+    ])
+
+
+def _rows(mask):
+    return np.flatnonzero(mask).tolist()
+
+
+def test_combines_category_conditions():
+    index = FilterIndex(_table())
+
+    assert _rows(index.mask()) == [0, 1, 2, 3]
+    assert _rows(index.mask(complex_name='센텀하이브')) == [1, 2, 3]
+    assert _rows(index.mask(complex_name='센텀하이브', dong='A동')) == [1, 3]
+    assert _rows(index.mask(complex_name='센텀하이브', dong='A동', trade_type='월세')) == [1]
+    # 표에 없는 값은 아무 행도 맞지 않음
+    assert _rows(index.mask(trade_type='단기임대')) == []
+
+
+def test_article_prefix_search():
+    index = FilterIndex(_table())
+
+    assert _rows(index.mask(article_prefix='25')) == [0, 1, 2]
+    assert _rows(index.mask(article_prefix='2500')) == [0, 1]
+    assert _rows(index.mask(article_prefix='2500002')) == [1]
+    assert _rows(index.mask(article_prefix='26')) == []
+    assert _rows(index.mask(article_prefix='25', trade_type='월세')) == [1, 2]
+
+
+def test_saved_only_follows_set_saved():
+    index = FilterIndex(_table(), saved_items={'2510003', 9999})
+
+    assert _rows(index.mask(saved_only=True)) == [2]
+    index.set_saved('2400004', True)
+    index.set_saved('2510003', False)
+    index.set_saved('9999', True)  # 표에 없는 매물은 무시
+    assert _rows(index.mask(saved_only=True)) == [3]
+    assert _rows(index.mask(saved_only=True, dong='B동상가')) == []
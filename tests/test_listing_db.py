@@ -0,0 +1,88 @@
+import listing_db
+from listing_store import FIELDS
+
+
+def _row(article_no, complex_name='단지', trade='매매', area='84.9', confirm='20260101', floor='12/29'):
+    row = {field: '' for field in FIELDS}
+    row.update({
+        'articleNo': article_no, 'complexName': complex_name, 'tradeTypeName': trade,
+        'area2': area, 'articleConfirmYmd': confirm, 'floorInfo': floor, 'dealOrWarrantPrc': '10억'
+    })
+    return row
+
+
+def _article_nos(rows):
+    return sorted(row['articleNo'] for row in rows)
+
+
+def test_upsert_replaces_rows_by_article_no(tmp_path):
+    conn = listing_db.connect(str(tmp_path / 'listings.db'))
+    listing_db.upsert(conn, [_row('1'), _row('2')])
+    listing_db.upsert(conn, [_row('1', trade='전세')])
+
+    assert listing_db.count(conn) == 2
+    assert listing_db.load_all(conn)['1']['tradeTypeName'] == '전세'
+    # 층은 crawl_planner.parse_floor와 같은 규칙으로 읽음
+    assert conn.execute("SELECT floor FROM listings WHERE articleNo = '1'").fetchone()[0] == 12
+
+
+def test_query_by_complex_trade_and_area_window(tmp_path):
+    conn = listing_db.connect(str(tmp_path / 'listings.db'))
+    listing_db.upsert(conn, [
+        _row('1', area='84.9'), _row('2', area='80.0'), _row('3', area='59.9'),
+        _row('4', trade='전세'), _row('5', complex_name='다른단지')
+    ])
+    listing_db.mark_removed(conn, ['2'])
+
+    rows = listing_db.query(conn, complex_name='단지', trade_type='매매', area=84.0)
+    assert _article_nos(rows) == ['1']
+    rows = listing_db.query(conn, complex_name='단지', trade_type='매매', area=84.0, include_removed=True)
+    assert _article_nos(rows) == ['1', '2']
+
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM listings WHERE complexName = ? AND tradeTypeName = ? "
+        "AND area BETWEEN ? AND ?", ('단지', '매매', 79.0, 89.0)
+    ))
+    assert 'listings_complex_trade_area' in plan
+
+
+def test_confirm_date_queries(tmp_path):
+    conn = listing_db.connect(str(tmp_path / 'listings.db'))
+    listing_db.upsert(conn, [_row('1', confirm='20260101'), _row('2', confirm='20260315'), _row('3', confirm='')])
+
+    assert listing_db.latest_confirm_date(conn) == '20260315'
+    assert listing_db.count(conn, confirmed_since='20260201') == 1
+    assert _article_nos(listing_db.query(conn, confirmed_since='20260101')) == ['1', '2']
+
+
+def test_connect_drops_indexes_of_previous_schema(tmp_path):
+    path = str(tmp_path / 'listings.db')
+    conn = listing_db.connect(path)
+    conn.execute("CREATE INDEX listings_price ON listings (price)")
+    conn.close()
+
+    conn = listing_db.connect(path)
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'listings_price' not in indexes
+
+
+def test_numeric_sort_reads_trade_index_and_keeps_unknown_values_last(tmp_path):
+    conn = listing_db.connect(str(tmp_path / 'listings.db'))
+    listing_db.upsert(conn, [
+        _row('1', floor='12/29'), _row('2', floor='저/29'), _row('3', floor='3/29'), _row('4', floor='30/39'),
+        _row('5', trade='전세', floor='1/29')
+    ])
+
+    def sorted_nos(**kwargs):
+        return [row['articleNo'] for row in listing_db.query(conn, trade_type='매매', sort='floor', **kwargs)]
+
+    assert sorted_nos() == ['3', '1', '4', '2']
+    assert sorted_nos(descending=True) == ['4', '1', '3', '2']
+    assert sorted_nos(limit=2, offset=2) == ['4', '2']
+    assert sorted_nos(limit=2, offset=3) == ['2']
+
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM listings WHERE tradeTypeName = ? AND price IS NOT NULL "
+        "ORDER BY price DESC, rowid DESC", ('매매',)
+    ))
+    assert 'listings_trade_price' in plan and 'TEMP B-TREE' not in plan
@@ -0,0 +1,54 @@
+from listing_lifecycle import ListingLifecycle, active_listings
+
+
+def _lifecycle(tmp_path):
+    return ListingLifecycle(str(tmp_path / 'listings.lifecycle.jsonl'))
+
+
+def test_incomplete_pass_never_removes(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    lifecycle.observe('complex:1', {'1', '2'}, True, at='2026-01-01 00:00:00')
+
+    assert lifecycle.observe('complex:1', {'1'}, False, at='2026-01-02 00:00:00') == (0, 0)
+    assert lifecycle.is_active('2')
+
+
+def test_complete_pass_removes_only_its_own_scope(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    lifecycle.observe('complex:1', {'1', '2'}, True, at='2026-01-01 00:00:00')
+    lifecycle.observe('complex:2', {'3'}, True, at='2026-01-01 00:00:00')
+
+    assert lifecycle.observe('complex:1', {'1'}, True, at='2026-01-05 00:00:00') == (0, 1)
+    assert not lifecycle.is_active('2')
+    assert lifecycle.is_active('3')
+    # 삭제 시각이 아니라 마지막으로 끝까지 확인한 수집 시각
+    assert lifecycle.last_seen('2') == '2026-01-01 00:00:00'
+
+    # 다시 보이면 새로 등록
+    assert lifecycle.observe('complex:1', {'1', '2'}, True, at='2026-01-06 00:00:00') == (1, 0)
+    assert lifecycle.is_active('2')
+
+
+def test_sweep_removes_unseen_stored_listings(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    lifecycle.observe('complex:1', {'1'}, True, at='2026-01-01 00:00:00')
+
+    # '9'는 기록 이전부터 저장된 매물 (scope 없음)
+    assert lifecycle.sweep(['1', '9'], {'1'}, at='2026-01-02 00:00:00') == 1
+    assert not lifecycle.is_active('9')
+    assert lifecycle.sweep(['1', '9'], {'1'}, at='2026-01-03 00:00:00') == 0
+
+    stored = {'1': {'articleNo': '1'}, '9': {'articleNo': '9'}}
+    assert set(active_listings(stored, lifecycle)) == {'1'}
+
+
+def test_log_is_replayed_on_load(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    lifecycle.observe('complex:1', {'1', '2'}, True, at='2026-01-01 00:00:00')
+    lifecycle.observe('complex:1', {'1'}, True, at='2026-01-11 00:00:00')
+    with open(lifecycle.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "listed", "articleNo"')  # 중단되어 잘린 줄
+
+    reloaded = _lifecycle(tmp_path)
+    assert reloaded.is_active('1') and not reloaded.is_active('2')
+    assert reloaded.days_on_market('2') == 10
@@ -0,0 +1,65 @@
+import csv
+import os
+import shutil
+import threading
+
+import listing_store
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OFFICETEL_FILE = os.path.join(ROOT, 'songdo_officetel_listings.csv')
+APARTMENTS_FILE = os.path.join(ROOT, 'songdo_apartments_listings.csv')
+
+
+def _article_nos(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return {row['articleNo'] for row in csv.DictReader(f) if row['articleNo']}
+
+
+def test_loads_legacy_officetel_file():
+    listings = listing_store.load_listings(OFFICETEL_FILE)
+
+    assert set(listings) == _article_nos(OFFICETEL_FILE)
+    row = next(iter(listings.values()))
+    assert list(row) == listing_store.FIELDS
+    # complexName 열이 없는 이전 형식은 articleName을 단지명으로 사용
+    assert all(row['complexName'] == row['articleName'] for row in listings.values())
+
+
+def test_loads_apartments_file():
+    listings = listing_store.load_listings(APARTMENTS_FILE)
+
+    assert set(listings) == _article_nos(APARTMENTS_FILE)
+
+
+def test_compact_keeps_legacy_rows(tmp_path):
+    path = str(tmp_path / 'officetel.csv')
+    shutil.copy(OFFICETEL_FILE, path)
+    previous = listing_store.load_listings(path)
+    row = dict(next(iter(previous.values())), articleNo='1', dong='B동')
+
+    listing_store.append_changes([row], previous, path)
+    listing_store.compact(path)
+
+    listings = listing_store.load_listings(path)
+    assert set(listings) == _article_nos(OFFICETEL_FILE) | {'1'}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        assert next(csv.reader(f)) == listing_store.FIELDS
+
+
+def test_appends_during_compaction_are_kept(tmp_path):
+    path = str(tmp_path / 'listings.csv')
+    previous = {}
+    rows = [{field: '' for field in listing_store.FIELDS} for _ in range(200)]
+    for i, row in enumerate(rows):
+        row['articleNo'] = str(i)
+
+    compactions = [threading.Thread(target=listing_store.compact, args=(path,)) for _ in range(20)]
+    for thread in compactions:
+        thread.start()
+    for row in rows:
+        listing_store.append_changes([row], previous, path)
+    for thread in compactions:
+        thread.join()
+    listing_store.compact(path)
+
+    assert set(listing_store.load_listings(path)) == {str(i) for i in range(200)}
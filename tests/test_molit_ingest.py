@@ -0,0 +1,81 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+import molit_ingest
+from molit_ingest import DailyQuota, QuotaExceeded
+
+PAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<response>
+  <header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header>
+  <body>
+    <items>
+      <item>
+        <aptNm>송도더샵퍼스트파크</aptNm><umdNm>송도동</umdNm><excluUseAr>84.97</excluUseAr>
+        <floor>12</floor><dealAmount>85,000</dealAmount><buildYear>2017</buildYear>
+        <dealYear>2026</dealYear><dealMonth>3</dealMonth><dealDay>7</dealDay>
+      </item>
+      <item>
+        <아파트>송도센트럴파크</아파트><법정동>송도동</법정동><전용면적>59.9</전용면적>
+        <층>-1</층><거래금액> 52,500</거래금액><건축년도>2010</건축년도>
+        <년>2026</년><월>3</월>
+      </item>
+    </items>
+    <totalCount>2</totalCount>
+  </body>
+</response>
+"""
+
+
+def test_parse_page_reads_new_and_legacy_field_names():
+    code, message, total, transactions = molit_ingest.parse_page(
+        io.BytesIO(PAGE.encode('utf-8')), '28185', '202603'
+    )
+
+    assert (code, message, total) == ('000', 'OK', 2)
+    assert transactions == [
+        ('28185', '202603', '2026-03-07', '송도더샵퍼스트파크', '송도동', 84.97, 12, 85000, 2017),
+        # 거래일이 없으면 그 달 1일
+        ('28185', '202603', '2026-03-01', '송도센트럴파크', '송도동', 59.9, -1, 52500, 2010),
+    ]
+
+
+def test_parse_page_error_header():
+    xml = b"<response><header><resultCode>22</resultCode><resultMsg>LIMITED</resultMsg></header></response>"
+
+    assert molit_ingest.parse_page(io.BytesIO(xml), '28185', '202603') == ('22', 'LIMITED', 0, [])
+
+
+def test_quota_stops_at_daily_limit_and_saves_once(tmp_path):
+    path = str(tmp_path / 'quota.json')
+    quota = DailyQuota(2, path)
+    quota.reserve()
+    quota.reserve()
+    with pytest.raises(QuotaExceeded):
+        quota.reserve()
+    assert quota.remaining() == 0
+
+    quota.save()
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {date.today().isoformat(): 2}
+    # 다시 열어도 오늘 쓴 요청 수가 유지됨
+    assert DailyQuota(5, path).remaining() == 3
+
+
+def test_exhaust_uses_up_the_rest_of_today(tmp_path):
+    path = str(tmp_path / 'quota.json')
+    quota = DailyQuota(10, path)
+    quota.reserve()
+    quota.exhaust()
+
+    assert DailyQuota(10, path).remaining() == 0
+
+
+def test_settled_months_and_month_ranges():
+    assert molit_ingest.month_range('202511', '202602') == ['202511', '202512', '202601', '202602']
+    assert molit_ingest.recent_months(3, today=date(2026, 1, 15)) == ['202511', '202512', '202601']
+    # 계약월이 끝나고(다음 달 1일부터) 30일이 지나야 확정
+    assert not molit_ingest.is_settled('202512', today=date(2026, 1, 30))
+    assert molit_ingest.is_settled('202512', today=date(2026, 1, 31))
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import naver_client
+from naver_client import CircuitBreaker, RetryPolicy
+
+
+class _Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(retry_after):
+    return SimpleNamespace(headers={'Retry-After': retry_after})
+
+
+def test_retry_after_seconds_is_clamped():
+    policy = RetryPolicy(max_delay=10)
+
+    assert policy.delay(0, _response('3')) == 3.0
+    assert policy.delay(0, _response('120')) == 10.0
+    assert policy.delay(0, _response('-5')) == 0.0
+
+
+def test_retry_after_http_date():
+    policy = RetryPolicy(max_delay=60)
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert 25 <= policy.delay(0, _response(format_datetime(retry_at, usegmt=True))) <= 30
+
+
+def test_backoff_without_retry_after_is_capped_full_jitter(monkeypatch):
+    policy = RetryPolicy(base_delay=1.0, max_delay=60)
+    # 지터 구간의 위쪽 끝을 반환하게 해서 상한을 확인
+    monkeypatch.setattr(naver_client.random, 'uniform', lambda low, high: high)
+
+    assert policy.delay(0) == 1.0
+    assert policy.delay(3) == 8.0
+    assert policy.delay(10) == 60
+    # 읽을 수 없는 Retry-After는 무시하고 백오프 사용
+    assert policy.delay(2, _response('soon')) == 4.0
+
+
+def test_breaker_needs_min_requests_before_opening(monkeypatch):
+    monkeypatch.setattr(naver_client, 'time', _Clock())
+    breaker = CircuitBreaker(window=10, min_requests=4, failure_ratio=0.5, cooldown=30)
+
+    for _ in range(3):
+        breaker.record(False)
+    assert breaker.open_until == 0.0
+
+
+def test_breaker_opens_on_failure_ratio_and_waits_for_cooldown(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(naver_client, 'time', clock)
+    breaker = CircuitBreaker(window=10, min_requests=4, failure_ratio=0.5, cooldown=30)
+
+    for success in (True, True, False):
+        breaker.record(success)
+    breaker.wait()
+    assert clock.sleeps == []
+
+    breaker.record(False)
+    assert breaker.open_until == 130.0
+    # 차단되면 기록을 비우므로 해제 후에는 다시 min_requests만큼 모아서 판단
+    assert len(breaker.outcomes) == 0
+
+    breaker.wait()
+    assert clock.sleeps == [30.0]
+    assert clock.now >= breaker.open_until
+    breaker.wait()
+    assert clock.sleeps == [30.0]
+
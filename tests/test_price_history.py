@@ -0,0 +1,53 @@
+import price_history
+from price_history import PriceHistory
+
+
+def _history(tmp_path):
+    return PriceHistory(str(tmp_path / 'listings.prices.npz'))
+
+
+def test_records_only_price_changes_and_survives_reload(tmp_path):
+    history = _history(tmp_path)
+    assert history.record('2', '단지', '5억', '', ts=100)
+    assert history.record('1', '단지', '4억 3,680', '', ts=100)
+    assert not history.record('1', '단지', '43680', '', ts=200)  # 같은 가격
+    assert history.record('1', '단지', '4억 2,000', '', 'DECREASE', ts=300)
+    assert not history.record('abc', '단지', '1억', '')
+    history.save()
+
+    reloaded = _history(tmp_path)
+    rows = reloaded.listing('1')
+    assert rows['deal'].tolist() == [43680, 42000]
+    assert rows['ts'].tolist() == [100, 300]
+    assert reloaded.listing('1', start=200)['deal'].tolist() == [42000]
+    # 다시 연 뒤에도 마지막 가격과 비교
+    assert not reloaded.record('2', '단지', '5억', '', ts=400)
+
+
+def test_append_after_reload_keeps_rows_sorted(tmp_path):
+    history = _history(tmp_path)
+    history.record('5', '가', '100', '', ts=100)
+    history.record('3', '나', '100', '', ts=100)
+    history.save()
+
+    history = _history(tmp_path)
+    history.record('4', '가', '200', '', ts=200)
+    history.record('5', '가', '150', '', ts=200)
+    history.save()
+
+    history = _history(tmp_path)
+    assert history.columns['article'].tolist() == [3, 4, 5, 5]
+    assert history.complex_range('가')['article'].tolist() == [4, 5, 5]
+
+
+def test_price_changes_between_consecutive_rows_of_a_listing(tmp_path):
+    history = _history(tmp_path)
+    history.record('1', '단지', '100', '', ts=100)
+    history.record('1', '단지', '90', '', ts=200)
+    history.record('2', '단지', '50', '', ts=100)
+    history.record('2', '단지', '60', '', ts=300)
+
+    articles, ts, diffs = price_history.price_changes(history.complex_range('단지'), 'deal')
+    assert articles.tolist() == [1, 2]
+    assert ts.tolist() == [200, 300]
+    assert diffs.tolist() == [-10, 10]
@@ -0,0 +1,58 @@
+import rate_limiter
+from rate_limiter import TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def test_burst_then_waits_for_refill(monkeypatch):
+    clock = _clock(monkeypatch)
+    bucket = TokenBucket(2)
+
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    # 토큰이 바닥나면 한 개가 다시 찰 때까지(1/rate초) 기다림
+    bucket.acquire()
+    assert sum(clock.sleeps) == 0.5
+
+
+def test_refill_is_capped_at_burst(monkeypatch):
+    clock = _clock(monkeypatch)
+    bucket = TokenBucket(10, burst=5)
+    for _ in range(5):
+        bucket.acquire()
+
+    clock.now += 100
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert round(sum(clock.sleeps), 6) == 0.1
+
+
+def test_no_limit_when_rate_is_zero(monkeypatch):
+    clock = _clock(monkeypatch)
+    bucket = TokenBucket(0)
+
+    for _ in range(1000):
+        bucket.acquire()
+    assert clock.sleeps == []
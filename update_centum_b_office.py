@@ -1,67 +1,68 @@
-import csv
+import listing_db
+import listing_store
 
-input_file = 'songdo_apartments_listings.csv'
-temp_file = 'songdo_apartments_listings_temp.csv'
 
-with open(input_file, 'r', encoding='utf-8') as infile, open(temp_file, 'w', encoding='utf-8', newline='') as outfile:
-    reader = csv.reader(infile)
-    writer = csv.writer(outfile)
-    header = next(reader)
-    writer.writerow(header)
-    
-    for row in reader:
-        if len(row) >= 7:
-            complex_name = row[0].strip()
-            floor_info = row[6].strip()
-            
-            # A동 처리 (더샵송도센텀하이브A → 센텀하이브A동)
-            if complex_name == '더샵송도센텀하이브A':
-                try:
-                    floor_num = int(floor_info.split('/')[0])
-                    total_floors = int(floor_info.split('/')[1])
-                    
-                    if total_floors == 39:  # A동은 39층까지
-                        if floor_num <= 2:
-                            # 1-2층: 상가
-                            row[0] = '센텀하이브A동상가'
-                            row[-1] = 'A동'
-                        elif floor_num >= 4:
-                            # 4-39층: 오피스
-                            row[0] = '센텀하이브A동오피스'
-                            row[-1] = 'A동'
-                except (ValueError, IndexError):
-                    pass
-            
-            # B동 처리 (더샵송도센텀하이브B → 센텀하이브B동)
-            elif complex_name == '더샵송도센텀하이브B':
-                try:
-                    floor_num = int(floor_info.split('/')[0])
-                    total_floors = int(floor_info.split('/')[1])
-                    
-                    if total_floors == 29:  # B동은 29층까지
-                        if floor_num <= 2:
-                            # 1-2층: 상가
-                            row[0] = '센텀하이브B동상가'
-                            row[-1] = 'B동'
-                        elif 3 <= floor_num <= 8:
-                            # 3-8층: 오피스
-                            row[0] = '센텀하이브B동오피스'
-                            row[-1] = 'B동'
-                        elif floor_num >= 10:
-                            # 10-29층: 오피스텔
-                            row[0] = '센텀하이브B동오피스텔'
-                            row[-1] = 'B동'
-                except (ValueError, IndexError):
-                    pass
-            
-            # 이미 분류된 센텀하이브 매물들 처리
-            elif complex_name in ['센텀하이브A동상가', '센텀하이브A동오피스', 
-                                 '센텀하이브B동상가', '센텀하이브B동오피스텔']:
-                # 이미 올바르게 분류된 매물들은 그대로 유지
-                pass
-        
-        writer.writerow(row)
+def classify_row(row):
+    """센텀하이브 매물을 층수에 따라 상가/오피스/오피스텔로 분류 (row를 직접 수정)"""
+    complex_name = row.get('complexName', '').strip()
+    floor_info = row.get('floorInfo', '').strip()
 
-import os
-os.replace(temp_file, input_file)
-print("센텀하이브 매물 분류가 완료되었습니다.") 
\ No newline at end of file
+    # A동 처리 (더샵송도센텀하이브A → 센텀하이브A동)
+    if complex_name == '더샵송도센텀하이브A':
+        try:
+            floor_num = int(floor_info.split('/')[0])
+            total_floors = int(floor_info.split('/')[1])
+
+            if total_floors == 39:  # A동은 39층까지
+                if floor_num <= 2:
+                    # 1-2층: 상가
+                    row['complexName'] = '센텀하이브A동상가'
+                    row['dong'] = 'A동'
+                elif floor_num >= 4:
+                    # 4-39층: 오피스
+                    row['complexName'] = '센텀하이브A동오피스'
+                    row['dong'] = 'A동'
+        except (ValueError, IndexError):
+            pass
+
+    # B동 처리 (더샵송도센텀하이브B → 센텀하이브B동)
+    elif complex_name == '더샵송도센텀하이브B':
+        try:
+            floor_num = int(floor_info.split('/')[0])
+            total_floors = int(floor_info.split('/')[1])
+
+            if total_floors == 29:  # B동은 29층까지
+                if floor_num <= 2:
+                    # 1-2층: 상가
+                    row['complexName'] = '센텀하이브B동상가'
+                    row['dong'] = 'B동'
+                elif 3 <= floor_num <= 8:
+                    # 3-8층: 오피스
+                    row['complexName'] = '센텀하이브B동오피스'
+                    row['dong'] = 'B동'
+                elif floor_num >= 10:
+                    # 10-29층: 오피스텔
+                    row['complexName'] = '센텀하이브B동오피스텔'
+                    row['dong'] = 'B동'
+        except (ValueError, IndexError):
+            pass
+
+    # 이미 분류된 센텀하이브 매물들은 그대로 유지
+    return row
+
+
+def main():
+    # 분류가 바뀐 행만 변경분으로 기록
+    listings = listing_store.load_listings()
+    rows = [classify_row(dict(row)) for row in listings.values()]
+    listing_store.append_changes(rows, listings)
+    conn = listing_db.open_store(listing_store.LISTINGS_FILE)
+    try:
+        listing_db.upsert(conn, rows)
+    finally:
+        conn.close()
+    print("센텀하이브 매물 분류가 완료되었습니다.")
+
+
+if __name__ == '__main__':
+    main()